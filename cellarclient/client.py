@@ -13,20 +13,71 @@ from cellarclient.common import utils
 
 
 def get_client(cellar_url=None, max_retries=None,
-               retry_interval=None, **ignored_kwargs):
+               retry_interval=None, retry_policy=None, retry_max_time=None,
+               retry_budget=None, retry_after_max=None, timeout=None,
+               connect_timeout=None, pool_connections=None, pool_maxsize=None,
+               pool_block=False, keepalive=None, log_body_max=None,
+               json_backend=None, chunk_size=None, compress_min_size=None,
+               http_cache_size=None, http_cache_dir=None, cache=None,
+               **ignored_kwargs):
     """
 
     :param cellar_url: cellar API endpoint
     :param max_retries: Maximum number of retries in case of conflict error
     :param retry_interval: Amount of time (in seconds) between retries in case
         of conflict error
+    :param retry_policy: Name of the policy computing the time between
+        retries: 'fixed', 'exponential' or 'jitter'
+    :param retry_max_time: Maximum time (in seconds) spent retrying a request
+    :param retry_budget: Maximum fraction of the requests that may be retried
+    :param retry_after_max: Maximum time (in seconds) waited when the server
+        sends a Retry-After header
+    :param timeout: Maximum time (in seconds) to wait for a response
+    :param connect_timeout: Maximum time (in seconds) to wait for a
+        connection, defaults to timeout
+    :param pool_connections: Number of per-host connection pools to keep
+    :param pool_maxsize: Maximum number of connections kept per host
+    :param pool_block: Whether to wait for a free connection instead of
+        opening a throwaway one when the pool of a host is exhausted
+    :param keepalive: Idle time (in seconds) before TCP keep-alive probes are
+        sent on pooled connections
+    :param log_body_max: Maximum number of characters of request and response
+        bodies written to the debug log
+    :param json_backend: Library decoding the JSON responses, 'orjson',
+        'ujson' or 'json'. Defaults to the fastest one installed
+    :param chunk_size: Number of bytes read at a time from the responses
+    :param compress_min_size: Minimum size (in bytes) of the request bodies
+        sent gzip compressed
+    :param http_cache_size: Number of GET responses cached in memory and
+        revalidated with ETag and Last-Modified
+    :param http_cache_dir: Directory of an on-disk tier of the response cache
+    :param cache: Cache of the resources returned by get(): True for an
+        in-memory cache, a dogpile.cache region or a cache object
     :param ignored_kwargs: all the other params that are passed. Left for
         backwards compatibility. They are ignored.
     """
     kwargs = {
         'max_retries': max_retries,
         'retry_interval': retry_interval,
+        'retry_policy': retry_policy,
+        'retry_max_time': retry_max_time,
+        'retry_budget': retry_budget,
+        'retry_after_max': retry_after_max,
+        'connect_timeout': connect_timeout,
+        'pool_connections': pool_connections,
+        'pool_maxsize': pool_maxsize,
+        'pool_block': pool_block,
+        'keepalive': keepalive,
+        'log_body_max': log_body_max,
+        'json_backend': json_backend,
+        'chunk_size': chunk_size,
+        'compress_min_size': compress_min_size,
+        'http_cache_size': http_cache_size,
+        'http_cache_dir': http_cache_dir,
+        'cache': cache,
     }
+    if timeout is not None:
+        kwargs['timeout'] = timeout
     endpoint = cellar_url
 
     return Client('1', endpoint, **kwargs)
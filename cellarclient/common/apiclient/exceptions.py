@@ -110,8 +110,10 @@ class HttpError(ClientException):
 
     def __init__(self, message=None, details=None,
                  response=None, request_id=None,
-                 url=None, method=None, http_status=None):
+                 url=None, method=None, http_status=None,
+                 retry_after=None):
         self.http_status = http_status or self.http_status
+        self.retry_after = retry_after
         self.message = message or self.message
         self.details = details
         self.request_id = request_id
@@ -292,9 +294,9 @@ class RequestEntityTooLarge(HTTPClientError):
 
     def __init__(self, *args, **kwargs):
         try:
-            self.retry_after = int(kwargs.pop('retry_after'))
+            kwargs['retry_after'] = int(kwargs['retry_after'])
         except (KeyError, ValueError):
-            self.retry_after = 0
+            kwargs['retry_after'] = 0
 
         super(RequestEntityTooLarge, self).__init__(*args, **kwargs)
 
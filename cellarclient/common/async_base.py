@@ -0,0 +1,193 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Base utilities to build asyncio API operation managers on top of.
+
+Requires Python 3.6 or later.
+"""
+
+import asyncio
+
+import six.moves.urllib.parse as urlparse
+
+from cellarclient.common import base
+from cellarclient import exc
+
+
+class AsyncManager(base.BaseManager):
+    """Provides CRUD operations with a particular API, as coroutines.
+
+    The API object is expected to be an
+    :class:`cellarclient.common.async_http.AsyncHTTPClient`.
+    """
+
+    async def _get(self, resource_id, fields=None):
+        """Retrieve a resource.
+
+        :param resource_id: Identifier of the resource.
+        :param fields: List of specific fields to be returned.
+        """
+
+        cached = self._get_cached(resource_id, fields)
+        if cached is not None:
+            return cached
+
+        path = resource_id
+        if fields is not None:
+            path = '%s?fields=' % resource_id
+            path += ','.join(fields)
+
+        resp, body = await self.api.json_request('GET', self._path(path))
+        if not body:
+            return None
+        resource = self.resource_class(self, body, loaded=True)
+        self._cache_resource(resource_id, resource, fields)
+        return resource
+
+    async def _list_pagination(self, url, response_key=None, obj_class=None,
+                               limit=None):
+        """Retrieve a list of items.
+
+        See :meth:`cellarclient.common.base.Manager._list_pagination`.
+        """
+        return [obj async for obj in self._list_pagination_iter(
+                url, response_key=response_key, obj_class=obj_class,
+                limit=limit)]
+
+    async def _list_pagination_iter(self, url, response_key=None,
+                                    obj_class=None, limit=None):
+        """Iterate over a paginated list of items, as an async generator.
+
+        See :meth:`cellarclient.common.base.Manager._list_pagination_iter`.
+        """
+        if obj_class is None:
+            obj_class = self.resource_class
+
+        if limit is not None:
+            limit = int(limit)
+
+        object_count = 0
+        async for body in self._iter_pages(url):
+            data = self._format_body_data(body, response_key)
+            for obj in data:
+                yield obj_class(self, obj, loaded=True)
+                object_count += 1
+                if limit and object_count >= limit:
+                    return
+
+    async def _iter_pages(self, url):
+        """Iterate over the response bodies of a paginated list.
+
+        :param url: a partial URL of the first page, e.g. '/nodes'
+        """
+        while url:
+            resp, body = await self.api.json_request('GET', url)
+            yield body
+
+            url = body.get('next')
+            if url:
+                # NOTE(lucasagomes): We need to edit the URL to remove
+                # the scheme and netloc
+                url_parts = list(urlparse.urlparse(url))
+                url_parts[0] = url_parts[1] = ''
+                url = urlparse.urlunparse(url_parts)
+
+    async def _list(self, url, response_key=None, obj_class=None, body=None):
+        resp, body = await self.api.json_request('GET', url)
+
+        if obj_class is None:
+            obj_class = self.resource_class
+
+        data = self._format_body_data(body, response_key)
+        return [obj_class(self, res, loaded=True) for res in data if res]
+
+    async def _update(self, resource_id, patch, method='PATCH'):
+        """Update a resource.
+
+        :param resource_id: Resource identifier.
+        :param patch: New version of a given resource.
+        :param method: Name of the method for the request.
+        """
+
+        url = self._path(resource_id)
+        try:
+            resp, body = await self.api.json_request(method, url, body=patch)
+        except Exception:
+            # NOTE: the update may have been applied anyway.
+            self._refresh_cached(resource_id)
+            raise
+        # PATCH/PUT requests may not return a body
+        resource = self.resource_class(self, body) if body else None
+        self._refresh_cached(resource_id, resource)
+        return resource
+
+    async def _delete(self, resource_id):
+        """Delete a resource.
+
+        :param resource_id: Resource identifier.
+        """
+        try:
+            await self.api.raw_request('DELETE', self._path(resource_id))
+        finally:
+            self._refresh_cached(resource_id)
+
+    async def _batch(self, func, items, concurrency=1, key=None):
+        """Await a coroutine function for every item of a batch.
+
+        See :meth:`cellarclient.common.base.Manager._batch`; at most
+        'concurrency' calls are pending at once.
+        """
+        semaphore = asyncio.Semaphore(max(int(concurrency or 1), 1))
+
+        async def _call(item):
+            item_key = key(item) if key else item
+            async with semaphore:
+                try:
+                    return base.BatchResult(item_key, await func(item), None)
+                except exc.ClientException as e:
+                    return base.BatchResult(item_key, None, e)
+
+        return list(await asyncio.gather(*[_call(item) for item in items]))
+
+
+class AsyncCreateManager(AsyncManager, base.BaseCreateManager):
+    """Provides creation operations with a particular API, as coroutines."""
+
+    async def _create(self, new):
+        url = self._path()
+        resp, body = await self.api.json_request('POST', url, body=new)
+        if body:
+            resource = self.resource_class(self, body)
+            self._refresh_cached(getattr(resource, 'uuid', None), resource)
+            return resource
+
+    async def create(self, **kwargs):
+        """Create a resource based on a kwargs dictionary of attributes.
+
+        See :meth:`cellarclient.common.base.CreateManager.create`.
+        """
+        return await self._create(self._validate_creation(kwargs))
+
+    async def create_many(self, items, concurrency=1):
+        """Create several resources.
+
+        See :meth:`cellarclient.common.base.CreateManager.create_many`.
+        """
+        checked = self._validate_creation_items(items)
+
+        async def _create_item(item):
+            return await self._create(item[1])
+
+        return await self._batch(_create_item, checked,
+                                 concurrency=concurrency,
+                                 key=lambda item: item[0])
@@ -0,0 +1,294 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+asyncio based HTTP client for the Cellar API.
+
+This module requires Python 3.6 or later and the aiohttp library, which is
+installed with the 'async' extra of python-cellarclient.
+"""
+
+import asyncio
+import copy
+import functools
+import json
+import logging
+import ssl
+
+from oslo_utils import importutils
+from oslo_utils import timeutils
+import six.moves.urllib.parse as urlparse
+from six.moves import http_client
+
+from cellarclient import exc
+from cellarclient.common import http
+from cellarclient.common import jsonutils
+from cellarclient.common import retry
+from cellarclient.common.i18n import _
+
+aiohttp = importutils.try_import('aiohttp')
+
+LOG = logging.getLogger(__name__)
+
+
+def with_retries(func):
+    """Wrapper for AsyncHTTPClient._http_request adding support for retries.
+
+    Same as :func:`cellarclient.common.http.with_retries`, but waits
+    without blocking the event loop.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, url, method, deadline=None, **kwargs):
+        num_attempts = http._get_retry_attempts(self)
+        http._record_request(self)
+        watch = timeutils.StopWatch().start()
+        for attempt in range(1, num_attempts + 1):
+            attempt_kwargs = http._get_attempt_kwargs(
+                self, url, kwargs, deadline, watch.elapsed())
+            try:
+                return await func(self, url, method, **attempt_kwargs)
+            except http._RETRY_EXCEPTIONS as error:
+                delay = http._get_retry_delay(self, error, attempt,
+                                              num_attempts, watch.elapsed(),
+                                              deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+    return wrapper
+
+
+class Response(object):
+    """Response to an AsyncHTTPClient request, with its body already read.
+
+    Provides the attributes of :class:`requests.Response` used by the
+    managers and by :func:`cellarclient.exc.from_response`.
+    """
+
+    def __init__(self, resp, content):
+        self.status_code = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+        self.url = str(resp.url)
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncHTTPClient(http.VersionNegotiationMixin):
+    """HTTP client with the same contract as HTTPClient, for asyncio.
+
+    The json_request() and raw_request() coroutines return the same
+    (response, body) tuples as their HTTPClient counterparts. The
+    underlying aiohttp session is created on first use and must be
+    released with close(), or by using the client as an async context
+    manager.
+    """
+
+    def __init__(self, endpoint, **kwargs):
+        if aiohttp is None:
+            raise ImportError(_('The aiohttp library is required to use '
+                                'AsyncHTTPClient.'))
+        self.endpoint = endpoint
+        self.endpoint_trimmed = http._trim_endpoint_api_version(endpoint)
+        self.auth_token = kwargs.get('token')
+        self.auth_ref = kwargs.get('auth_ref')
+        self.api_version_select_state = kwargs.get(
+            'api_version_select_state', 'default')
+        self.conflict_max_retries = kwargs.pop('max_retries',
+                                               http.DEFAULT_MAX_RETRIES)
+        self.conflict_retry_interval = kwargs.pop('retry_interval',
+                                                  http.DEFAULT_RETRY_INTERVAL)
+        self.retry_policy = retry.get_policy(kwargs.get('retry_policy'))
+        self.retry_max_time = kwargs.get('retry_max_time')
+        self.retry_after_max = kwargs.get('retry_after_max')
+        if self.retry_after_max is None:
+            self.retry_after_max = http.DEFAULT_RETRY_AFTER_MAX
+        self.retry_budget = http._get_retry_budget(kwargs.get('retry_budget'))
+        self.timeout = kwargs.get('timeout')
+        self.connect_timeout = kwargs.get('connect_timeout')
+        self.log_body_max = kwargs.get('log_body_max')
+        self.json_loads = jsonutils.get_loads(kwargs.get('json_backend'))
+        self.session = None
+
+        parts = urlparse.urlparse(endpoint)
+        if parts.scheme not in http.SUPPORTED_ENDPOINT_SCHEME:
+            msg = _('Unsupported scheme: %s') % parts.scheme
+            raise exc.EndpointException(msg)
+
+        self.ssl = None
+        if parts.scheme == 'https':
+            if kwargs.get('insecure') is True:
+                self.ssl = False
+            else:
+                self.ssl = ssl.create_default_context(
+                    cafile=kwargs.get('ca_file'))
+                if kwargs.get('cert_file'):
+                    self.ssl.load_cert_chain(kwargs['cert_file'],
+                                             kwargs.get('key_file'))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                timeout=self._get_timeout())
+        return self.session
+
+    def _get_timeout(self, timeout=None):
+        """Return the aiohttp timeout of a request.
+
+        See :func:`cellarclient.common.http._get_request_timeout`.
+        """
+        connect, read = http._get_request_timeout(self, timeout)
+        return aiohttp.ClientTimeout(total=None, connect=connect,
+                                     sock_read=read)
+
+    async def close(self):
+        """Close the underlying session and its connections."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _make_connection_url(self, url):
+        return urlparse.urljoin(self.endpoint_trimmed, url)
+
+    def _parse_version_headers(self, resp):
+        return self._generic_parse_version_headers(resp.headers.get)
+
+    @staticmethod
+    def log_http_response(resp, body=None, max_size=None):
+        dump = ['\nHTTP %s %s' % (resp.status_code, resp.reason)]
+        dump.extend(['%s: %s' % (k, v) for k, v in resp.headers.items()])
+        dump.append('')
+        if body:
+            body = http._format_log_body(body, max_size)
+            dump.extend([body, ''])
+        LOG.debug('\n'.join(dump))
+
+    @with_retries
+    async def _http_request(self, url, method, **kwargs):
+        """Send an http request with the specified characteristics.
+
+        Wrapper around aiohttp.ClientSession.request to handle tasks such
+        as setting headers and error handling.
+        """
+        # Copy the kwargs so we can reuse the original in case of redirects
+        kwargs['headers'] = copy.deepcopy(kwargs.get('headers', {}))
+        kwargs['headers'].setdefault('User-Agent', http.USER_AGENT)
+        if self.auth_token:
+            kwargs['headers'].setdefault('X-Auth-Token', self.auth_token)
+
+        body = kwargs.pop('body', None)
+        request_kwargs = dict(kwargs)
+        if body:
+            request_kwargs['data'] = body
+        if 'timeout' in kwargs:
+            request_kwargs['timeout'] = self._get_timeout(kwargs['timeout'])
+
+        conn_url = self._make_connection_url(url)
+        debug = LOG.isEnabledFor(logging.DEBUG)
+        if debug:
+            LOG.debug('%(method)s %(url)s',
+                      {'method': method, 'url': conn_url})
+        try:
+            async with self._get_session().request(
+                    method, conn_url, ssl=self.ssl,
+                    **request_kwargs) as raw_resp:
+                resp = Response(raw_resp, await raw_resp.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            message = (_("Error has occurred while handling "
+                       "request for %(url)s: %(e)s") %
+                       dict(url=conn_url, e=e))
+            if isinstance(e, asyncio.TimeoutError):
+                raise exc.Timeout(message)
+            # NOTE: not valid request (invalid url, and so on), retrying
+            # is not needed.
+            if isinstance(e, ValueError):
+                raise exc.ValidationError(message)
+
+            raise exc.ConnectionRefused(message)
+
+        if resp.status_code == http_client.NOT_ACCEPTABLE:
+            negotiated_ver = self.negotiate_version(self.session, resp)
+            kwargs['headers'][http.API_VERSION_HEADER] = negotiated_ver
+            if body:
+                kwargs['body'] = body
+            return await self._http_request(url, method, **kwargs)
+
+        body_str = None
+        if resp.headers.get('Content-Type') != 'application/octet-stream':
+            if debug or resp.status_code >= http_client.BAD_REQUEST:
+                body_str = resp.text
+            if debug:
+                self.log_http_response(resp, body_str, self.log_body_max)
+            body_iter = http._iter_text(resp.content)
+        else:
+            if debug:
+                self.log_http_response(resp)
+            body_iter = iter([resp.content])
+
+        if resp.status_code >= http_client.BAD_REQUEST:
+            error_json = http._extract_error_json(body_str)
+            raise exc.from_response(
+                resp, error_json.get('faultstring'),
+                error_json.get('debuginfo'), method, url)
+        elif resp.status_code in (http_client.MOVED_PERMANENTLY,
+                                  http_client.FOUND,
+                                  http_client.USE_PROXY):
+            # Redirected. Reissue the request to the new location.
+            if body:
+                kwargs['body'] = body
+            return await self._http_request(resp.headers['location'],
+                                            method, **kwargs)
+        elif resp.status_code == http_client.MULTIPLE_CHOICES:
+            raise exc.from_response(resp, method=method, url=url)
+
+        return resp, body_iter
+
+    async def json_request(self, method, url, **kwargs):
+        kwargs.setdefault('headers', {})
+        kwargs['headers'].setdefault('Content-Type', 'application/json')
+        kwargs['headers'].setdefault('Accept', 'application/json')
+
+        if 'body' in kwargs:
+            kwargs['body'] = json.dumps(kwargs['body'])
+
+        resp, body_iter = await self._http_request(url, method, **kwargs)
+        content_type = resp.headers.get('Content-Type')
+
+        if (resp.status_code in (http_client.NO_CONTENT,
+                                 http_client.RESET_CONTENT)
+                or content_type is None):
+            return resp, list()
+
+        if 'application/json' in content_type:
+            body = http._decode_json(resp.content, self.json_loads)
+        else:
+            body = None
+
+        return resp, body
+
+    async def raw_request(self, method, url, **kwargs):
+        kwargs.setdefault('headers', {})
+        kwargs['headers'].setdefault('Content-Type',
+                                     'application/octet-stream')
+        return await self._http_request(url, method, **kwargs)
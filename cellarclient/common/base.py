@@ -18,12 +18,21 @@ Base utilities to build API operation managers and objects on top of.
 """
 
 import abc
+import collections
 import copy
-import six
+import operator
+import sys
+import threading
 
+from concurrent import futures
+from oslo_utils import timeutils
+import six
+from six.moves import queue
 import six.moves.urllib.parse as urlparse
 
 from cellarclient.common.apiclient import base
+from cellarclient.common.i18n import _
+from cellarclient.common import objcache
 from cellarclient import exc
 
 
@@ -39,12 +48,174 @@ def getid(obj):
         return obj
 
 
+BatchResult = collections.namedtuple('BatchResult', ['key', 'result', 'error'])
+"""Outcome of one item of a batch operation.
+
+'key' identifies the item, 'result' holds the value returned for it and
+'error' the :class:`exc.ClientException` raised for it, if any.
+"""
+
+
+_RECORD_CLASSES = {}
+
+
+def _get_record_class(family, fields):
+    """Return the subclass of 'family' holding items with these fields."""
+    key = (family, fields)
+    record_class = _RECORD_CLASSES.get(key)
+    if record_class is None:
+        namespace = {'__slots__': (), '_fields': fields, '_family': family}
+        for index, name in enumerate(fields):
+            if not name.startswith('_'):
+                namespace[name] = property(operator.itemgetter(index))
+        record_class = type(family.__name__, (family,), namespace)
+        # NOTE: two threads may create the same class, either is fine.
+        _RECORD_CLASSES[key] = record_class
+    return record_class
+
+
+class Record(tuple):
+    """Read-only object holding the attributes of an item of a list.
+
+    A lighter alternative to :class:`Resource` for large listings: a
+    record is a tuple of the values of the item, which is not kept, and
+    its attributes are read through properties of a class shared by the
+    items with the same fields. No reference to the manager is kept, so
+    a record can not be lazy-loaded or refreshed. Fields whose name
+    starts with an underscore are only returned by :meth:`to_dict`.
+
+    It takes the arguments of :class:`Resource`, to be used as the
+    'obj_class' of the list methods of the managers.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _family = None
+
+    def __new__(cls, manager, info, loaded=True):
+        record_class = _get_record_class(cls._family or cls, tuple(info))
+        return tuple.__new__(record_class, info.values())
+
+    def __reduce__(self):
+        return self._family, (None, dict(zip(self._fields, self)))
+
+    def __eq__(self, other):
+        # NOTE: records are not equal to tuples of the same values.
+        return (self.__class__ is getattr(other, '__class__', None) and
+                tuple.__eq__(self, other))
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__,
+                            dict(zip(self._fields, self)))
+
+    def to_dict(self):
+        return copy.deepcopy(dict(zip(self._fields, self)))
+
+
+def _prefetch(iterable, depth):
+    """Consume an iterable from a background thread.
+
+    Items are produced by a worker thread and handed over through a queue
+    bounded to 'depth' items, so the worker can run at most 'depth' items
+    ahead of the caller. Items are yielded in their original order and an
+    exception raised by the iterable is re-raised in the caller.
+
+    :param iterable: the iterable to consume.
+    :param depth: maximum number of items buffered ahead of the caller.
+    """
+    items = queue.Queue(maxsize=depth)
+    done = threading.Event()
+    end = object()
+
+    def _put(item):
+        while not done.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _worker():
+        try:
+            for item in iterable:
+                if not _put((item, None)):
+                    return
+        except Exception:
+            _put((None, sys.exc_info()))
+        else:
+            _put((end, None))
+
+    worker = threading.Thread(target=_worker)
+    worker.daemon = True
+    worker.start()
+    try:
+        while True:
+            item, exc_info = items.get()
+            if exc_info is not None:
+                six.reraise(*exc_info)
+            if item is end:
+                return
+            yield item
+    finally:
+        # NOTE: stops the worker when the caller stops consuming early,
+        # e.g. once a 'limit' has been reached.
+        done.set()
+
+
+def _get_page_kwargs(url, watch, deadline):
+    """Return the request arguments of a page of a paginated list.
+
+    The page request, retries included, is given the time left as
+    deadline.
+
+    :param watch: StopWatch of the listing deadline, or None.
+    :raises exc.Timeout: if the deadline has expired.
+    """
+    if watch is None:
+        return {}
+    if watch.expired():
+        raise exc.Timeout(
+            _("Listing %(url)s did not complete within "
+              "%(deadline)s seconds") %
+            {'url': url, 'deadline': deadline})
+    return {'deadline': watch.leftover()}
+
+
+def _get_next_url(body):
+    """Return the partial URL of the page following 'body', if any."""
+    url = body.get('next')
+    if url:
+        # NOTE(lucasagomes): We need to edit the URL to remove
+        # the scheme and netloc
+        url_parts = list(urlparse.urlparse(url))
+        url_parts[0] = url_parts[1] = ''
+        url = urlparse.urlunparse(url_parts)
+    return url
+
+
 @six.add_metaclass(abc.ABCMeta)
-class Manager(object):
-    """Provides  CRUD operations with a particular API."""
+class BaseManager(object):
+    """Provides the parts of a manager which send no request.
+
+    Shared by :class:`Manager` and the asyncio managers of
+    :mod:`cellarclient.common.async_base`.
+    """
 
-    def __init__(self, api):
+    def __init__(self, api, cache=None):
+        """Create a manager.
+
+        :param api: the HTTP client of the API.
+        :param cache: optional object cache of :meth:`_get`, see
+            :func:`cellarclient.common.objcache.get_cache`.
+        """
         self.api = api
+        self.cache = objcache.get_cache(cache)
 
     def _path(self, resource_id=None):
         """Returns a request path for a given resource identifier.
@@ -67,21 +238,54 @@ class Manager(object):
 
         """
 
-    def _get(self, resource_id, fields=None):
-        """Retrieve a resource.
+    def _cache_key(self, resource_id):
+        return '%s/%s' % (self._resource_name, resource_id)
 
-        :param resource_id: Identifier of the resource.
-        :param fields: List of specific fields to be returned.
+    def _get_cached(self, resource_id, fields=None):
+        """Return the resource cached for 'resource_id' and 'fields'.
+
+        :returns: a new resource object, or None if caching is disabled or
+            the resource is not cached.
         """
+        if self.cache is None:
+            return None
+        info = self.cache.get(self._cache_key(resource_id),
+                              tuple(fields) if fields is not None else None)
+        if info is None:
+            return None
+        # NOTE: callers may modify the resource, do not share its info
+        # with the cache.
+        return self.resource_class(self, copy.deepcopy(info), loaded=True)
+
+    def _cache_resource(self, resource_id, resource, fields=None):
+        """Cache a resource fetched with 'fields'."""
+        if self.cache is not None and resource is not None:
+            self.cache.set(self._cache_key(resource_id),
+                           copy.deepcopy(resource._info),
+                           tuple(fields) if fields is not None else None)
+
+    def _refresh_cached(self, resource_id, resource=None):
+        """Update the cache after a write to 'resource_id'.
+
+        The cached entries are replaced by 'resource' when the server
+        returned it, dropped otherwise.
+        """
+        if self.cache is None or resource_id is None:
+            return
+        if resource is None:
+            self.cache.invalidate(self._cache_key(resource_id))
+        else:
+            self.cache.refresh(self._cache_key(resource_id),
+                               copy.deepcopy(resource._info))
 
-        if fields is not None:
-            resource_id = '%s?fields=' % resource_id
-            resource_id += ','.join(fields)
+    def get_cache_stats(self):
+        """Return the counters of the object cache, None if disabled.
 
-        try:
-            return self._list(self._path(resource_id))[0]
-        except IndexError:
+        See :meth:`cellarclient.common.objcache.ObjectCache.get_stats`.
+        """
+        if self.cache is None:
             return None
+        return self.cache.get_stats()
 
     def _format_body_data(self, body, response_key):
         if response_key:
@@ -97,8 +301,37 @@ class Manager(object):
 
         return data
 
+
+@six.add_metaclass(abc.ABCMeta)
+class Manager(BaseManager):
+    """Provides  CRUD operations with a particular API."""
+
+    def _get(self, resource_id, fields=None):
+        """Retrieve a resource.
+
+        :param resource_id: Identifier of the resource.
+        :param fields: List of specific fields to be returned.
+        """
+
+        cached = self._get_cached(resource_id, fields)
+        if cached is not None:
+            return cached
+
+        path = resource_id
+        if fields is not None:
+            path = '%s?fields=' % resource_id
+            path += ','.join(fields)
+
+        resp, body = self.api.json_request('GET', self._path(path))
+        if not body:
+            return None
+        resource = self.resource_class(self, body, loaded=True)
+        self._cache_resource(resource_id, resource, fields)
+        return resource
+
     def _list_pagination(self, url, response_key=None, obj_class=None,
-                         limit=None):
+                         limit=None, prefetch=0, deadline=None,
+                         incremental=False):
         """Retrieve a list of items.
 
         The cellar API is configured to return a maximum number of
@@ -114,41 +347,272 @@ class Manager(object):
         :param obj_class: class for constructing the returned objects.
         :param limit: maximum number of items to return. If None returns
             everything.
+        :param prefetch: number of pages to fetch ahead from a background
+            thread while the current one is processed. 0 disables
+            read-ahead.
+        :param deadline: maximum time in seconds allowed for fetching all
+            the pages. None means no limit.
+        :param incremental: decode the 'response_key' items of a page while
+            it is received instead of once it is complete. Cannot be
+            combined with 'prefetch'.
 
         """
+        return list(self._list_pagination_iter(url, response_key=response_key,
+                                               obj_class=obj_class,
+                                               limit=limit,
+                                               prefetch=prefetch,
+                                               deadline=deadline,
+                                               incremental=incremental))
+
+    def _list_pagination_iter(self, url, response_key=None, obj_class=None,
+                              limit=None, prefetch=0, deadline=None,
+                              incremental=False):
+        """Iterate over a paginated list of items.
+
+        Same as :meth:`_list_pagination`, but objects are yielded as soon
+        as the page holding them has been received, so only one page is
+        kept in memory at a time. Unless 'prefetch' is set, the 'next'
+        link of a page is only followed once all of its objects have been
+        consumed.
+
+        :param url: a partial URL, e.g. '/nodes'
+        :param response_key: the key to be looked up in response
+            dictionary, e.g. 'nodes'
+        :param obj_class: class for constructing the returned objects.
+        :param limit: maximum number of items to return. If None returns
+            everything.
+        :param prefetch: number of pages to fetch ahead from a background
+            thread while the current one is processed. 0 disables
+            read-ahead.
+        :param deadline: maximum time in seconds allowed for fetching all
+            the pages. None means no limit.
+        :param incremental: decode the 'response_key' items of a page while
+            it is received, so that a single item rather than a whole page
+            is held in memory. Cannot be combined with 'prefetch'.
+        """
         if obj_class is None:
             obj_class = self.resource_class
 
         if limit is not None:
             limit = int(limit)
 
-        object_list = []
+        if incremental:
+            if prefetch:
+                raise exc.InvalidAttribute(
+                    _("Incremental listing cannot be combined with "
+                      "read-ahead"))
+            pages = self._iter_page_streams(url, response_key,
+                                            deadline=deadline)
+        else:
+            pages = self._iter_pages(url, deadline=deadline)
+        if prefetch:
+            pages = _prefetch(pages, int(prefetch))
+
         object_count = 0
-        limit_reached = False
+        try:
+            for body in pages:
+                if incremental:
+                    data = body
+                else:
+                    data = self._format_body_data(body, response_key)
+                for obj in data:
+                    yield obj_class(self, obj, loaded=True)
+                    object_count += 1
+                    if limit and object_count >= limit:
+                        return
+        finally:
+            pages.close()
+
+    def _iter_pages(self, url, deadline=None):
+        """Iterate over the response bodies of a paginated list.
+
+        :param url: a partial URL of the first page, e.g. '/nodes'
+        :param deadline: maximum time in seconds allowed for fetching all
+            the pages. Each request is given the time left as timeout.
+        :raises exc.Timeout: if the deadline expires before the last page.
+        """
+        watch = None
+        if deadline is not None:
+            watch = timeutils.StopWatch(duration=deadline).start()
         while url:
-            resp, body = self.api.json_request('GET', url)
-            data = self._format_body_data(body, response_key)
-            for obj in data:
-                object_list.append(obj_class(self, obj, loaded=True))
-                object_count += 1
-                if limit and object_count >= limit:
-                    # break the for loop
-                    limit_reached = True
-                    break
-
-            # break the while loop and return
-            if limit_reached:
-                break
-
-            url = body.get('next')
-            if url:
-                # NOTE(lucasagomes): We need to edit the URL to remove
-                # the scheme and netloc
-                url_parts = list(urlparse.urlparse(url))
-                url_parts[0] = url_parts[1] = ''
-                url = urlparse.urlunparse(url_parts)
-
-        return object_list
+            resp, body = self.api.json_request(
+                'GET', url, **_get_page_kwargs(url, watch, deadline))
+            yield body
+
+            url = _get_next_url(body)
+
+    def _iter_page_streams(self, url, response_key, deadline=None):
+        """Iterate over the pages of a list, decoded while received.
+
+        Same as :meth:`_iter_pages`, but pages are
+        :class:`cellarclient.common.jsonutils.ArrayStream` objects yielding
+        the 'response_key' items. A page must be fully consumed before the
+        next one is requested.
+
+        :param url: a partial URL of the first page, e.g. '/nodes'
+        :param response_key: the key of the items in the pages.
+        :param deadline: maximum time in seconds allowed for fetching all
+            the pages. Each request is given the time left as timeout.
+        :raises exc.Timeout: if the deadline expires before the last page.
+        """
+        watch = None
+        if deadline is not None:
+            watch = timeutils.StopWatch(duration=deadline).start()
+        while url:
+            resp, stream = self.api.json_stream_request(
+                'GET', url, response_key,
+                **_get_page_kwargs(url, watch, deadline))
+            try:
+                yield stream
+            finally:
+                stream.close()
+
+            url = _get_next_url(stream.members)
+
+    def _walk_range(self, url, response_key, sort_key, end=None,
+                    stop=None, deadline=None):
+        """Return the items of a paginated list up to a boundary.
+
+        :param url: a partial URL of the first page.
+        :param response_key: the key of the items in the pages.
+        :param sort_key: the field the list is sorted by.
+        :param end: optional (UUID, value) of the last item to return. Items
+            sorted after 'value' are not returned either, in case that item
+            was deleted.
+        :param stop: optional callable telling from the value of an item
+            whether the walk must stop before it.
+        :param deadline: maximum time in seconds allowed for fetching the
+            pages.
+        :returns: a list of the items, as dictionaries.
+        """
+        items = []
+        pages = self._iter_pages(url, deadline=deadline)
+        try:
+            for body in pages:
+                for item in self._format_body_data(body, response_key):
+                    if stop is not None and stop(item.get(sort_key)):
+                        return items
+                    items.append(item)
+                    if end is not None and item.get('uuid') == end[0]:
+                        return items
+        finally:
+            pages.close()
+        return items
+
+    def _list_parallel(self, get_url, response_key, sort_key, sort_dir=None,
+                       markers=None, parallel=2, deadline=None,
+                       obj_class=None):
+        """Retrieve a whole list with several concurrent paginations.
+
+        The list is split in ranges starting after each of 'markers', which
+        are paginated concurrently and merged back in order. Without
+        markers, the list is paginated from both ends at once until the two
+        paginations meet. Items are deduplicated by UUID at the boundaries
+        of the ranges.
+
+        :param get_url: callable taking a marker UUID, or None, and a sort
+            direction and returning the partial URL of the first page of the
+            list sorted by 'sort_key' in that direction, starting after the
+            marker.
+        :param response_key: the key of the items in the pages.
+        :param sort_key: the field the list is sorted by. Its values must
+            be returned with the items, and never be null.
+        :param sort_dir: 'asc' (the default) or 'desc'.
+        :param markers: optional list of (UUID, value) of existing items,
+            in the order of the list, splitting it in ranges.
+        :param parallel: maximum number of paginations running at once.
+        :param deadline: maximum time in seconds allowed for fetching the
+            pages of each range.
+        :param obj_class: class for constructing the returned objects.
+        :returns: a list of the objects.
+        """
+        if obj_class is None:
+            obj_class = self.resource_class
+        sort_dir = sort_dir or 'asc'
+        reverse_dir = 'asc' if sort_dir == 'desc' else 'desc'
+
+        def _after(value, boundary, direction=sort_dir):
+            return value < boundary if direction == 'desc' else (
+                value > boundary)
+
+        if not markers:
+            ranges = self._list_from_both_ends(get_url, response_key,
+                                               sort_key, sort_dir,
+                                               reverse_dir, _after, deadline)
+        else:
+            bounds = [None] + list(markers)
+            ends = list(markers) + [None]
+
+            def _walk_from(start, end):
+                def _stop(value):
+                    return end is not None and _after(value, end[1])
+
+                return self._walk_range(get_url(start, sort_dir),
+                                        response_key, sort_key, end=end,
+                                        stop=_stop, deadline=deadline)
+
+            def _walk(index):
+                start = bounds[index]
+                try:
+                    return _walk_from(start[0] if start else None,
+                                      ends[index])
+                except exc.NotFound:
+                    # NOTE: the marker was deleted, this range is walked
+                    # again from the end of the previous one.
+                    return None
+
+            with futures.ThreadPoolExecutor(
+                    max_workers=max(min(int(parallel), len(bounds)),
+                                    1)) as executor:
+                ranges = list(executor.map(_walk, range(len(bounds))))
+            for index, items in enumerate(ranges):
+                if items is not None:
+                    continue
+                previous = [item for r in ranges[:index] for item in r]
+                ranges[index] = _walk_from(
+                    previous[-1]['uuid'] if previous else None, ends[index])
+
+        seen = set()
+        objects = []
+        for items in ranges:
+            for item in items:
+                if item.get('uuid') in seen:
+                    continue
+                seen.add(item.get('uuid'))
+                objects.append(obj_class(self, item, loaded=True))
+        return objects
+
+    def _list_from_both_ends(self, get_url, response_key, sort_key,
+                             sort_dir, reverse_dir, after, deadline):
+        """Paginate a list from both ends until the paginations meet.
+
+        Each pagination stops at the first item sorted strictly beyond the
+        last one seen by the other, so that items sharing a value are all
+        returned by one of them.
+
+        :returns: a list of the items of both paginations, each in the
+            order of the list.
+        """
+        lock = threading.Lock()
+        frontier = {}
+
+        def _walk(direction):
+            other = reverse_dir if direction == sort_dir else sort_dir
+
+            def _stop(value):
+                with lock:
+                    if other in frontier and after(value, frontier[other],
+                                                   direction):
+                        return True
+                    frontier[direction] = value
+                return False
+
+            return self._walk_range(get_url(None, direction), response_key,
+                                    sort_key, stop=_stop, deadline=deadline)
+
+        with futures.ThreadPoolExecutor(max_workers=2) as executor:
+            forward, backward = executor.map(_walk, (sort_dir, reverse_dir))
+        return [forward, backward[::-1]]
 
     def _list(self, url, response_key=None, obj_class=None, body=None):
         resp, body = self.api.json_request('GET', url)
@@ -168,22 +632,62 @@ class Manager(object):
         """
 
         url = self._path(resource_id)
-        resp, body = self.api.json_request(method, url, body=patch)
+        try:
+            resp, body = self.api.json_request(method, url, body=patch)
+        except Exception:
+            # NOTE: the update may have been applied anyway.
+            self._refresh_cached(resource_id)
+            raise
         # PATCH/PUT requests may not return a body
-        if body:
-            return self.resource_class(self, body)
+        resource = self.resource_class(self, body) if body else None
+        self._refresh_cached(resource_id, resource)
+        return resource
 
     def _delete(self, resource_id):
         """Delete a resource.
 
         :param resource_id: Resource identifier.
         """
-        self.api.raw_request('DELETE', self._path(resource_id))
+        try:
+            self.api.raw_request('DELETE', self._path(resource_id))
+        finally:
+            self._refresh_cached(resource_id)
+
+    def _batch(self, func, items, concurrency=1, key=None):
+        """Call a function for every item of a batch.
+
+        Calls are spread over a pool of 'concurrency' threads sharing the
+        same HTTP client. A :class:`exc.ClientException` raised for one item
+        is recorded in its result and does not stop the other items.
+
+        :param func: callable taking a single item.
+        :param items: iterable of items.
+        :param concurrency: maximum number of calls running at once.
+        :param key: optional callable returning the key reported for an
+            item. Defaults to the item itself.
+        :returns: a list of :class:`BatchResult`, in the order of 'items'.
+        """
+        items = list(items)
+
+        def _call(item):
+            item_key = key(item) if key else item
+            try:
+                return BatchResult(item_key, func(item), None)
+            except exc.ClientException as e:
+                return BatchResult(item_key, None, e)
+
+        concurrency = int(concurrency or 1)
+        if concurrency <= 1 or len(items) <= 1:
+            return [_call(item) for item in items]
+
+        with futures.ThreadPoolExecutor(
+                max_workers=min(concurrency, len(items))) as executor:
+            return list(executor.map(_call, items))
 
 
 @six.add_metaclass(abc.ABCMeta)
-class CreateManager(Manager):
-    """Provides creation operations with a particular API."""
+class BaseCreateManager(BaseManager):
+    """Provides the creation helpers of a manager which send no request."""
 
     @abc.abstractproperty
     def _creation_attributes(self):
@@ -191,32 +695,105 @@ class CreateManager(Manager):
 
         """
 
-    def create(self, **kwargs):
-        """Create a resource based on a kwargs dictionary of attributes.
+    def _check_creation_attributes(self, attributes):
+        """Split attributes into valid and invalid creation attributes.
 
-        :param kwargs: A dictionary containing the attributes of the resource
-                       that will be created.
-        :raises exc.InvalidAttribute: For invalid attributes that are not
-                                      needed to create the resource.
+        :param attributes: A dictionary containing the attributes of the
+                           resource to create.
+        :returns: A tuple of (new, invalid) where 'new' is a dictionary of
+                  the valid attributes and 'invalid' a list of the names of
+                  the invalid ones.
         """
-
         new = {}
         invalid = []
-        for (key, value) in kwargs.items():
+        for (key, value) in attributes.items():
             if key in self._creation_attributes:
                 new[key] = value
             else:
                 invalid.append(key)
+        return new, invalid
+
+    def _validate_creation(self, attributes):
+        """Return the creation attributes, raising if any is invalid.
+
+        :raises exc.InvalidAttribute: For invalid attributes that are not
+                                      needed to create the resource.
+        """
+        new, invalid = self._check_creation_attributes(attributes)
         if invalid:
             raise exc.InvalidAttribute(
                 'The attribute(s) "%(attrs)s" are invalid; they are not '
                 'needed to create %(resource)s.' %
                 {'resource': self._resource_name,
                  'attrs': '","'.join(invalid)})
+        return new
+
+    def _validate_creation_items(self, items):
+        """Validate the creation attributes of every item of a batch.
+
+        :returns: A list of (index, attributes) tuples.
+        :raises exc.InvalidAttribute: If any item has invalid attributes,
+                                      listing all of them.
+        """
+        checked = []
+        errors = []
+        for index, item in enumerate(items):
+            new, invalid = self._check_creation_attributes(item)
+            if invalid:
+                errors.append('%(index)d: "%(attrs)s"' %
+                              {'index': index, 'attrs': '","'.join(invalid)})
+            checked.append((index, new))
+        if errors:
+            raise exc.InvalidAttribute(
+                'Invalid attribute(s) found; they are not needed to create '
+                '%(resource)s. Item(s) %(errors)s.' %
+                {'resource': self._resource_name,
+                 'errors': ', '.join(errors)})
+        return checked
+
+
+@six.add_metaclass(abc.ABCMeta)
+class CreateManager(BaseCreateManager, Manager):
+    """Provides creation operations with a particular API."""
+
+    def _create(self, new):
         url = self._path()
         resp, body = self.api.json_request('POST', url, body=new)
         if body:
-            return self.resource_class(self, body)
+            resource = self.resource_class(self, body)
+            self._refresh_cached(getattr(resource, 'uuid', None), resource)
+            return resource
+
+    def create(self, **kwargs):
+        """Create a resource based on a kwargs dictionary of attributes.
+
+        :param kwargs: A dictionary containing the attributes of the resource
+                       that will be created.
+        :raises exc.InvalidAttribute: For invalid attributes that are not
+                                      needed to create the resource.
+        """
+
+        return self._create(self._validate_creation(kwargs))
+
+    def create_many(self, items, concurrency=1):
+        """Create several resources.
+
+        Every item is validated before any of them is sent, so nothing is
+        created if one of them holds invalid attributes.
+
+        :param items: An iterable of dictionaries containing the attributes
+                      of the resources that will be created.
+        :param concurrency: Maximum number of creations running at once.
+        :raises exc.InvalidAttribute: If any item has attributes that are
+                                      not needed to create the resource.
+        :returns: A list of :class:`BatchResult` keyed by the index of the
+                  item in 'items', in that order. A failed creation is
+                  reported in the 'error' field of its result and does not
+                  abort the others.
+        """
+        checked = self._validate_creation_items(items)
+        return self._batch(lambda item: self._create(item[1]), checked,
+                           concurrency=concurrency, key=lambda item: item[0])
 
 
 class Resource(base.Resource):
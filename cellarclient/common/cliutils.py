@@ -18,8 +18,10 @@
 
 from __future__ import print_function
 
+import csv
 import getpass
 import inspect
+import itertools
 import json
 import os
 import sys
@@ -31,6 +33,9 @@ import prettytable
 import six
 from six import moves
 
+from cellarclient.common.i18n import _
+from cellarclient.common import jsonutils
+
 
 class MissingArgs(Exception):
     """Supplied arguments are not sufficient for calling a function."""
@@ -137,10 +142,127 @@ def isunauthenticated(func):
     return getattr(func, 'unauthenticated', False)
 
 
+OUTPUT_FORMATS = ('table', 'json', 'json-compact', 'ndjson', 'csv', 'tsv',
+                  'fixed')
+# NOTE: formats consuming the objects one at a time, without holding them.
+STREAMING_FORMATS = ('json-compact', 'ndjson', 'csv', 'tsv', 'fixed')
+# NOTE: number of rows the columns of the 'fixed' format are sized from.
+FIXED_SAMPLE_SIZE = 100
+# NOTE: size in bytes of the writes of the 'json-compact' format.
+JSON_CHUNK_SIZE = 65536
+
+
+def _write_chunks(pieces, chunk_size=None):
+    """Write UTF-8 byte strings to the standard output.
+
+    The pieces are joined in writes of at least 'chunk_size' bytes,
+    JSON_CHUNK_SIZE by default, and the output is flushed after each of
+    them.
+    """
+    chunk_size = chunk_size or JSON_CHUNK_SIZE
+    stream = getattr(sys.stdout, 'buffer', None)
+    if stream is not None:
+        # NOTE: text printed before must be written first.
+        sys.stdout.flush()
+    else:
+        # NOTE: sys.stdout may be replaced by a text stream, e.g. in tests.
+        stream = sys.stdout
+
+    def _write(data):
+        if six.PY3 and stream is sys.stdout:
+            data = data.decode('utf-8')
+        stream.write(data)
+        stream.flush()
+
+    chunk = []
+    size = 0
+    for piece in pieces:
+        chunk.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            _write(b''.join(chunk))
+            chunk = []
+            size = 0
+    if chunk:
+        _write(b''.join(chunk))
+
+
+def _compact_array(items):
+    dumps = jsonutils.get_dumps()
+    yield b'['
+    for index, item in enumerate(items):
+        if index:
+            yield b','
+        yield dumps(item)
+    yield b']\n'
+
+
+def _write_line(line):
+    if not six.PY3:
+        line = encodeutils.safe_encode(line)
+    sys.stdout.write(line + '\n')
+    sys.stdout.flush()
+
+
+def _cell(value):
+    """Return the text of a value in a CSV, TSV or fixed-width cell."""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return six.text_type(value)
+
+
+def _print_delimited(rows, labels, dialect):
+    writer = csv.writer(sys.stdout, dialect=dialect, lineterminator='\n')
+
+    def _encode(cells):
+        # NOTE: the csv module of Python 2 only writes bytes.
+        if six.PY3:
+            return cells
+        return [encodeutils.safe_encode(cell) for cell in cells]
+
+    writer.writerow(_encode(labels))
+    for row in rows:
+        writer.writerow(_encode([_cell(value) for name, value in row]))
+        sys.stdout.flush()
+
+
+def _print_fixed(rows, labels):
+    rows = iter(rows)
+    sample = [[_cell(value).replace('\n', ' ') for name, value in row]
+              for row in itertools.islice(rows, FIXED_SAMPLE_SIZE)]
+    widths = [max([len(label)] + [len(cells[i]) for cells in sample])
+              for i, label in enumerate(labels)]
+
+    def _line(cells):
+        # NOTE: values wider than their column overflow instead of being
+        # cut, later rows may not be aligned but are complete.
+        return '  '.join(cell.ljust(width)
+                         for cell, width in zip(cells, widths)).rstrip()
+
+    _write_line(_line(labels))
+    _write_line(_line(['-' * width for width in widths]))
+    for cells in sample:
+        _write_line(_line(cells))
+    for row in rows:
+        _write_line(_line([_cell(value).replace('\n', ' ')
+                           for name, value in row]))
+
+
 def print_list(objs, fields, formatters=None, sortby_index=0,
-               mixed_case_fields=None, field_labels=None, json_flag=False):
+               mixed_case_fields=None, field_labels=None, json_flag=False,
+               output_format=None):
     """Print a list of objects or dict as a table, one row per object or dict.
 
+    The 'ndjson', 'csv', 'tsv' and 'fixed' formats print each row as soon
+    as its object is consumed, so 'objs' may be a generator fetching the
+    objects while they are printed. The 'fixed' format is a table whose
+    columns are sized from the first FIXED_SAMPLE_SIZE rows. The
+    'json-compact' format prints a JSON array without whitespace, in
+    chunks of JSON_CHUNK_SIZE bytes. These JSON formats use the fastest
+    installed JSON library.
+
     :param objs: iterable of :class:`Resource`
     :param fields: attributes that correspond to columns, in order
     :param formatters: `dict` of callables for field formatting
@@ -150,8 +272,10 @@ def print_list(objs, fields, formatters=None, sortby_index=0,
     :param field_labels: Labels to use in the heading of the table, default to
         fields.
     :param json_flag: print the list as JSON instead of table
+    :param output_format: one of OUTPUT_FORMATS, defaults to 'json' if
+        'json_flag' is set and 'table' otherwise.
     """
-    def _get_name_and_data(field):
+    def _get_name_and_data(o, field):
         if field in formatters:
             # The value of the field has to be modified.
             # For example, it can be used to add extra fields.
@@ -173,6 +297,30 @@ def print_list(objs, fields, formatters=None, sortby_index=0,
         raise ValueError(_("Field labels list %(labels)s has different number "
                            "of elements than fields list %(fields)s"),
                          {'labels': field_labels, 'fields': fields})
+    output_format = output_format or ('json' if json_flag else 'table')
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(_("Unknown output format %(format)s, expected one "
+                           "of %(formats)s") %
+                         {'format': output_format,
+                          'formats': ', '.join(OUTPUT_FORMATS)})
+
+    rows = ([_get_name_and_data(o, field) for field in fields] for o in objs)
+
+    if output_format == 'json-compact':
+        _write_chunks(_compact_array(dict(row) for row in rows))
+        return
+    if output_format == 'ndjson':
+        dumps = jsonutils.get_dumps()
+        _write_chunks((dumps(dict(row)) + b'\n' for row in rows),
+                      chunk_size=1)
+        return
+    if output_format in ('csv', 'tsv'):
+        _print_delimited(rows, field_labels,
+                         'excel' if output_format == 'csv' else 'excel-tab')
+        return
+    if output_format == 'fixed':
+        _print_fixed(rows, field_labels)
+        return
 
     if sortby_index is None:
         kwargs = {}
@@ -183,16 +331,13 @@ def print_list(objs, fields, formatters=None, sortby_index=0,
 
     json_array = []
 
-    for o in objs:
-        row = []
-        for field in fields:
-            row.append(_get_name_and_data(field))
-        if json_flag:
+    for row in rows:
+        if output_format == 'json':
             json_array.append(dict(row))
         else:
             pt.add_row([r[1] for r in row])
 
-    if json_flag:
+    if output_format == 'json':
         print(json.dumps(json_array, indent=4, separators=(',', ': ')))
     elif six.PY3:
         print(encodeutils.safe_encode(pt.get_string(**kwargs)).decode())
@@ -201,7 +346,7 @@ def print_list(objs, fields, formatters=None, sortby_index=0,
 
 
 def print_dict(dct, dict_property="Property", wrap=0, dict_value='Value',
-               json_flag=False):
+               json_flag=False, output_format=None):
     """Print a `dict` as a table of two columns.
 
     :param dct: `dict` to print
@@ -209,8 +354,14 @@ def print_dict(dct, dict_property="Property", wrap=0, dict_value='Value',
     :param wrap: wrapping for the second column
     :param dict_value: header label for the value (second) column
     :param json_flag: print `dict` as JSON instead of table
+    :param output_format: 'json-compact' or 'ndjson' print `dict` as JSON
+        on a single line, 'json' is the same as 'json_flag' and other
+        formats print a table.
     """
-    if json_flag:
+    if output_format in ('json-compact', 'ndjson'):
+        _write_chunks([jsonutils.dumps(dct) + b'\n'])
+        return
+    if json_flag or output_format == 'json':
         print(json.dumps(dct, indent=4, separators=(',', ': ')))
         return
     pt = prettytable.PrettyTable([dict_property, dict_value])
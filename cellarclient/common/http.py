@@ -14,29 +14,58 @@
 #    under the License.
 
 import copy
+import email.utils
 import functools
 import hashlib
 import json
 import logging
+import math
+import socket
+import threading
 import time
+import zlib
 
 import requests
+from requests import adapters
 import six
 import six.moves.urllib.parse as urlparse
 from cellarclient import exc
+from cellarclient.common import filecache
+from cellarclient.common import httpcache
+from cellarclient.common import jsonutils
+from cellarclient.common import retry
 from cellarclient.common.i18n import _
 from cellarclient.common.i18n import _LE
+from oslo_utils import encodeutils
 from oslo_utils import strutils
+from oslo_utils import timeutils
 from six.moves import http_client
+from urllib3 import connection as urllib3_connection
+from urllib3 import exceptions as urllib3_exceptions
+from urllib3.util import request as urllib3_request
 
 LOG = logging.getLogger(__name__)
 USER_AGENT = 'python-cellarclient'
 CHUNKSIZE = 1024 * 64  # 64kB
+# NOTE: larger bodies grow the buffer while they are read.
+MAX_BODY_PRESIZE = 1024 * 1024 * 16  # 16MB
 DEFAULT_VER = '1'
 
 DEFAULT_MAX_RETRIES = 5
 DEFAULT_RETRY_INTERVAL = 2
+DEFAULT_RETRY_AFTER_MAX = 60
+DEFAULT_TIMEOUT = 600
+DEFAULT_POOL_CONNECTIONS = adapters.DEFAULT_POOLSIZE
+DEFAULT_POOL_MAXSIZE = adapters.DEFAULT_POOLSIZE
+DEFAULT_POOL_BLOCK = adapters.DEFAULT_POOLBLOCK
+# NOTE: the encodings urllib3 can decode, brotli and zstd are included when
+# their libraries are installed.
+ACCEPT_ENCODING = urllib3_request.ACCEPT_ENCODING
 SENSITIVE_HEADERS = ('X-Auth-Token',)
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+API_VERSION_HEADER = 'X-OpenStack-Cellar-API-Version'
+API_MIN_VERSION_HEADER = 'X-OpenStack-Cellar-API-Minimum-Version'
+API_MAX_VERSION_HEADER = 'X-OpenStack-Cellar-API-Maximum-Version'
 
 
 SUPPORTED_ENDPOINT_SCHEME = ('http', 'https')
@@ -68,38 +97,442 @@ def get_server(endpoint):
 
 
 _RETRY_EXCEPTIONS = (exc.Conflict, exc.ServiceUnavailable,
-                     exc.ConnectionRefused)
+                     exc.ConnectionRefused, exc.Timeout)
+
+
+def _get_retry_attempts(client):
+    """Return the number of attempts allowed for a request of 'client'."""
+    if client.conflict_max_retries is None:
+        client.conflict_max_retries = DEFAULT_MAX_RETRIES
+    if client.conflict_retry_interval is None:
+        client.conflict_retry_interval = DEFAULT_RETRY_INTERVAL
+    return client.conflict_max_retries + 1
+
+
+def _get_retry_delay(client, error, attempt, num_attempts, elapsed=0,
+                     deadline=None):
+    """Log a failed attempt and return the time to wait before the next one.
+
+    The delay is the Retry-After hint of the error when there is one,
+    capped at the retry_after_max of the client, and is otherwise given
+    by the retry policy of the client. No attempt is left once
+    'num_attempts' is reached, when waiting would exceed the maximum retry
+    time of the client or the deadline of the request, or when its retry
+    budget is exhausted.
+
+    :param elapsed: time in seconds spent since the first attempt.
+    :param deadline: optional time in seconds, since the first attempt,
+        within which the request must complete.
+    :returns: the delay in seconds, or None if no attempt is left.
+    """
+    msg = (_LE("Error contacting Cellar server: %(error)s. "
+               "Attempt %(attempt)d of %(total)d") %
+           {'attempt': attempt,
+            'total': num_attempts,
+            'error': error})
+    delay = None
+    if attempt < num_attempts:
+        retry_after = _parse_retry_after(getattr(error, 'retry_after', None))
+        if retry_after is not None:
+            max_delay = getattr(client, 'retry_after_max',
+                                DEFAULT_RETRY_AFTER_MAX)
+            delay = min(retry_after, max_delay)
+            LOG.debug('Server asked to retry after %(retry_after)s seconds, '
+                      'waiting %(delay)s seconds',
+                      {'retry_after': retry_after, 'delay': delay})
+        else:
+            policy = retry.get_policy(getattr(client, 'retry_policy', None))
+            delay = policy.get_delay(client.conflict_retry_interval, attempt)
+            LOG.debug('Retry policy %(policy)s gives a delay of %(delay)s '
+                      'seconds', {'policy': type(policy).__name__,
+                                  'delay': delay})
+        max_time = getattr(client, 'retry_max_time', None)
+        budget = getattr(client, 'retry_budget', None)
+        if max_time is not None and elapsed + delay > max_time:
+            LOG.debug('Not retrying, the retry time of %s seconds would be '
+                      'exceeded', max_time)
+            delay = None
+        elif deadline is not None and elapsed + delay >= deadline:
+            LOG.debug('Not retrying, the deadline of %s seconds would be '
+                      'exceeded', deadline)
+            delay = None
+        elif budget is not None and not budget.withdraw():
+            LOG.debug('Not retrying, the retry budget is exhausted')
+            delay = None
+    if delay is None:
+        LOG.error(msg)
+        return None
+    LOG.debug(msg)
+    return delay
+
+
+def _parse_retry_after(value):
+    """Return the delay in seconds given by a Retry-After header value.
+
+    :param value: a number of seconds or an HTTP-date.
+    :returns: the delay, or None if the value is missing or invalid.
+    """
+    if value is None:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        pass
+    else:
+        if math.isnan(delay) or math.isinf(delay):
+            return None
+        return max(delay, 0)
+    date = email.utils.parsedate_tz(value)
+    if date is None:
+        return None
+    return max(email.utils.mktime_tz(date) - time.time(), 0)
+
+
+def _format_log_body(body, max_size=None):
+    """Return a request or response body as it should be logged.
+
+    Passwords are masked, then the body is truncated to 'max_size'
+    characters if it is longer. Masking runs on the whole body so that a
+    truncated secret cannot leak.
+    """
+    body = strutils.mask_password(body)
+    if max_size is not None and len(body) > max_size:
+        body = '%s... (%d more characters)' % (body[:max_size],
+                                               len(body) - max_size)
+    return body
+
+
+def _get_request_error(error, url):
+    """Return the client exception matching a requests exception.
+
+    :param error: the exception raised by requests, while sending the
+        request or reading its response.
+    :param url: the URL of the request.
+    """
+    message = (_("Error has occurred while handling "
+               "request for %(url)s: %(e)s") % dict(url=url, e=error))
+    # NOTE: requests reports a read timeout of a response being streamed
+    # as a ConnectionError.
+    if (isinstance(error, requests.exceptions.Timeout) or
+            error.args and isinstance(error.args[0],
+                                      urllib3_exceptions.ReadTimeoutError)):
+        return exc.Timeout(message)
+    # NOTE(aarefiev): not valid request(invalid url, missing schema,
+    # and so on), retrying is not needed.
+    if isinstance(error, ValueError):
+        return exc.ValidationError(message)
+    return exc.ConnectionRefused(message)
+
+
+def _iter_content(resp, url, chunk_size=CHUNKSIZE):
+    """Iterate over the chunks of the body of a streamed response.
+
+    The errors raised while the body is read are translated like those of
+    the request, see :func:`_get_request_error`.
+    """
+    try:
+        for chunk in resp.iter_content(chunk_size=chunk_size):
+            yield chunk
+    except requests.exceptions.RequestException as e:
+        raise _get_request_error(e, url)
+
+
+def _read_body(resp, chunk_size=CHUNKSIZE):
+    """Read the whole body of a streamed response.
+
+    The chunks are copied into a single buffer presized from the
+    Content-Length header, up to MAX_BODY_PRESIZE bytes, instead of being
+    kept in a list and joined, so the body is held in memory only once.
+    The body is also stored as the response content, so that resp.content
+    and resp.text keep working.
+
+    :param chunk_size: number of bytes read at a time.
+    :returns: the body, as a bytearray.
+    """
+    try:
+        length = int(resp.headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        length = 0
+    # NOTE: the length is only a hint, a compressed body is longer once
+    # decoded and slice assignment grows the buffer past it. It comes from
+    # the server, a bogus value must not allocate memory up front.
+    content = bytearray(min(max(length, 0), MAX_BODY_PRESIZE))
+    pos = 0
+    for chunk in resp.iter_content(chunk_size=chunk_size):
+        content[pos:pos + len(chunk)] = chunk
+        pos += len(chunk)
+    del content[pos:]
+    resp._content = content
+    return content
+
+
+def _compress_body(body, headers, min_size=None):
+    """Gzip a request body if it is at least 'min_size' bytes long.
+
+    :param body: the body, as text or bytes.
+    :param headers: the request headers, updated with the Content-Encoding
+        of a compressed body.
+    :param min_size: minimum size in bytes of the bodies to compress. None
+        disables compression.
+    :returns: the body to send.
+    """
+    if min_size is None or 'Content-Encoding' in headers:
+        return body
+    data = body
+    if isinstance(data, six.text_type):
+        data = data.encode('utf-8')
+    if not isinstance(data, six.binary_type) or len(data) < min_size:
+        return body
+    compressor = zlib.compressobj(6, zlib.DEFLATED, _GZIP_WBITS)
+    compressed = compressor.compress(data) + compressor.flush()
+    headers['Content-Encoding'] = 'gzip'
+    LOG.debug('Request body compressed from %(size)d to %(compressed)d '
+              'bytes', {'size': len(data), 'compressed': len(compressed)})
+    return compressed
+
+
+class CompressionStats(object):
+    """Thread-safe counters of the compression of requests and responses.
+
+    'responses' counts the response bodies read, 'compressed_responses'
+    those sent with a Content-Encoding, 'wire_bytes' and 'decoded_bytes'
+    their size as received and once decoded, 'read_time' the time spent
+    reading and decoding them. 'compressed_requests', 'request_bytes' and
+    'compressed_request_bytes' count the request bodies compressed and
+    their size before and after compression.
+    """
+
+    FIELDS = ('responses', 'compressed_responses', 'wire_bytes',
+              'decoded_bytes', 'read_time', 'compressed_requests',
+              'request_bytes', 'compressed_request_bytes')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self.FIELDS, 0)
+
+    def add(self, **counters):
+        with self._lock:
+            for name, value in counters.items():
+                self._counters[name] += value
+
+    def get(self):
+        """Return the counters, with the compression 'ratio' of responses.
+
+        The ratio is the decoded size of the responses divided by their
+        size on the wire.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats['ratio'] = (float(stats['decoded_bytes']) / stats['wire_bytes']
+                          if stats['wire_bytes'] else None)
+        return stats
+
+
+def _add_validators(headers, entry):
+    """Make a request conditional on the validators of a cached entry."""
+    if entry is None:
+        return
+    if entry.etag:
+        headers.setdefault('If-None-Match', entry.etag)
+    if entry.last_modified:
+        headers.setdefault('If-Modified-Since', entry.last_modified)
+
+
+def _iter_text(content):
+    """Iterate over a response body, decoding it only when consumed."""
+    yield content.decode('utf-8')
+
+
+def _decode_json(content, loads=jsonutils.loads):
+    """Decode a JSON response body straight from its bytes.
+
+    :param loads: the function decoding JSON documents.
+    :returns: the decoded document, or the body as text if it is not
+        valid JSON.
+    """
+    try:
+        return loads(content)
+    except ValueError:
+        LOG.error(_LE('Could not decode response body as JSON'))
+        return content.decode('utf-8')
+
+
+def _record_request(client):
+    """Record a request in the retry budget of 'client', if any."""
+    budget = getattr(client, 'retry_budget', None)
+    if budget is not None:
+        budget.deposit()
+
+
+def _get_request_timeout(client, timeout=None):
+    """Return the (connect, read) timeout of a request of 'client'.
+
+    :param timeout: Optional, per-call timeout overriding the client one.
+        Either a (connect, read) tuple, or a number of seconds used as read
+        timeout and as connect timeout when the client has none.
+    """
+    if isinstance(timeout, tuple):
+        return timeout
+    # NOTE: a SessionClient leaves the timeouts to its session.
+    read = (timeout if timeout is not None
+            else getattr(client, 'timeout', None))
+    connect = getattr(client, 'connect_timeout', None)
+    if connect is None:
+        connect = read
+    return (connect, read)
+
+
+def _get_attempt_kwargs(client, url, kwargs, deadline, elapsed):
+    """Return the arguments of an attempt of a request with a deadline.
+
+    The timeouts of the attempt are capped at the time left before the
+    deadline, so that retries can not extend it.
+
+    :param deadline: time in seconds, since the first attempt, within
+        which the request must complete, or None.
+    :param elapsed: time in seconds spent since the first attempt.
+    :raises exc.Timeout: if no time is left before the deadline.
+    """
+    if deadline is None:
+        return kwargs
+    left = deadline - elapsed
+    if left <= 0:
+        raise exc.Timeout(
+            _("Request for %(url)s did not complete within %(deadline)s "
+              "seconds") % {'url': url, 'deadline': deadline})
+    connect, read = _get_request_timeout(client, kwargs.get('timeout'))
+    return dict(kwargs, timeout=(min(connect or left, left),
+                                 min(read or left, left)))
+
+
+def _get_retry_budget(ratio):
+    """Return a retry budget allowing 'ratio' of retries, or None."""
+    if ratio is None:
+        return None
+    return retry.RetryBudget(ratio)
+
 
 def with_retries(func):
-    """Wrapper for _http_request adding support for retries."""
-    @functools.wraps(func)
-    def wrapper(self, url, method, **kwargs):
-        if self.conflict_max_retries is None:
-            self.conflict_max_retries = DEFAULT_MAX_RETRIES
-        if self.conflict_retry_interval is None:
-            self.conflict_retry_interval = DEFAULT_RETRY_INTERVAL
+    """Wrapper for _http_request adding support for retries.
 
-        num_attempts = self.conflict_max_retries + 1
+    The wrapped method accepts a 'deadline' argument, the time in seconds
+    within which the request must complete, retries included.
+    """
+    @functools.wraps(func)
+    def wrapper(self, url, method, deadline=None, **kwargs):
+        num_attempts = _get_retry_attempts(self)
+        _record_request(self)
+        watch = timeutils.StopWatch().start()
         for attempt in range(1, num_attempts + 1):
+            attempt_kwargs = _get_attempt_kwargs(self, url, kwargs, deadline,
+                                                 watch.elapsed())
             try:
-                return func(self, url, method, **kwargs)
+                return func(self, url, method, **attempt_kwargs)
             except _RETRY_EXCEPTIONS as error:
-                msg = (_LE("Error contacting Cellar server: %(error)s. "
-                           "Attempt %(attempt)d of %(total)d") %
-                       {'attempt': attempt,
-                        'total': num_attempts,
-                        'error': error})
-                if attempt == num_attempts:
-                    LOG.error(msg)
+                delay = _get_retry_delay(self, error, attempt, num_attempts,
+                                         watch.elapsed(), deadline)
+                if delay is None:
                     raise
-                else:
-                    LOG.debug(msg)
-                    time.sleep(self.conflict_retry_interval)
+                time.sleep(delay)
 
     return wrapper
 
 
-class HTTPClient():
+class VersionNegotiationMixin(object):
+    """Negotiate the API version when the server rejects the requested one.
+    """
+
+    def negotiate_version(self, conn, resp):
+        """Return the API version to use after a 406 response.
+
+        The highest version advertised by the server is used and saved in
+        the file cache, so later clients for that server start with it.
+
+        :param conn: the connection the request was sent on.
+        :param resp: the 406 response.
+        :raises exc.UnsupportedVersion: if the server does not advertise
+            the versions it supports, or still rejects the negotiated one.
+        """
+        min_ver, max_ver = self._parse_version_headers(resp)
+        if max_ver is None:
+            raise exc.UnsupportedVersion(
+                _("The server does not support the requested API version "
+                  "and did not advertise the versions it supports."))
+        if self.api_version_select_state == 'negotiated':
+            raise exc.UnsupportedVersion(
+                _("The server rejected the negotiated API version %s.") %
+                max_ver)
+
+        LOG.debug('Negotiated API version %(ver)s (server supports '
+                  '%(min)s to %(max)s)',
+                  {'ver': max_ver, 'min': min_ver, 'max': max_ver})
+        host, port = get_server(self.endpoint)
+        filecache.save_data(host=host, port=port, data=max_ver)
+        self.api_version_select_state = 'negotiated'
+        return max_ver
+
+    def _generic_parse_version_headers(self, accessor_func):
+        min_ver = accessor_func(API_MIN_VERSION_HEADER, None)
+        max_ver = accessor_func(API_MAX_VERSION_HEADER, None)
+        return min_ver, max_ver
+
+
+def _keepalive_socket_options(keepalive):
+    """Return the socket options enabling TCP keep-alive probes.
+
+    :param keepalive: idle time in seconds before the first probe, also
+        used as the interval between probes where the platform allows it.
+    """
+    keepalive = int(keepalive)
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    for name, value in (('TCP_KEEPIDLE', keepalive),
+                        ('TCP_KEEPINTVL', keepalive),
+                        ('TCP_KEEPCNT', 3)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name),
+                            value))
+    return options
+
+
+class HTTPAdapter(adapters.HTTPAdapter):
+    """Transport adapter with TCP keep-alive and connection pool counters.
+
+    :param keepalive: Optional, idle time in seconds before TCP keep-alive
+        probes are sent on pooled connections. None leaves the system
+        defaults.
+    """
+
+    def __init__(self, keepalive=None, **kwargs):
+        self.keepalive = keepalive
+        super(HTTPAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.keepalive:
+            kwargs['socket_options'] = (
+                urllib3_connection.HTTPConnection.default_socket_options +
+                _keepalive_socket_options(self.keepalive))
+        super(HTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
+    def get_pool_stats(self):
+        """Return connection pool usage counters.
+
+        'requests' counts the requests sent through the pools, 'misses'
+        the connections that had to be opened for them and 'hits' the
+        requests served by an already open connection.
+        """
+        num_requests = num_connections = 0
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                num_requests += pool.num_requests
+                num_connections += pool.num_connections
+        return {'requests': num_requests,
+                'hits': max(num_requests - num_connections, 0),
+                'misses': num_connections}
+
+
+class HTTPClient(VersionNegotiationMixin):
 
     def __init__(self, endpoint, **kwargs):
         self.endpoint = endpoint
@@ -112,7 +545,32 @@ class HTTPClient():
                                                DEFAULT_MAX_RETRIES)
         self.conflict_retry_interval = kwargs.pop('retry_interval',
                                                   DEFAULT_RETRY_INTERVAL)
+        self.retry_policy = retry.get_policy(kwargs.get('retry_policy'))
+        self.retry_max_time = kwargs.get('retry_max_time')
+        self.retry_after_max = kwargs.get('retry_after_max')
+        if self.retry_after_max is None:
+            self.retry_after_max = DEFAULT_RETRY_AFTER_MAX
+        self.retry_budget = _get_retry_budget(kwargs.get('retry_budget'))
+        self.timeout = kwargs.get('timeout')
+        self.connect_timeout = kwargs.get('connect_timeout')
+        self.log_body_max = kwargs.get('log_body_max')
+        self.chunk_size = kwargs.get('chunk_size') or CHUNKSIZE
+        self.compress_min_size = kwargs.get('compress_min_size')
+        self.compression_stats = CompressionStats()
+        self.response_cache = None
+        if kwargs.get('http_cache_size'):
+            self.response_cache = httpcache.ResponseCache(
+                kwargs['http_cache_size'], kwargs.get('http_cache_dir'))
+        self.json_loads = jsonutils.get_loads(kwargs.get('json_backend'))
         self.session = requests.Session()
+        self.adapter = HTTPAdapter(
+            pool_connections=kwargs.get('pool_connections') or
+            DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=kwargs.get('pool_maxsize') or DEFAULT_POOL_MAXSIZE,
+            pool_block=bool(kwargs.get('pool_block', DEFAULT_POOL_BLOCK)),
+            keepalive=kwargs.get('keepalive'))
+        for prefix in ('http://', 'https://'):
+            self.session.mount(prefix, self.adapter)
 
         parts = urlparse.urlparse(endpoint)
         if parts.scheme not in SUPPORTED_ENDPOINT_SCHEME:
@@ -127,6 +585,41 @@ class HTTPClient():
             self.session.cert = (kwargs.get('cert_file'),
                                  kwargs.get('key_file'))
 
+    def get_pool_stats(self):
+        """Return the connection pool hit/miss counters of this client."""
+        return self.adapter.get_pool_stats()
+
+    def get_compression_stats(self):
+        """Return the compression counters of this client.
+
+        See :class:`CompressionStats`.
+        """
+        return self.compression_stats.get()
+
+    def _read_body(self, resp):
+        """Read the body of a response and record its compression."""
+        start = time.time()
+        content = _read_body(resp, self.chunk_size)
+        elapsed = time.time() - start
+        encoding = resp.headers.get('Content-Encoding')
+        try:
+            wire_bytes = int(resp.raw.tell())
+        except (AttributeError, TypeError, ValueError):
+            wire_bytes = len(content)
+        self.compression_stats.add(
+            responses=1, compressed_responses=1 if encoding else 0,
+            wire_bytes=wire_bytes, decoded_bytes=len(content),
+            read_time=elapsed)
+        if encoding:
+            LOG.debug('Read %(wire)d bytes of %(encoding)s encoded body, '
+                      '%(size)d bytes decoded (ratio %(ratio).1f) in '
+                      '%(time).3f seconds',
+                      {'wire': wire_bytes, 'encoding': encoding,
+                       'size': len(content),
+                       'ratio': float(len(content)) / max(wire_bytes, 1),
+                       'time': elapsed})
+        return content
+
     def _process_header(self, name, value):
         """Redacts any sensitive header
 
@@ -166,14 +659,14 @@ class HTTPClient():
             curl.append('--key %s' % self.session.cert[1])
 
         if 'body' in kwargs:
-            body = strutils.mask_password(kwargs['body'])
+            body = _format_log_body(kwargs['body'], self.log_body_max)
             curl.append('-d \'%s\'' % body)
 
         curl.append(urlparse.urljoin(self.endpoint_trimmed, url))
         LOG.debug(' '.join(curl))
 
     @staticmethod
-    def log_http_response(resp, body=None):
+    def log_http_response(resp, body=None, max_size=None):
         # NOTE(aarefiev): resp.raw is urllib3 response object, it's used
         # only to get 'version', response from request with 'stream = True'
         # should be used for raw reading.
@@ -182,7 +675,7 @@ class HTTPClient():
         dump.extend(['%s: %s' % (k, v) for k, v in resp.headers.items()])
         dump.append('')
         if body:
-            body = strutils.mask_password(body)
+            body = _format_log_body(body, max_size)
             dump.extend([body, ''])
         LOG.debug('\n'.join(dump))
 
@@ -205,55 +698,75 @@ class HTTPClient():
         # Copy the kwargs so we can reuse the original in case of redirects
         kwargs['headers'] = copy.deepcopy(kwargs.get('headers', {}))
         kwargs['headers'].setdefault('User-Agent', USER_AGENT)
+        kwargs['headers'].setdefault('Accept-Encoding', ACCEPT_ENCODING)
         if self.auth_token:
             kwargs['headers'].setdefault('X-Auth-Token', self.auth_token)
 
-        self.log_curl_request(method, url, kwargs)
+        debug = LOG.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.log_curl_request(method, url, kwargs)
 
         # NOTE(aarefiev): This is for backwards compatibility, request
         # expected body in 'data' field, previously we used httplib,
         # which expected 'body' field.
         body = kwargs.pop('body', None)
         if body:
-            kwargs['data'] = body
-
+            data = _compress_body(body, kwargs['headers'],
+                                  self.compress_min_size)
+            if data is not body:
+                self.compression_stats.add(
+                    compressed_requests=1,
+                    request_bytes=len(encodeutils.safe_encode(body)),
+                    compressed_request_bytes=len(data))
+            kwargs['data'] = data
+        kwargs['timeout'] = _get_request_timeout(self, kwargs.get('timeout'))
+
+        # NOTE: the body is always streamed so that _read_body() controls
+        # how it is read, 'stream' only tells whether the caller reads it.
+        stream = kwargs.get('stream', False)
         conn_url = self._make_connection_url(url)
         try:
             resp = self.session.request(method,
                                         conn_url,
-                                        **kwargs)
+                                        **dict(kwargs, stream=True))
 
             # TODO(deva): implement graceful client downgrade when connecting
             # to servers that did not support microversions. Details here:
             # http://specs.openstack.org/openstack/ironic-specs/specs/kilo/api-microversions.html#use-case-3b-new-client-communicating-with-a-old-ironic-user-specified  # noqa
 
             if resp.status_code == http_client.NOT_ACCEPTABLE:
+                resp.close()
                 negotiated_ver = self.negotiate_version(self.session, resp)
-                kwargs['headers']['X-OpenStack-Cellar-API-Version'] = (
-                    negotiated_ver)
+                kwargs['headers'][API_VERSION_HEADER] = negotiated_ver
                 return self._http_request(url, method, **kwargs)
 
         except requests.exceptions.RequestException as e:
-            message = (_("Error has occurred while handling "
-                       "request for %(url)s: %(e)s") %
-                       dict(url=conn_url, e=e))
-            # NOTE(aarefiev): not valid request(invalid url, missing schema,
-            # and so on), retrying is not needed.
-            if isinstance(e, ValueError):
-                raise exc.ValidationError(message)
+            raise _get_request_error(e, conn_url)
 
-            raise exc.ConnectionRefused(message)
-
-        body_iter = resp.iter_content(chunk_size=CHUNKSIZE)
-
-        # Read body into string if it isn't obviously image data
+        # Read body into memory unless the caller streams it. It is kept as
+        # bytes, only decoded to text for the logs and error messages or
+        # when the caller iterates over it, unless it is obviously image
+        # data.
         body_str = None
-        if resp.headers.get('Content-Type') != 'application/octet-stream':
-            body_str = ''.join([chunk.decode() for chunk in body_iter])
-            self.log_http_response(resp, body_str)
-            body_iter = six.StringIO(body_str)
+        if stream and resp.status_code < http_client.BAD_REQUEST:
+            body_iter = _iter_content(resp, conn_url, self.chunk_size)
+            if debug:
+                self.log_http_response(resp)
         else:
-            self.log_http_response(resp)
+            try:
+                content = self._read_body(resp)
+            except requests.exceptions.RequestException as e:
+                raise _get_request_error(e, conn_url)
+            if resp.headers.get('Content-Type') != 'application/octet-stream':
+                if debug or resp.status_code >= http_client.BAD_REQUEST:
+                    body_str = content.decode('utf-8')
+                if debug:
+                    self.log_http_response(resp, body_str, self.log_body_max)
+                body_iter = _iter_text(content)
+            else:
+                body_iter = iter([content])
+                if debug:
+                    self.log_http_response(resp)
 
         if resp.status_code >= http_client.BAD_REQUEST:
             error_json = _extract_error_json(body_str)
@@ -278,7 +791,27 @@ class HTTPClient():
         if 'body' in kwargs:
             kwargs['body'] = json.dumps(kwargs['body'])
 
-        resp, body_iter = self._http_request(url, method, **kwargs)
+        cache_key = entry = generation = None
+        if self.response_cache is not None:
+            cache_key = self._make_connection_url(url)
+            if method == 'GET':
+                generation = self.response_cache.generation
+                entry = self.response_cache.get(cache_key)
+                _add_validators(kwargs['headers'], entry)
+            else:
+                self.response_cache.delete(cache_key)
+
+        try:
+            resp, body_iter = self._http_request(url, method, **kwargs)
+        finally:
+            if cache_key is not None and method != 'GET':
+                # NOTE: a GET sent during the write may have been answered
+                # before it was applied.
+                self.response_cache.delete(cache_key)
+        if entry is not None and resp.status_code == http_client.NOT_MODIFIED:
+            self.response_cache.record_hit()
+            return resp, _decode_json(entry.content, self.json_loads)
+
         content_type = resp.headers.get('Content-Type')
 
         if (resp.status_code in (http_client.NO_CONTENT,
@@ -287,16 +820,60 @@ class HTTPClient():
             return resp, list()
 
         if 'application/json' in content_type:
-            body = ''.join([chunk for chunk in body_iter])
-            try:
-                body = json.loads(body)
-            except ValueError:
-                LOG.error(_LE('Could not decode response body as JSON'))
+            body = _decode_json(resp.content, self.json_loads)
+            if method == 'GET' and cache_key is not None:
+                self._cache_response(cache_key, resp, entry, generation)
         else:
             body = None
 
         return resp, body
 
+    def _cache_response(self, key, resp, previous=None, generation=None):
+        """Cache a GET response if the server sent validators for it.
+
+        :param generation: generation of the response cache when the
+            request was sent, see
+            :meth:`cellarclient.common.httpcache.ResponseCache.set`.
+        """
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        if resp.status_code != http_client.OK or not (etag or last_modified):
+            return
+        if (self.response_cache.set(key, httpcache.CacheEntry(
+                etag, last_modified, bytes(resp.content)), generation) and
+                previous is not None):
+            self.response_cache.record_update()
+
+    def get_http_cache_stats(self):
+        """Return the response cache counters of this client, or None.
+
+        See :meth:`cellarclient.common.httpcache.ResponseCache.get_stats`.
+        """
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get_stats()
+
+    def json_stream_request(self, method, url, response_key, **kwargs):
+        """Send a request and decode its JSON response while it is read.
+
+        :param response_key: name of the array of the response decoded item
+            by item, e.g. 'resources'.
+        :returns: a (response, stream) tuple, stream being a
+            :class:`cellarclient.common.jsonutils.ArrayStream` to iterate
+            over. It must be closed once done with.
+        """
+        kwargs.setdefault('headers', {})
+        kwargs['headers'].setdefault('Content-Type', 'application/json')
+        kwargs['headers'].setdefault('Accept', 'application/json')
+        kwargs['stream'] = True
+
+        if 'body' in kwargs:
+            kwargs['body'] = json.dumps(kwargs['body'])
+
+        resp, body_iter = self._http_request(url, method, **kwargs)
+        return resp, jsonutils.ArrayStream(body_iter, response_key,
+                                           close=resp.close)
+
     def raw_request(self, method, url, **kwargs):
         kwargs.setdefault('headers', {})
         kwargs['headers'].setdefault('Content-Type',
@@ -311,10 +888,12 @@ class SessionClient():
                  max_retries,
                  retry_interval,
                  endpoint,
+                 compress_min_size=None,
                  **kwargs):
         self.conflict_max_retries = max_retries
         self.conflict_retry_interval = retry_interval
         self.endpoint = endpoint
+        self.compress_min_size = compress_min_size
 
         super(SessionClient, self).__init__(**kwargs)
 
@@ -328,6 +907,11 @@ class SessionClient():
     @with_retries
     def _http_request(self, url, method, **kwargs):
         kwargs.setdefault('user_agent', USER_AGENT)
+        kwargs['headers'] = copy.deepcopy(kwargs.get('headers', {}))
+        kwargs['headers'].setdefault('Accept-Encoding', ACCEPT_ENCODING)
+        if kwargs.get('data'):
+            kwargs['data'] = _compress_body(
+                kwargs['data'], kwargs['headers'], self.compress_min_size)
         kwargs.setdefault('auth', self.auth)
         if isinstance(self.endpoint_override, six.string_types):
             kwargs.setdefault(
@@ -375,6 +959,23 @@ class SessionClient():
 
         return resp, body
 
+    def json_stream_request(self, method, url, response_key, **kwargs):
+        """Send a request and decode its JSON response while it is read.
+
+        See :meth:`HTTPClient.json_stream_request`.
+        """
+        kwargs.setdefault('headers', {})
+        kwargs['headers'].setdefault('Content-Type', 'application/json')
+        kwargs['headers'].setdefault('Accept', 'application/json')
+        kwargs['stream'] = True
+
+        if 'body' in kwargs:
+            kwargs['data'] = json.dumps(kwargs.pop('body'))
+
+        resp = self._http_request(url, method, **kwargs)
+        return resp, jsonutils.ArrayStream(_iter_content(resp, url),
+                                           response_key, close=resp.close)
+
     def raw_request(self, method, url, **kwargs):
         kwargs.setdefault('headers', {})
         kwargs['headers'].setdefault('Content-Type',
@@ -385,9 +986,39 @@ class SessionClient():
 def _construct_http_client(endpoint=None,
                            max_retries=DEFAULT_MAX_RETRIES,
                            retry_interval=DEFAULT_RETRY_INTERVAL,
-                           timeout=600,
+                           retry_policy=None,
+                           retry_max_time=None,
+                           retry_budget=None,
+                           retry_after_max=DEFAULT_RETRY_AFTER_MAX,
+                           timeout=DEFAULT_TIMEOUT,
+                           connect_timeout=None,
+                           pool_connections=DEFAULT_POOL_CONNECTIONS,
+                           pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                           pool_block=DEFAULT_POOL_BLOCK,
+                           keepalive=None,
+                           log_body_max=None,
+                           json_backend=None,
+                           chunk_size=CHUNKSIZE,
+                           compress_min_size=None,
+                           http_cache_size=None,
+                           http_cache_dir=None,
                            **kwargs):
     return HTTPClient(endpoint=endpoint,
                       max_retries=max_retries,
                       retry_interval=retry_interval,
-                      timeout=timeout)
+                      retry_policy=retry_policy,
+                      retry_max_time=retry_max_time,
+                      retry_budget=retry_budget,
+                      retry_after_max=retry_after_max,
+                      timeout=timeout,
+                      connect_timeout=connect_timeout,
+                      pool_connections=pool_connections,
+                      pool_maxsize=pool_maxsize,
+                      pool_block=pool_block,
+                      keepalive=keepalive,
+                      log_body_max=log_body_max,
+                      json_backend=json_backend,
+                      chunk_size=chunk_size,
+                      compress_min_size=compress_min_size,
+                      http_cache_size=http_cache_size,
+                      http_cache_dir=http_cache_dir)
@@ -0,0 +1,151 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Cache of GET responses revalidated with ETag and Last-Modified.
+"""
+
+import collections
+import os
+import threading
+
+import dogpile.cache
+
+DEFAULT_MAX_SIZE = 1024
+CACHE_FILENAME = 'cellar-responses.dbm'
+
+CacheEntry = collections.namedtuple('CacheEntry',
+                                    ['etag', 'last_modified', 'content'])
+"""A cached response.
+
+'etag' and 'last_modified' hold the validators sent by the server, None
+if it did not send them, and 'content' the body of the response.
+"""
+
+
+class ResponseCache(object):
+    """Cache of the responses of GET requests.
+
+    Entries are kept in memory in a bounded LRU and, when 'cache_dir' is
+    given, in a dbm file there, which outlives the process. They do not
+    expire: the client revalidates them with every request and the server
+    answers 304 Not Modified while they are current.
+
+    Every deletion, done for each write, bumps a generation counter. A GET
+    response is only stored if the generation did not change while it was
+    in flight, so that a response older than a write does not replace the
+    entry the write dropped.
+
+    :param max_size: maximum number of entries kept in memory.
+    :param cache_dir: optional directory of the on-disk cache.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, cache_dir=None):
+        self.max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = dict.fromkeys(
+            ('hits', 'misses', 'revalidations', 'updates', 'disk_hits'), 0)
+        self._region = None
+        if cache_dir:
+            if not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            self._region = dogpile.cache.make_region(
+                key_mangler=str).configure(
+                'dogpile.cache.dbm',
+                arguments={
+                    'filename': os.path.join(cache_dir, CACHE_FILENAME),
+                })
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, key):
+        """Return the entry cached for 'key', or None.
+
+        A cached entry counts as a revalidation, a missing one as a miss.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+        if entry is None and self._region is not None:
+            entry = self._region.get(key)
+            if entry is dogpile.cache.api.NO_VALUE:
+                entry = None
+            else:
+                self._count('disk_hits')
+                with self._lock:
+                    self._remember(key, entry)
+        self._count('misses' if entry is None else 'revalidations')
+        return entry
+
+    @property
+    def generation(self):
+        """Counter of the deletions, to pass to :meth:`set`."""
+        with self._lock:
+            return self._generation
+
+    def set(self, key, entry, generation=None):
+        """Cache 'entry' for 'key', replacing a previous one.
+
+        :param generation: optional value of :attr:`generation` when the
+            request of 'entry' was sent. The entry is not cached if an
+            entry was deleted since.
+        :returns: whether the entry was cached.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._remember(key, entry)
+            if self._region is not None:
+                self._region.set(key, entry)
+        return True
+
+    def delete(self, key):
+        """Drop the entry cached for 'key', if any."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+            if self._region is not None:
+                self._region.delete(key)
+
+    def record_hit(self):
+        """Record a cached entry served after a 304 Not Modified."""
+        self._count('hits')
+
+    def record_update(self):
+        """Record a cached entry replaced by a newer response."""
+        self._count('updates')
+
+    def _remember(self, key, entry):
+        # NOTE: called with the lock held.
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_stats(self):
+        """Return the cache counters.
+
+        'misses' counts the requests sent without a cached entry and
+        'revalidations' those sent with one. Of the latter, 'hits' were
+        served from the cache and 'updates' replaced the entry. 'disk_hits'
+        counts the entries loaded from the on-disk cache and 'size' the
+        entries held in memory.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        return stats
@@ -0,0 +1,242 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+JSON decoding and encoding with the fastest available library.
+
+orjson or ujson are used when installed, with the 'json' extra of
+python-cellarclient, and the standard library otherwise.
+"""
+
+import codecs
+import json
+
+from oslo_utils import importutils
+import six
+
+from cellarclient.common.i18n import _
+from cellarclient import exc
+
+orjson = importutils.try_import('orjson')
+ujson = importutils.try_import('ujson')
+
+BACKENDS = ('orjson', 'ujson', 'json')
+
+
+def _stdlib_loads(data):
+    # NOTE: json.loads only accepts bytes from Python 3.6, and decodes
+    # them to text anyway.
+    if isinstance(data, (six.binary_type, bytearray)):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+def _ujson_loads(data):
+    # NOTE: ujson does not accept bytearray.
+    if isinstance(data, bytearray):
+        data = bytes(data)
+    return ujson.loads(data)
+
+
+_LOADS = {
+    'orjson': orjson.loads if orjson is not None else None,
+    'ujson': _ujson_loads if ujson is not None else None,
+    'json': _stdlib_loads,
+}
+
+
+def _get_backend(functions, backend):
+    if backend is None:
+        return next(functions[name] for name in BACKENDS if functions[name])
+    if functions.get(backend) is None:
+        raise exc.InvalidAttribute(
+            _("JSON backend %(backend)s is not available, expected one of "
+              "the installed backends: %(backends)s") %
+            {'backend': backend,
+             'backends': ', '.join(name for name in BACKENDS
+                                   if functions[name])})
+    return functions[backend]
+
+
+def get_loads(backend=None):
+    """Return the function decoding JSON documents with 'backend'.
+
+    :param backend: one of BACKENDS, or None for the fastest installed one.
+    :raises exc.InvalidAttribute: if the backend is unknown or not
+        installed.
+    """
+    return _get_backend(_LOADS, backend)
+
+
+def loads(data, backend=None):
+    """Decode a JSON document from bytes, bytearray or text.
+
+    Bytes are parsed without an intermediate text copy when the backend
+    allows it.
+
+    :raises ValueError: if 'data' is not valid JSON.
+    """
+    return get_loads(backend)(data)
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def _ujson_dumps(obj):
+    return ujson.dumps(obj, ensure_ascii=False,
+                       escape_forward_slashes=False).encode('utf-8')
+
+
+_DUMPS = {
+    'orjson': orjson.dumps if orjson is not None else None,
+    'ujson': _ujson_dumps if ujson is not None else None,
+    'json': _stdlib_dumps,
+}
+
+
+def get_dumps(backend=None):
+    """Return the function encoding objects to JSON with 'backend'.
+
+    :param backend: one of BACKENDS, or None for the fastest installed one.
+    :raises exc.InvalidAttribute: if the backend is unknown or not
+        installed.
+    """
+    return _get_backend(_DUMPS, backend)
+
+
+def dumps(obj, backend=None):
+    """Encode an object to compact JSON, as UTF-8 bytes.
+
+    The document has no whitespace and non-ASCII characters are not
+    escaped.
+
+    :raises TypeError: if 'obj' holds values JSON can not represent.
+    """
+    return get_dumps(backend)(obj)
+
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',:]}'
+
+
+class ArrayStream(object):
+    """Decode the items of an array of a JSON object while it is received.
+
+    Iterating over the stream yields the items of the 'key' member of the
+    top-level object one at a time, so only the current item and a chunk
+    of undecoded data are held in memory. The other members of the object
+    are stored in 'members', which is complete once the iteration is over.
+
+    :param chunks: iterable of the byte chunks of the document.
+    :param key: name of the member holding the array.
+    :param close: optional callable releasing the source of the chunks,
+        called by :meth:`close`.
+    """
+
+    def __init__(self, chunks, key, close=None):
+        self.key = key
+        self.members = {}
+        self._chunks = iter(chunks)
+        self._close = close
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def close(self):
+        """Release the source of the chunks."""
+        if self._close is not None:
+            self._close()
+
+    def _read(self):
+        """Append the next chunk to the buffer, return False at the end."""
+        if self._eof:
+            return False
+        # NOTE: drop what has already been decoded so the buffer does not
+        # grow with the document.
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._buf += self._text.decode(b'', final=True)
+            self._eof = True
+            return False
+        self._buf += self._text.decode(chunk)
+        return True
+
+    def _peek(self):
+        """Return the next non-whitespace character, '' at the end."""
+        while True:
+            while self._pos < len(self._buf):
+                char = self._buf[self._pos]
+                if char not in _WHITESPACE:
+                    return char
+                self._pos += 1
+            if not self._read():
+                return ''
+
+    def _expect(self, chars):
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError(
+                'Expecting one of %r at offset %d of the buffer, got %r' %
+                (chars, self._pos, char))
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Decode the value starting at the current position."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except ValueError:
+                if not self._read():
+                    raise
+                continue
+            # NOTE: a number cut at the end of the buffer may continue in
+            # the next chunk, decode it again once more data is available.
+            if self._eof or (end < len(self._buf) and
+                             self._buf[end] in _DELIMITERS):
+                self._pos = end
+                return value
+            self._read()
+
+    def __iter__(self):
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                self._expect('"')
+            name = self._value()
+            self._expect(':')
+            if name == self.key and self._peek() == '[':
+                self._pos += 1
+                if self._peek() == ']':
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._expect(',]') == ']':
+                            break
+            elif name == self.key:
+                yield self._value()
+            else:
+                self.members[name] = self._value()
+            if self._expect(',}') == '}':
+                return
@@ -0,0 +1,194 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Client-side cache of the objects fetched by the managers.
+"""
+
+import abc
+import collections
+import threading
+
+import dogpile.cache
+from oslo_utils import timeutils
+import six
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 300
+
+_STATS = ('hits', 'misses', 'expirations', 'evictions', 'invalidations')
+
+
+@six.add_metaclass(abc.ABCMeta)
+class _BaseCache(object):
+    """Cache of the attributes of objects, by key and field set.
+
+    All the field sets cached for a key are stored together in one record,
+    a dictionary mapping the field set to a (stored_at, info) tuple, so
+    that they are invalidated at once. Subclasses load, store and drop the
+    records.
+
+    :param ttl: time in seconds after which an entry is fetched again,
+        None to keep them until they are invalidated.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self._stats = dict.fromkeys(_STATS, 0)
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    @abc.abstractmethod
+    def _load(self, key):
+        """Return the record of 'key', or None.
+
+        """
+
+    @abc.abstractmethod
+    def _store(self, key, record):
+        """Save the record of 'key'.
+
+        """
+
+    @abc.abstractmethod
+    def _drop(self, key):
+        """Remove the record of 'key', if any.
+
+        """
+
+    def get(self, key, fields=None):
+        """Return the info cached for 'key' and 'fields', or None.
+
+        :param fields: the field set of the entry, None for all the fields.
+        """
+        entry = (self._load(key) or {}).get(fields)
+        if entry is not None and self.ttl is not None:
+            if timeutils.now() - entry[0] >= self.ttl:
+                self._count('expirations')
+                entry = None
+        self._count('misses' if entry is None else 'hits')
+        return entry[1] if entry is not None else None
+
+    def set(self, key, info, fields=None):
+        """Cache 'info' for 'key' and 'fields', keeping other field sets."""
+        record = dict(self._load(key) or {})
+        record[fields] = (timeutils.now(), info)
+        self._store(key, record)
+
+    def refresh(self, key, info):
+        """Replace every entry of 'key' by 'info' holding all its fields."""
+        self._count('invalidations')
+        self._store(key, {None: (timeutils.now(), info)})
+
+    def invalidate(self, key):
+        """Drop every entry of 'key'."""
+        self._count('invalidations')
+        self._drop(key)
+
+    def get_stats(self):
+        """Return the cache counters.
+
+        'hits' and 'misses' count the lookups, 'expirations' the entries
+        found older than the TTL and 'invalidations' the keys dropped or
+        refreshed after a write.
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+
+class ObjectCache(_BaseCache):
+    """In-memory cache bounded to 'max_size' keys, least recently used first.
+
+    It is thread-safe and meant to be shared by the managers of a client.
+
+    :param max_size: maximum number of keys kept.
+    :param ttl: time in seconds after which an entry is fetched again,
+        None to keep them until they are evicted or invalidated.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        super(ObjectCache, self).__init__(ttl=ttl)
+        self.max_size = max_size
+        self._records = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, key):
+        with self._lock:
+            record = self._records.pop(key, None)
+            if record is not None:
+                self._records[key] = record
+            return record
+
+    def _store(self, key, record):
+        with self._lock:
+            self._records.pop(key, None)
+            self._records[key] = record
+            while len(self._records) > self.max_size:
+                self._records.popitem(last=False)
+                self._count('evictions')
+
+    def _drop(self, key):
+        with self._lock:
+            self._records.pop(key, None)
+
+    def get_stats(self):
+        """Return the cache counters, 'size' being the number of keys."""
+        stats = super(ObjectCache, self).get_stats()
+        with self._lock:
+            stats['size'] = len(self._records)
+        return stats
+
+
+class RegionCache(_BaseCache):
+    """Cache stored in a dogpile.cache region.
+
+    The region may be shared by several clients or processes, depending on
+    its backend. Its own expiration time applies on top of 'ttl'.
+
+    :param region: a configured :class:`dogpile.cache.region.CacheRegion`.
+    :param ttl: time in seconds after which an entry is fetched again.
+    """
+
+    def __init__(self, region, ttl=None):
+        super(RegionCache, self).__init__(ttl=ttl)
+        self.region = region
+
+    def _load(self, key):
+        record = self.region.get(key)
+        if record is dogpile.cache.api.NO_VALUE:
+            return None
+        return record
+
+    def _store(self, key, record):
+        self.region.set(key, record)
+
+    def _drop(self, key):
+        self.region.delete(key)
+
+
+def get_cache(cache):
+    """Return the object cache described by 'cache'.
+
+    :param cache: None or False to disable caching, True for a default
+        :class:`ObjectCache`, a dogpile.cache region, or a cache object
+        which is returned as is.
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return ObjectCache()
+    if isinstance(cache, dogpile.cache.region.CacheRegion):
+        return RegionCache(cache)
+    return cache
@@ -0,0 +1,130 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Retry policies and budgets used by the HTTP clients.
+"""
+
+import random
+import threading
+
+import six
+
+from cellarclient.common.i18n import _
+from cellarclient import exc
+
+DEFAULT_RETRY_POLICY = 'fixed'
+DEFAULT_MAX_DELAY = 60
+DEFAULT_BUDGET_CAPACITY = 10
+
+
+class FixedPolicy(object):
+    """Wait the retry interval between all the attempts."""
+
+    def get_delay(self, interval, attempt):
+        """Return the time in seconds to wait after a failed attempt.
+
+        :param interval: the retry interval of the client.
+        :param attempt: the number of the failed attempt, starting at 1.
+        """
+        return interval
+
+
+class ExponentialPolicy(FixedPolicy):
+    """Double the wait after each attempt, up to 'max_delay' seconds."""
+
+    def __init__(self, max_delay=DEFAULT_MAX_DELAY):
+        self.max_delay = max_delay
+
+    def get_delay(self, interval, attempt):
+        return min(interval * 2 ** (attempt - 1), self.max_delay)
+
+
+class JitterPolicy(ExponentialPolicy):
+    """Wait a random time up to the exponential delay ("full jitter").
+
+    Clients failing together spread their retries instead of hitting the
+    server again in lockstep.
+    """
+
+    def get_delay(self, interval, attempt):
+        delay = super(JitterPolicy, self).get_delay(interval, attempt)
+        return random.uniform(0, delay)
+
+
+POLICIES = {
+    'fixed': FixedPolicy,
+    'exponential': ExponentialPolicy,
+    'jitter': JitterPolicy,
+}
+
+
+def get_policy(policy=None):
+    """Return a retry policy.
+
+    :param policy: a policy object, the name of one of POLICIES, or None
+        for the default policy.
+    :raises exc.InvalidAttribute: if the policy name is unknown.
+    """
+    if policy is None:
+        policy = DEFAULT_RETRY_POLICY
+    if not isinstance(policy, six.string_types):
+        return policy
+    try:
+        return POLICIES[policy]()
+    except KeyError:
+        raise exc.InvalidAttribute(
+            _("Unknown retry policy %(policy)s, expected one of "
+              "%(policies)s") %
+            {'policy': policy, 'policies': ', '.join(sorted(POLICIES))})
+
+
+class RetryBudget(object):
+    """Token bucket limiting the share of requests that are retries.
+
+    Each request adds 'ratio' token to the bucket and each retry takes a
+    whole one, so once the bucket is empty at most 'ratio' of the recent
+    requests are retried. The bucket starts full, which allows bursts of
+    'capacity' retries. It is thread-safe and meant to be shared by all
+    the requests of a client.
+
+    :param ratio: fraction of the requests that may be retried, between
+        0 and 1.
+    :param capacity: maximum number of tokens kept in the bucket.
+    """
+
+    def __init__(self, ratio, capacity=DEFAULT_BUDGET_CAPACITY):
+        ratio = float(ratio)
+        if not 0 <= ratio <= 1:
+            raise exc.InvalidAttribute(
+                _("Retry budget must be between 0 and 1, got %s") % ratio)
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Record a request."""
+        with self._lock:
+            self.tokens = min(self.tokens + self.ratio, self.capacity)
+
+    def withdraw(self):
+        """Record a retry.
+
+        :returns: False if the budget is exhausted and the request must
+            not be retried.
+        """
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
@@ -0,0 +1,368 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Local mirror of the resources of a Cellar API, stored in SQLite.
+"""
+
+import json
+import os
+import re
+import sqlite3
+
+import six
+
+from cellarclient.common import filecache
+from cellarclient.common.i18n import _
+from cellarclient.common import jsonutils
+from cellarclient import exc
+
+DEFAULT_PATH = os.path.join(filecache.CACHE_DIR, 'cellar-resources.sqlite')
+
+# NOTE: the fields stored in their own column, next to the whole resource.
+COLUMNS = ('uuid', 'type', 'created_at', 'updated_at')
+# NOTE: other fields, conditions on unknown fields apply to attributes.
+FIELDS = COLUMNS + ('description', 'relations', 'attributes')
+
+OPERATORS = ('=', '!=', '<', '<=', '>', '>=')
+_CONDITION_RE = re.compile(r'^\s*([^=!<>\s]+)\s*(<=|>=|!=|=|<|>)\s*(.*)$')
+_PATH_RE = re.compile(r'^[\w-]+(\.[\w-]+)*$')
+_INDEX_PREFIX = 'resources_path_'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    uuid TEXT PRIMARY KEY,
+    type TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resources_type ON resources (type, uuid);
+CREATE INDEX IF NOT EXISTS resources_updated_at ON resources (updated_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _get_path(field):
+    """Return the path of 'field' from the root of a resource."""
+    if not _PATH_RE.match(field):
+        raise exc.InvalidAttribute(
+            _("Invalid field %s, expected names separated by dots") % field)
+    if field.split('.')[0] not in FIELDS:
+        field = 'attributes.' + field
+    return field
+
+
+def _get_expression(path):
+    """Return the SQL expression of the value at 'path'."""
+    if path in COLUMNS:
+        return path
+    # NOTE: the path is checked by _get_path and embedded in the query
+    # rather than bound so that SQLite matches the indexes on it.
+    return "json_extract(data, '$%s')" % ''.join(
+        '."%s"' % name for name in path.split('.'))
+
+
+def parse_condition(condition):
+    """Parse a condition on a field of the resources.
+
+    Conditions have the form <field><operator><value>, e.g. 'type=server'
+    or 'attributes.ram>=2048'. Fields which are not fields of the resources
+    are attributes: 'ram>=2048' is the same condition. Values are decoded
+    as JSON when possible, so 2048 is a number and "2048" a string.
+
+    :returns: a tuple of (path, operator, value).
+    :raises exc.InvalidAttribute: if the condition is malformed.
+    """
+    match = _CONDITION_RE.match(condition)
+    if match is None:
+        raise exc.InvalidAttribute(
+            _("Invalid condition %(condition)s, expected "
+              "<field><operator><value> with one of the operators "
+              "%(operators)s") %
+            {'condition': condition, 'operators': ' '.join(OPERATORS)})
+    field, operator, value = match.groups()
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    if isinstance(value, (dict, list)):
+        raise exc.InvalidAttribute(
+            _("Invalid condition %s, values can not be objects or arrays") %
+            condition)
+    return _get_path(field), operator, value
+
+
+def _get_where(conditions):
+    """Return the SQL WHERE clause and parameters of 'conditions'."""
+    clauses = []
+    params = []
+    for condition in conditions:
+        if isinstance(condition, six.string_types):
+            condition = parse_condition(condition)
+        path, operator, value = condition
+        expression = _get_expression(path)
+        if value is None and operator in ('=', '!='):
+            clauses.append('%s IS %sNULL' %
+                           (expression, 'NOT ' if operator == '!=' else ''))
+        else:
+            clauses.append('%s %s ?' % (expression, operator))
+            params.append(value)
+    if not clauses:
+        return '', []
+    return ' WHERE ' + ' AND '.join(clauses), params
+
+
+def _sort_value(value):
+    # NOTE: None sorts first, like in SQLite, and dictionaries and lists
+    # are compared by their JSON form as Python 3 can not order them.
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, sort_keys=True)
+    return (value is not None, value)
+
+
+class ResourceStore(object):
+    """Resources saved in an SQLite database.
+
+    Resources are dictionaries of their fields, the way the API returns
+    them, and must have a 'uuid'. The store also keeps metadata, such as
+    the state of the synchronization with the API, as text values.
+
+    :param path: path of the database file, created if missing, or
+        ':memory:' for a database that lasts as long as the store.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if path != ':memory:' and directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        self._conn.close()
+
+    def get_meta(self, key, default=None):
+        """Return the metadata value of 'key', or 'default'."""
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?',
+                                 (key,)).fetchone()
+        return row[0] if row is not None else default
+
+    def set_meta(self, key, value):
+        """Set the metadata value of 'key'."""
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                (key, None if value is None else six.text_type(value)))
+
+    def _insert(self, resources):
+        count = 0
+        for resource in resources:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO resources (uuid, type, created_at, '
+                'updated_at, data) VALUES (?, ?, ?, ?, ?)',
+                tuple(resource.get(column) for column in COLUMNS) +
+                (json.dumps(resource),))
+            count += 1
+        return count
+
+    def upsert(self, resources):
+        """Add or replace resources, in a single transaction.
+
+        :param resources: an iterable of resources, consumed lazily.
+        :returns: the number of resources saved.
+        """
+        with self._conn:
+            return self._insert(resources)
+
+    def replace(self, resources):
+        """Replace all the resources, in a single transaction.
+
+        The previous resources remain until all the new ones are saved, and
+        are kept if 'resources' raises an exception.
+
+        :returns: the number of resources saved.
+        """
+        with self._conn:
+            self._conn.execute('DELETE FROM resources')
+            return self._insert(resources)
+
+    def delete(self, uuids):
+        """Delete the resources of 'uuids'.
+
+        :returns: the number of resources deleted.
+        """
+        with self._conn:
+            return sum(
+                self._conn.execute('DELETE FROM resources WHERE uuid = ?',
+                                   (uuid,)).rowcount
+                for uuid in uuids)
+
+    def uuids(self):
+        """Return the set of the UUIDs of the stored resources."""
+        return set(row[0] for row in
+                   self._conn.execute('SELECT uuid FROM resources'))
+
+    def count(self):
+        """Return the number of stored resources."""
+        return self._conn.execute(
+            'SELECT COUNT(*) FROM resources').fetchone()[0]
+
+    def get(self, uuid):
+        """Return the resource of 'uuid', or None."""
+        row = self._conn.execute('SELECT data FROM resources WHERE uuid = ?',
+                                 (uuid,)).fetchone()
+        return jsonutils.loads(row[0]) if row is not None else None
+
+    def list(self, sort_key=None, sort_dir=None, where=None, limit=None,
+             marker=None):
+        """Return the stored resources.
+
+        :param sort_key: the field to sort by, 'uuid' by default.
+        :param sort_dir: 'asc' (the default) or 'desc'.
+        :param where: an iterable of conditions the resources must all
+            match, see :func:`parse_condition`. Conditions may also be
+            given as parsed (path, operator, value) tuples.
+        :param limit: the maximum number of resources to return.
+        :param marker: the UUID of a resource, only the resources sorted
+            after it are returned. Ignored if it is not stored.
+        :returns: a list of resources.
+        :raises exc.InvalidAttribute: if a condition is malformed.
+        """
+        sort_key = sort_key or 'uuid'
+        reverse = sort_dir == 'desc'
+        clause, params = _get_where(where or [])
+        query = 'SELECT data FROM resources' + clause
+        if sort_key in COLUMNS:
+            if marker is not None:
+                after, after_params = self._get_after(marker, sort_key,
+                                                      reverse)
+                if after:
+                    query += (' AND ' if clause else ' WHERE ') + after
+                    params += after_params
+            # NOTE: the column names are not user input.
+            query += ' ORDER BY %s %s, uuid' % (
+                sort_key, 'DESC' if reverse else 'ASC')
+            if limit:
+                query += ' LIMIT %d' % int(limit)
+            return [jsonutils.loads(row[0])
+                    for row in self._conn.execute(query, params)]
+        resources = [jsonutils.loads(row[0]) for row in self._conn.execute(
+            query + ' ORDER BY uuid', params)]
+        resources.sort(key=lambda r: _sort_value(r.get(sort_key)),
+                       reverse=reverse)
+        if marker is not None:
+            uuids = [res.get('uuid') for res in resources]
+            if marker in uuids:
+                resources = resources[uuids.index(marker) + 1:]
+        return resources[:int(limit)] if limit else resources
+
+    def _get_after(self, marker, sort_key, reverse):
+        """Return the SQL condition matching the resources after 'marker'.
+
+        Ties are sorted by UUID and null values first, like the ORDER BY
+        clause of :meth:`list`.
+
+        :returns: the condition and its parameters, or (None, []) if the
+            marker is not stored.
+        """
+        row = self._conn.execute(
+            'SELECT %s FROM resources WHERE uuid = ?' % sort_key,
+            (marker,)).fetchone()
+        if row is None:
+            return None, []
+        value = row[0]
+        if sort_key == 'uuid':
+            return 'uuid %s ?' % ('<' if reverse else '>'), [marker]
+        if value is None:
+            if reverse:
+                return '(%s IS NULL AND uuid > ?)' % sort_key, [marker]
+            return '(%s IS NOT NULL OR uuid > ?)' % sort_key, [marker]
+        if reverse:
+            return ('(%s < ? OR %s IS NULL OR (%s = ? AND uuid > ?))' %
+                    (sort_key, sort_key, sort_key), [value, value, marker])
+        return ('(%s > ? OR (%s = ? AND uuid > ?))' % (sort_key, sort_key),
+                [value, value, marker])
+
+    def get_markers(self, count, sort_key=None, sort_dir=None):
+        """Return resources splitting the sorted list in 'count' ranges.
+
+        :param count: the number of ranges.
+        :param sort_key: the field the list is sorted by, one of COLUMNS,
+            'uuid' by default.
+        :param sort_dir: 'asc' (the default) or 'desc'.
+        :returns: a list of at most count - 1 (UUID, value of 'sort_key')
+            tuples, in the order of the list.
+        """
+        sort_key = sort_key or 'uuid'
+        if sort_key not in COLUMNS:
+            raise exc.InvalidAttribute(
+                _("Invalid sort key %(key)s, expected one of %(keys)s") %
+                {'key': sort_key, 'keys': ', '.join(COLUMNS)})
+        total = self.count()
+        offsets = sorted(set(total * i // count for i in range(1, count)))
+        # NOTE: ties are ordered by UUID in the same direction, like the
+        # pages of the API.
+        direction = 'DESC' if sort_dir == 'desc' else 'ASC'
+        query = ('SELECT uuid, %s FROM resources ORDER BY %s %s, uuid %s '
+                 'LIMIT 1 OFFSET ?' % (sort_key, sort_key, direction,
+                                       direction))
+        markers = []
+        for offset in offsets:
+            if 0 < offset < total:
+                markers.append(tuple(
+                    self._conn.execute(query, (offset - 1,)).fetchone()))
+        return markers
+
+    def create_index(self, field):
+        """Index the values of a field, to speed up conditions on it.
+
+        The indexes are saved in the database. 'type', 'uuid' and
+        'updated_at' are always indexed.
+
+        :param field: the field, e.g. 'attributes.ram' or 'ram'.
+        """
+        path = _get_path(field)
+        if path in COLUMNS:
+            return
+        with self._conn:
+            # NOTE: the UUIDs, the default order, are indexed as well so
+            # that results are read in order when the condition is an
+            # equality.
+            self._conn.execute('CREATE INDEX IF NOT EXISTS "%s%s" ON '
+                               'resources (%s, uuid)' %
+                               (_INDEX_PREFIX, path, _get_expression(path)))
+
+    def drop_index(self, field):
+        """Drop the index created on a field by :meth:`create_index`."""
+        path = _get_path(field)
+        with self._conn:
+            self._conn.execute('DROP INDEX IF EXISTS "%s%s"' %
+                               (_INDEX_PREFIX, path))
+
+    def indexes(self):
+        """Return the fields indexed by :meth:`create_index`."""
+        rows = self._conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")
+        return sorted(row[0][len(_INDEX_PREFIX):] for row in rows
+                      if row[0].startswith(_INDEX_PREFIX))
@@ -27,6 +27,7 @@ from cellarclient import exc
 from cellarclient.common.i18n import _
 from oslo_utils import importutils
 from oslo_utils import strutils
+import yaml
 
 
 class HelpFormatter(argparse.HelpFormatter):
@@ -318,4 +319,62 @@ def handle_json_or_file_arg(json_arg):
                {'err': e, 'string': json_arg})
         raise exc.InvalidAttribute(err)
 
-    return json_arg
\ No newline at end of file
+    return json_arg
+
+
+def _read_json_lines(f):
+    for number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            err = (_("Invalid JSON on line %(line)d: '%(err)s'") %
+                   {'line': number, 'err': e})
+            raise exc.InvalidAttribute(err)
+
+
+def _read_yaml_documents(f):
+    try:
+        for document in yaml.safe_load_all(f):
+            if isinstance(document, list):
+                for item in document:
+                    yield item
+            elif document is not None:
+                yield document
+    except yaml.YAMLError as e:
+        raise exc.InvalidAttribute(_("Invalid YAML: '%s'") % e)
+
+
+def iter_items_from_file(file_arg):
+    """Iterate over the dictionaries stored in a JSON-lines or YAML file.
+
+    Files with a '.yaml' or '.yml' extension are read as a stream of YAML
+    documents, each being either a dictionary or a list of dictionaries.
+    Any other file is read as JSON lines, one dictionary per line.
+
+    :param file_arg: The name of the file, or '-' for standard input
+        (read as JSON lines).
+    :returns: A generator of dictionaries.
+    :raises: InvalidAttribute if the file cannot be read or parsed, or holds
+        something else than dictionaries.
+    """
+    is_yaml = os.path.splitext(file_arg)[1].lower() in ('.yaml', '.yml')
+    try:
+        f = sys.stdin if file_arg == '-' else open(file_arg, 'r')
+    except (IOError, OSError) as e:
+        err = _("Cannot read file '%(file)s'. "
+                "Error: %(err)s") % {'err': e, 'file': file_arg}
+        raise exc.InvalidAttribute(err)
+
+    try:
+        reader = _read_yaml_documents if is_yaml else _read_json_lines
+        for item in reader(f):
+            if not isinstance(item, dict):
+                raise exc.InvalidAttribute(
+                    _("Expected a dictionary, got: '%s'") % item)
+            yield item
+    finally:
+        if f is not sys.stdin:
+            f.close()
@@ -36,6 +36,10 @@ class InvalidAttribute(ClientException):
     pass
 
 
+class Timeout(ConnectionError):
+    """The Cellar API did not respond within the allowed time."""
+
+
 class StateTransitionFailed(ClientException):
     """Failed to reach a requested provision state."""
 
@@ -24,9 +24,11 @@ from cellarclient import client as arsclient
 from cellarclient import exc
 from cellarclient.common import cliutils
 from cellarclient.common import http
+from cellarclient.common import retry
 from cellarclient.common import utils
 from cellarclient.common.i18n import _
 from oslo_utils import encodeutils
+from oslo_utils import strutils
 
 
 LATEST_API_VERSION = ('1', 'latest')
@@ -55,6 +57,28 @@ class CellarShell(object):
                             action='store_true',
                             help=_('Print JSON response without formatting.'))
 
+        parser.add_argument('--format',
+                            dest='output_format',
+                            choices=cliutils.OUTPUT_FORMATS,
+                            default=cliutils.env('ARSENAL_FORMAT',
+                                                 default=None),
+                            help=_('Output format of lists. "ndjson" (one '
+                                   'JSON object per line), "csv", "tsv" and '
+                                   '"fixed" (a table sized from its first '
+                                   'rows) print the rows as they are '
+                                   'fetched. "json-compact" prints JSON '
+                                   'without whitespace. Defaults to '
+                                   'env[ARSENAL_FORMAT] or "table", "json" '
+                                   'with --json.'))
+
+        parser.add_argument('--json-compact',
+                            dest='output_format',
+                            action='store_const',
+                            const='json-compact',
+                            default=argparse.SUPPRESS,
+                            help=_('Print JSON without whitespace, same as '
+                                   '--format json-compact.'))
+
         parser.add_argument('-v', '--verbose',
                             default=False, action="store_true",
                             help=_('Print more verbose output'))
@@ -83,6 +107,97 @@ class CellarShell(object):
                                 'ARSENAL_RETRY_INTERVAL',
                                 default=str(http.DEFAULT_RETRY_INTERVAL)))
 
+        msg = _('Policy computing the time between retries: "fixed" waits '
+                '--retry-interval, "exponential" doubles it after each '
+                'attempt and "jitter" waits a random time up to the '
+                'exponential one. Defaults to env[ARSENAL_RETRY_POLICY] or '
+                '"%s".') % retry.DEFAULT_RETRY_POLICY
+        parser.add_argument('--retry-policy', help=msg,
+                            choices=sorted(retry.POLICIES),
+                            default=cliutils.env(
+                                'ARSENAL_RETRY_POLICY',
+                                default=retry.DEFAULT_RETRY_POLICY))
+
+        msg = _('Maximum time (in seconds) spent retrying a request. '
+                'Defaults to env[ARSENAL_RETRY_MAX_TIME] or no limit.')
+        parser.add_argument('--retry-max-time', type=float, help=msg,
+                            default=cliutils.env('ARSENAL_RETRY_MAX_TIME',
+                                                 default=None))
+
+        msg = _('Maximum fraction (between 0 and 1) of the requests that '
+                'may be retried. Defaults to env[ARSENAL_RETRY_BUDGET] or '
+                'no limit.')
+        parser.add_argument('--retry-budget', type=float, help=msg,
+                            default=cliutils.env('ARSENAL_RETRY_BUDGET',
+                                                 default=None))
+
+        msg = _('Maximum time (in seconds) waited before a retry when the '
+                'Cellar API sends a Retry-After header, 0 to retry at once. '
+                'Defaults to env[ARSENAL_RETRY_AFTER_MAX] or %d.') % (
+                    http.DEFAULT_RETRY_AFTER_MAX)
+        parser.add_argument('--retry-after-max', type=float, help=msg,
+                            default=cliutils.env(
+                                'ARSENAL_RETRY_AFTER_MAX',
+                                default=str(http.DEFAULT_RETRY_AFTER_MAX)))
+
+        msg = _('Maximum time (in seconds) to wait for the Cellar API to '
+                'respond to a request. Defaults to env[ARSENAL_TIMEOUT] '
+                'or %d.') % http.DEFAULT_TIMEOUT
+        parser.add_argument('--timeout', type=float, help=msg,
+                            default=cliutils.env(
+                                'ARSENAL_TIMEOUT',
+                                default=str(http.DEFAULT_TIMEOUT)))
+
+        msg = _('Maximum time (in seconds) to wait for a connection to the '
+                'Cellar API. Defaults to env[ARSENAL_CONNECT_TIMEOUT] or '
+                'the value of --timeout.')
+        parser.add_argument('--connect-timeout', type=float, help=msg,
+                            default=cliutils.env('ARSENAL_CONNECT_TIMEOUT',
+                                                 default=None))
+
+        msg = _('Number of per-host connection pools to keep. Defaults to '
+                'env[ARSENAL_POOL_CONNECTIONS] or %d.') % (
+                    http.DEFAULT_POOL_CONNECTIONS)
+        parser.add_argument('--pool-connections', type=int, help=msg,
+                            default=cliutils.env(
+                                'ARSENAL_POOL_CONNECTIONS',
+                                default=str(http.DEFAULT_POOL_CONNECTIONS)))
+
+        msg = _('Maximum number of connections kept open per host. '
+                'Defaults to env[ARSENAL_POOL_MAXSIZE] or %d.') % (
+                    http.DEFAULT_POOL_MAXSIZE)
+        parser.add_argument('--pool-maxsize', type=int, help=msg,
+                            default=cliutils.env(
+                                'ARSENAL_POOL_MAXSIZE',
+                                default=str(http.DEFAULT_POOL_MAXSIZE)))
+
+        parser.add_argument('--pool-block',
+                            default=strutils.bool_from_string(
+                                cliutils.env('ARSENAL_POOL_BLOCK')),
+                            action='store_true',
+                            help=_('Wait for a free connection instead of '
+                                   'opening a throwaway one when all the '
+                                   'connections to a host are in use. '
+                                   'Defaults to env[ARSENAL_POOL_BLOCK].'))
+
+        parser.add_argument('--keepalive', type=int, metavar='<seconds>',
+                            default=cliutils.env('ARSENAL_KEEPALIVE',
+                                                 default=None),
+                            help=_('Idle time (in seconds) before TCP '
+                                   'keep-alive probes are sent on open '
+                                   'connections. Defaults to '
+                                   'env[ARSENAL_KEEPALIVE] or the system '
+                                   'settings.'))
+
+        parser.add_argument('--compress-min-size', type=int,
+                            metavar='<bytes>',
+                            default=cliutils.env('ARSENAL_COMPRESS_MIN_SIZE',
+                                                 default=None),
+                            help=_('Send request bodies of at least this '
+                                   'size gzip compressed. Defaults to '
+                                   'env[ARSENAL_COMPRESS_MIN_SIZE] or no '
+                                   'compression.'))
+
         return parser
 
     def get_subcommand_parser(self, version):
@@ -129,8 +244,29 @@ class CellarShell(object):
         if args.retry_interval < 1:
             raise exc.CommandError(_("You must provide value >= 1 for "
                                      "--retry-interval"))
+        if (args.retry_budget is not None and
+                not 0 <= args.retry_budget <= 1):
+            raise exc.CommandError(_("You must provide value between 0 and "
+                                     "1 for --retry-budget"))
+        for option in ('retry_max_time', 'timeout', 'connect_timeout'):
+            value = getattr(args, option)
+            if value is not None and value <= 0:
+                raise exc.CommandError(
+                    _("You must provide value > 0 for --%s") %
+                    option.replace('_', '-'))
+        if args.retry_after_max is not None and args.retry_after_max < 0:
+            raise exc.CommandError(_("You must provide value >= 0 for "
+                                     "--retry-after-max"))
+        for option in ('pool_connections', 'pool_maxsize'):
+            if getattr(args, option) < 1:
+                raise exc.CommandError(
+                    _("You must provide value >= 1 for --%s") %
+                    option.replace('_', '-'))
         client_args = (
-            'cellar_url', 'max_retries', 'retry_interval'
+            'cellar_url', 'max_retries', 'retry_interval', 'retry_policy',
+            'retry_max_time', 'retry_budget', 'retry_after_max', 'timeout',
+            'connect_timeout', 'pool_connections', 'pool_maxsize',
+            'pool_block', 'keepalive', 'compress_min_size'
         )
         kwargs = {}
         for key in client_args:
@@ -0,0 +1,133 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+
+import mock
+from oslo_utils import importutils
+import testtools
+
+from cellarclient import exc
+from cellarclient.common import async_http
+from cellarclient.common import http
+from cellarclient.tests.unit import utils
+
+web = importutils.try_import('aiohttp.web')
+
+RESOURCE = {'uuid': 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee',
+            'type': 'server'}
+
+
+@testtools.skipIf(web is None, 'aiohttp is not installed')
+class AsyncHTTPClientTest(utils.BaseTestCase):
+    """Runs AsyncHTTPClient against a local stand-in Cellar server."""
+
+    def setUp(self):
+        super(AsyncHTTPClientTest, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.requests = []
+        self.conflicts = 0
+
+        app = web.Application()
+        app.router.add_route('*', '/{path:.*}', self._handle)
+        self.runner = web.AppRunner(app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        self.loop.run_until_complete(site.start())
+        self.addCleanup(self.loop.run_until_complete, self.runner.cleanup())
+        port = site._server.sockets[0].getsockname()[1]
+        self.endpoint = 'http://127.0.0.1:%d/' % port
+
+        self.client = async_http.AsyncHTTPClient(self.endpoint,
+                                                 retry_interval=0)
+        self.addCleanup(self.loop.run_until_complete, self.client.close())
+
+    async def _handle(self, request):
+        body = await request.text()
+        self.requests.append((request.method, request.path_qs,
+                              dict(request.headers), body))
+        if request.path == '/conflict':
+            self.conflicts += 1
+            if self.conflicts < 3:
+                return web.json_response({}, status=409)
+            return web.json_response(RESOURCE)
+        if request.path == '/missing':
+            return web.json_response(
+                {'error_message': '{"faultstring": "Not here"}'}, status=404)
+        if request.path == '/version':
+            if http.API_VERSION_HEADER not in request.headers:
+                return web.json_response(
+                    {}, status=406,
+                    headers={http.API_MAX_VERSION_HEADER: '1.2'})
+            return web.json_response(
+                {'version': request.headers[http.API_VERSION_HEADER]})
+        if request.method == 'DELETE':
+            return web.Response(status=204)
+        if request.method == 'POST':
+            return web.json_response(await request.json(), status=201)
+        return web.json_response({'resources': [RESOURCE]})
+
+    def _run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_json_request(self):
+        resp, body = self._run(self.client.json_request('GET',
+                                                        '/v1/resources'))
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual({'resources': [RESOURCE]}, body)
+        method, path, headers, _ = self.requests[0]
+        self.assertEqual(('GET', '/v1/resources'), (method, path))
+        self.assertEqual(http.USER_AGENT, headers['User-Agent'])
+        self.assertEqual('application/json', headers['Accept'])
+
+    def test_json_request_body(self):
+        resp, body = self._run(self.client.json_request(
+            'POST', '/v1/resources', body={'type': 'pdu'}))
+        self.assertEqual(201, resp.status_code)
+        self.assertEqual({'type': 'pdu'}, body)
+
+    def test_raw_request(self):
+        resp, body_iter = self._run(self.client.raw_request(
+            'DELETE', '/v1/resources/%s' % RESOURCE['uuid']))
+        self.assertEqual(204, resp.status_code)
+        self.assertEqual('', ''.join(body_iter))
+
+    def test_error_mapping(self):
+        error = self.assertRaises(exc.NotFound, self._run,
+                                  self.client.json_request('GET', '/missing'))
+        self.assertEqual('Not here', error.message)
+
+    def test_retries(self):
+        resp, body = self._run(self.client.json_request('GET', '/conflict'))
+        self.assertEqual(RESOURCE, body)
+        self.assertEqual(3, self.conflicts)
+
+    def test_retries_exhausted(self):
+        self.client.conflict_max_retries = 1
+        self.assertRaises(exc.Conflict, self._run,
+                          self.client.json_request('GET', '/conflict'))
+        self.assertEqual(2, self.conflicts)
+
+    @mock.patch.object(http.filecache, 'save_data', autospec=True)
+    def test_version_negotiation(self, mock_save_data):
+        resp, body = self._run(self.client.json_request('GET', '/version'))
+        self.assertEqual({'version': '1.2'}, body)
+        self.assertEqual('negotiated', self.client.api_version_select_state)
+        mock_save_data.assert_called_once_with(host='127.0.0.1',
+                                               port=mock.ANY, data='1.2')
+
+    def test_connection_refused(self):
+        self._run(self.runner.cleanup())
+        self.client.conflict_max_retries = 0
+        self.assertRaises(exc.ConnectionRefused, self._run,
+                          self.client.json_request('GET', '/v1/resources'))
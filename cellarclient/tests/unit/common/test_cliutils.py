@@ -0,0 +1,156 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import json
+
+import fixtures
+import mock
+import six
+
+from cellarclient.common import cliutils
+from cellarclient.tests.unit import utils
+
+ROWS = [{'uuid': 'a', 'type': 'server', 'attributes': {'ram': 2048}},
+        {'uuid': 'b', 'type': 'pdu, rack', 'attributes': None}]
+FIELDS = ['uuid', 'type', 'attributes']
+LABELS = ['UUID', 'Type', 'Attributes']
+
+
+class PrintListTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(PrintListTest, self).setUp()
+        self.stdout = six.StringIO()
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', self.stdout))
+
+    def _print(self, objs=ROWS, **kwargs):
+        cliutils.print_list(objs, FIELDS, field_labels=LABELS,
+                            sortby_index=None, **kwargs)
+        return self.stdout.getvalue()
+
+    def test_table(self):
+        out = self._print()
+        self.assertIn('| UUID | Type', out)
+        self.assertIn('| a    | server', out)
+
+    def test_json(self):
+        self.assertEqual(ROWS, json.loads(self._print(json_flag=True)))
+        self.stdout.truncate(0)
+        self.stdout.seek(0)
+        self.assertEqual(ROWS,
+                         json.loads(self._print(output_format='json')))
+
+    def test_json_compact(self):
+        self.assertEqual(json.dumps(ROWS, separators=(',', ':')) + '\n',
+                         self._print(output_format='json-compact'))
+        self.stdout.truncate(0)
+        self.stdout.seek(0)
+        self.assertEqual('[]\n',
+                         self._print([], output_format='json-compact'))
+
+    def test_json_compact_chunks(self):
+        writes = []
+        self.useFixture(fixtures.MonkeyPatch(
+            'cellarclient.common.cliutils.JSON_CHUNK_SIZE', 40))
+        with mock.patch.object(self.stdout, 'write',
+                               side_effect=writes.append):
+            self._print(output_format='json-compact')
+        self.assertEqual(ROWS, json.loads(''.join(writes)))
+        self.assertEqual(3, len(writes))
+
+    def test_json_compact_binary_stdout(self):
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', stdout))
+        print('before')
+        cliutils.print_list([{'uuid': u'\xe9'}], ['uuid'],
+                            output_format='json-compact')
+        self.assertEqual(b'before\n[{"uuid":"\xc3\xa9"}]\n',
+                         stdout.buffer.getvalue())
+
+    def test_ndjson(self):
+        lines = self._print(output_format='ndjson').splitlines()
+        self.assertEqual(ROWS, [json.loads(line) for line in lines])
+
+    def test_csv(self):
+        self.assertEqual('UUID,Type,Attributes\n'
+                         'a,server,"{""ram"": 2048}"\n'
+                         'b,"pdu, rack",\n',
+                         self._print(output_format='csv'))
+
+    def test_tsv(self):
+        self.assertEqual('UUID\tType\tAttributes\n'
+                         'a\tserver\t"{""ram"": 2048}"\n'
+                         'b\tpdu, rack\t\n',
+                         self._print(output_format='tsv'))
+
+    def test_fixed(self):
+        self.assertEqual('UUID  Type       Attributes\n'
+                         '----  ---------  -------------\n'
+                         'a     server     {"ram": 2048}\n'
+                         'b     pdu, rack\n',
+                         self._print(output_format='fixed'))
+
+    def test_fixed_sample(self):
+        self.useFixture(fixtures.MonkeyPatch(
+            'cellarclient.common.cliutils.FIXED_SAMPLE_SIZE', 1))
+        lines = self._print(output_format='fixed').splitlines()
+        self.assertEqual(['UUID  Type    Attributes',
+                          '----  ------  -------------',
+                          'a     server  {"ram": 2048}',
+                          'b     pdu, rack'], lines)
+
+    def test_streaming(self):
+        # NOTE: each row is printed before the next object is consumed.
+        def objs():
+            for row in ROWS:
+                yield row
+                printed.append(self.stdout.getvalue().count('\n'))
+
+        self.useFixture(fixtures.MonkeyPatch(
+            'cellarclient.common.cliutils.FIXED_SAMPLE_SIZE', 1))
+        for output_format, header in (('ndjson', 0), ('csv', 1),
+                                      ('fixed', 2)):
+            printed = []
+            self.stdout.truncate(0)
+            self.stdout.seek(0)
+            self._print(objs(), output_format=output_format)
+            self.assertEqual([header + 1, header + 2], printed)
+
+    def test_invalid_format(self):
+        self.assertRaises(ValueError, self._print, output_format='yaml')
+
+
+class PrintDictTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(PrintDictTest, self).setUp()
+        self.stdout = six.StringIO()
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', self.stdout))
+
+    def test_json(self):
+        cliutils.print_dict(ROWS[0], json_flag=True)
+        self.assertEqual(ROWS[0], json.loads(self.stdout.getvalue()))
+        self.assertIn('\n    "uuid"', self.stdout.getvalue())
+
+    def test_json_compact(self):
+        for output_format in ('json-compact', 'ndjson'):
+            self.stdout.truncate(0)
+            self.stdout.seek(0)
+            cliutils.print_dict(ROWS[0], output_format=output_format)
+            self.assertEqual(
+                json.dumps(ROWS[0], separators=(',', ':')) + '\n',
+                self.stdout.getvalue())
+
+    def test_table(self):
+        cliutils.print_dict(ROWS[0], output_format='csv')
+        self.assertIn('| uuid       | a ', self.stdout.getvalue())
@@ -0,0 +1,451 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import socket
+import threading
+import time
+import zlib
+
+import fixtures
+import mock
+import requests
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from cellarclient import exc
+from cellarclient.common import http
+from cellarclient.tests.unit import utils
+from cellarclient.v1 import resource
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path == '/slow':
+            time.sleep(0.3)
+        if self.path == '/busy' and len(self.server.requests) == 1:
+            self.send_response(503)
+            self.send_header('Retry-After', '30')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path.startswith('/etag'):
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self._send_json({'resources': [{'name': 'cached'}]},
+                            {'ETag': '"v1"'})
+            return
+        resources = []
+        if self.path == '/utf8':
+            resources = [{'name': u'\u00e9t\u00e9'}]
+        elif self.path == '/gzip':
+            resources = [{'name': 'server'}] * 100
+        self._send_json({'resources': resources})
+
+    def do_POST(self):
+        self.server.requests.append(self.path)
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        self.server.bodies.append(json.loads(body.decode('utf-8')))
+        self._send_json({})
+
+    def _send_json(self, data, headers=None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.path == '/gzip':
+            compressor = zlib.compressobj(6, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+            body = compressor.compress(body) + compressor.flush()
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class HttpClientTest(utils.BaseTestCase):
+
+    def _start_server(self):
+        server = _Server(('127.0.0.1', 0), _Handler)
+        server.requests = self.requests = []
+        server.bodies = self.bodies = []
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return 'http://127.0.0.1:%d/' % server.server_address[1]
+
+    def test_pool_defaults(self):
+        client = http.HTTPClient('http://localhost:7777/')
+        self.assertIs(client.adapter, client.session.get_adapter(
+            'http://localhost:7777/'))
+        self.assertEqual(http.DEFAULT_POOL_MAXSIZE,
+                         client.adapter._pool_maxsize)
+        self.assertEqual(http.DEFAULT_POOL_BLOCK, client.adapter._pool_block)
+        self.assertIsNone(client.adapter.keepalive)
+
+    def test_pool_options(self):
+        client = http._construct_http_client('https://localhost:7777/',
+                                             pool_connections=2,
+                                             pool_maxsize=50,
+                                             pool_block=True,
+                                             keepalive=30)
+        self.assertIs(client.adapter, client.session.get_adapter(
+            'https://localhost:7777/'))
+        self.assertEqual(2, client.adapter._pool_connections)
+        self.assertEqual(50, client.adapter._pool_maxsize)
+        self.assertTrue(client.adapter._pool_block)
+        socket_options = client.adapter.poolmanager.connection_pool_kw[
+            'socket_options']
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+                      socket_options)
+
+    def test_pool_stats(self):
+        client = http.HTTPClient(self._start_server())
+        self.assertEqual({'requests': 0, 'hits': 0, 'misses': 0},
+                         client.get_pool_stats())
+        for i in range(3):
+            client.json_request('GET', '/v1/resources')
+        self.assertEqual({'requests': 3, 'hits': 2, 'misses': 1},
+                         client.get_pool_stats())
+
+    def test_timeout_defaults(self):
+        client = http._construct_http_client('http://localhost:7777/')
+        self.assertEqual((http.DEFAULT_TIMEOUT, http.DEFAULT_TIMEOUT),
+                         http._get_request_timeout(client))
+
+    def test_timeout_per_call(self):
+        client = http.HTTPClient('http://localhost:7777/', timeout=60,
+                                 connect_timeout=5)
+        self.assertEqual((5, 60), http._get_request_timeout(client))
+        self.assertEqual((5, 10), http._get_request_timeout(client, 10))
+        self.assertEqual((1, 2), http._get_request_timeout(client, (1, 2)))
+
+    def test_timeout(self):
+        client = http.HTTPClient(self._start_server(), timeout=0.1,
+                                 max_retries=0)
+        self.assertRaises(exc.Timeout, client.json_request, 'GET', '/slow')
+
+    def test_timeout_per_call_request(self):
+        client = http.HTTPClient(self._start_server(), max_retries=0)
+        self.assertRaises(exc.Timeout, client.json_request, 'GET', '/slow',
+                          timeout=0.1)
+
+    def test_timeout_retried(self):
+        client = http.HTTPClient(self._start_server(), timeout=0.1,
+                                 max_retries=1, retry_interval=0)
+        self.assertRaises(exc.Timeout, client.json_request, 'GET', '/slow')
+        self.assertEqual(['/slow', '/slow'], self.requests)
+
+    def test_retry_deadline(self):
+        client = http.HTTPClient('http://localhost:7777/', retry_interval=2)
+        self.assertEqual(2, http._get_retry_delay(client, 'error', 1, 5, 1,
+                                                  deadline=5))
+        self.assertIsNone(http._get_retry_delay(client, 'error', 1, 5, 3,
+                                                deadline=5))
+
+    def test_deadline_expired(self):
+        client = http.HTTPClient('http://localhost:7777/')
+        with mock.patch.object(client.session, 'request') as m_request:
+            self.assertRaises(exc.Timeout, client.json_request, 'GET',
+                              '/v1/resources', deadline=0)
+        self.assertFalse(m_request.called)
+
+    def test_deadline_page_timeout(self):
+        timeouts = []
+
+        def fake_request(method, url, **kwargs):
+            timeouts.append(kwargs['timeout'])
+            time.sleep(0.04)
+            raise requests.exceptions.ReadTimeout()
+
+        client = http.HTTPClient('http://localhost:7777/', timeout=60,
+                                 max_retries=5, retry_interval=0)
+        mgr = resource.ResourceManager(client)
+        start = time.time()
+        with mock.patch.object(client.session, 'request',
+                               side_effect=fake_request):
+            self.assertRaises(exc.Timeout, mgr.list, limit=0, deadline=0.1)
+        # NOTE: retries stop with the deadline, each attempt only being
+        # given the time left.
+        self.assertLess(time.time() - start, 0.5)
+        self.assertLess(len(timeouts), 6)
+        self.assertTrue(all(0 < read <= 0.1 for connect, read in timeouts))
+        self.assertEqual(sorted(timeouts, reverse=True), timeouts)
+
+    def test_retry_policy(self):
+        client = http.HTTPClient('http://localhost:7777/',
+                                 retry_policy='exponential', retry_interval=1)
+        self.assertEqual(4, http._get_retry_delay(client, 'error', 3, 5))
+        self.assertIsNone(http._get_retry_delay(client, 'error', 5, 5))
+
+    def test_retry_max_time(self):
+        client = http.HTTPClient('http://localhost:7777/', retry_interval=2,
+                                 retry_max_time=5)
+        self.assertEqual(2, http._get_retry_delay(client, 'error', 1, 5, 3))
+        self.assertIsNone(http._get_retry_delay(client, 'error', 2, 5, 4))
+
+    def test_retry_budget(self):
+        client = http.HTTPClient(self._start_server(), timeout=0.1,
+                                 max_retries=3, retry_interval=0,
+                                 retry_budget=0.1)
+        client.retry_budget.tokens = 1
+        self.assertRaises(exc.Timeout, client.json_request, 'GET', '/slow')
+        self.assertEqual(['/slow', '/slow'], self.requests)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(3, http._parse_retry_after('3'))
+        self.assertEqual(0, http._parse_retry_after('-1'))
+        self.assertIsNone(http._parse_retry_after(None))
+        self.assertIsNone(http._parse_retry_after('soon'))
+        for value in ('nan', 'inf', '-Infinity'):
+            self.assertIsNone(http._parse_retry_after(value))
+
+    @mock.patch.object(http.time, 'time', autospec=True)
+    def test_parse_retry_after_date(self, mock_time):
+        mock_time.return_value = 1445412480
+        self.assertEqual(
+            20, http._parse_retry_after('Wed, 21 Oct 2015 07:28:20 GMT'))
+
+    @mock.patch.object(http.time, 'sleep', autospec=True)
+    def test_retry_after(self, mock_sleep):
+        client = http.HTTPClient(self._start_server(), retry_after_max=5)
+        client.json_request('GET', '/busy')
+        self.assertEqual(['/busy', '/busy'], self.requests)
+        mock_sleep.assert_called_once_with(5)
+
+    @mock.patch.object(http.time, 'sleep', autospec=True)
+    def test_retry_after_disabled(self, mock_sleep):
+        client = http.HTTPClient(self._start_server(), retry_after_max=0)
+        self.assertEqual(0, client.retry_after_max)
+        client.json_request('GET', '/busy')
+        self.assertEqual(['/busy', '/busy'], self.requests)
+        mock_sleep.assert_called_once_with(0)
+
+    def test_format_log_body(self):
+        self.assertEqual('{"password": "***"}',
+                         http._format_log_body('{"password": "secret"}'))
+        self.assertEqual('{"name"... (11 more characters)',
+                         http._format_log_body('{"name": "server"}', 7))
+
+    @mock.patch.object(http.HTTPClient, 'log_http_response', autospec=True)
+    @mock.patch.object(http.HTTPClient, 'log_curl_request', autospec=True)
+    def test_no_debug_logging(self, mock_curl, mock_response):
+        client = http.HTTPClient(self._start_server())
+        with mock.patch.object(http.LOG, 'isEnabledFor', autospec=True,
+                               return_value=False):
+            client.json_request('GET', '/v1/resources')
+        self.assertFalse(mock_curl.called)
+        self.assertFalse(mock_response.called)
+
+    @mock.patch.object(http.HTTPClient, 'log_http_response', autospec=True)
+    def test_debug_logging(self, mock_response):
+        client = http.HTTPClient(self._start_server(), log_body_max=10)
+        with mock.patch.object(http.LOG, 'isEnabledFor', autospec=True,
+                               return_value=True):
+            client.json_request('GET', '/v1/resources')
+        mock_response.assert_called_once_with(mock.ANY, '{"resources": []}',
+                                              10)
+
+    def test_decode_json(self):
+        self.assertEqual({'resources': []},
+                         http._decode_json(b'{"resources": []}'))
+        self.assertEqual('not json', http._decode_json(b'not json'))
+
+    def test_raw_request_body(self):
+        client = http.HTTPClient(self._start_server())
+        resp, body_iter = client.raw_request('GET', '/v1/resources')
+        self.assertEqual('{"resources": []}', ''.join(body_iter))
+
+    def test_json_stream_request(self):
+        client = http.HTTPClient(self._start_server())
+        resp, stream = client.json_stream_request('GET', '/v1/resources',
+                                                  'resources')
+        self.assertEqual([], list(stream))
+        stream.close()
+
+    def _fake_response(self, chunks, headers):
+        resp = mock.Mock(headers=headers)
+        resp.iter_content.return_value = iter(chunks)
+        return resp
+
+    @mock.patch.object(http, 'MAX_BODY_PRESIZE', 4)
+    def test_read_body(self):
+        for length in (None, '2', '6', '10', '-1', str(2 ** 62), 'invalid'):
+            resp = self._fake_response([b'abc', b'def'],
+                                       {'Content-Length': length})
+            self.assertEqual(b'abcdef', http._read_body(resp, 3))
+            self.assertEqual(b'abcdef', resp._content)
+            resp.iter_content.assert_called_once_with(chunk_size=3)
+
+    def test_multibyte_across_chunks(self):
+        client = http.HTTPClient(self._start_server(), chunk_size=1)
+        resp, body = client.json_request('GET', '/utf8')
+        self.assertEqual({'resources': [{'name': u'\u00e9t\u00e9'}]}, body)
+
+    def test_compressed_response(self):
+        client = http.HTTPClient(self._start_server())
+        resp, body = client.json_request('GET', '/gzip')
+        self.assertEqual([{'name': 'server'}] * 100, body['resources'])
+        stats = client.get_compression_stats()
+        self.assertEqual(1, stats['compressed_responses'])
+        self.assertGreater(stats['decoded_bytes'], stats['wire_bytes'])
+        self.assertGreater(stats['ratio'], 1)
+
+    def test_compressed_request(self):
+        client = http.HTTPClient(self._start_server(), compress_min_size=10)
+        client.json_request('POST', '/v1/resources', body={'name': 'a'})
+        client.json_request('POST', '/v1/resources', body={})
+        self.assertEqual([{'name': 'a'}, {}], self.bodies)
+        stats = client.get_compression_stats()
+        self.assertEqual(1, stats['compressed_requests'])
+        self.assertEqual(13, stats['request_bytes'])
+
+    def test_session_compressed_request(self):
+        client = http.SessionClient(0, 0, 'http://localhost:7777/',
+                                    compress_min_size=10)
+        client.session = mock.Mock()
+        client.session.request.return_value = mock.Mock(status_code=200,
+                                                        headers={})
+        client.auth = client.endpoint_override = None
+        client.raw_request('POST', '/v1/resources', data='x' * 100)
+        kwargs = client.session.request.call_args[1]
+        self.assertEqual('gzip', kwargs['headers']['Content-Encoding'])
+        self.assertEqual(b'x' * 100,
+                         zlib.decompress(kwargs['data'], 16 + zlib.MAX_WBITS))
+
+    def _stream_response(self, error):
+        def iter_content(chunk_size):
+            yield b'{"resources": [{"uuid": "a"}, '
+            raise error
+        return mock.Mock(status_code=200, headers={},
+                         iter_content=iter_content)
+
+    def test_stream_errors(self):
+        client = http.HTTPClient('http://localhost:7777/')
+        for error, expected in (
+                (requests.exceptions.ChunkedEncodingError(),
+                 exc.ConnectionRefused),
+                (requests.exceptions.ConnectionError(
+                    http.urllib3_exceptions.ReadTimeoutError(None, None,
+                                                             'timeout')),
+                 exc.Timeout)):
+            with mock.patch.object(client.session, 'request',
+                                   return_value=self._stream_response(error)):
+                resp, stream = client.json_stream_request(
+                    'GET', '/v1/resources', 'resources')
+            items = iter(stream)
+            self.assertEqual({'uuid': 'a'}, next(items))
+            self.assertRaises(expected, next, items)
+
+    def test_session_stream_request(self):
+        client = http.SessionClient(0, 0, 'http://localhost:7777/')
+        client.session = mock.Mock()
+        client.session.request.return_value = self._stream_response(
+            requests.exceptions.ReadTimeout())
+        client.auth = client.endpoint_override = None
+        resp, stream = client.json_stream_request(
+            'GET', '/v1/resources', 'resources', deadline=5)
+        self.assertTrue(client.session.request.call_args[1]['stream'])
+        connect, read = client.session.request.call_args[1]['timeout']
+        self.assertTrue(0 < connect <= 5 and 0 < read <= 5)
+        items = iter(stream)
+        self.assertEqual({'uuid': 'a'}, next(items))
+        self.assertRaises(exc.Timeout, next, items)
+
+    def test_compress_body(self):
+        headers = {}
+        self.assertEqual('{}', http._compress_body('{}', headers, 10))
+        self.assertEqual({}, headers)
+        body = http._compress_body('x' * 100, headers, 10)
+        self.assertEqual({'Content-Encoding': 'gzip'}, headers)
+        self.assertEqual(b'x' * 100,
+                         zlib.decompress(body, 16 + zlib.MAX_WBITS))
+        self.assertEqual('x' * 100, http._compress_body('x' * 100, {}))
+
+    def test_http_cache(self):
+        client = http.HTTPClient(self._start_server(), http_cache_size=1)
+        for i in range(2):
+            resp, body = client.json_request('GET', '/etag')
+            self.assertEqual({'resources': [{'name': 'cached'}]}, body)
+        self.assertEqual(304, resp.status_code)
+        self.assertEqual({'hits': 1, 'misses': 1, 'revalidations': 1,
+                          'updates': 0, 'disk_hits': 0, 'size': 1},
+                         client.get_http_cache_stats())
+
+    def test_http_cache_lru(self):
+        client = http.HTTPClient(self._start_server(), http_cache_size=1)
+        for url in ('/etag/1', '/etag/2', '/etag/1'):
+            client.json_request('GET', url)
+        stats = client.get_http_cache_stats()
+        self.assertEqual((3, 0, 1), (stats['misses'], stats['hits'],
+                                     stats['size']))
+
+    def test_http_cache_invalidated(self):
+        client = http.HTTPClient(self._start_server(), http_cache_size=1)
+        client.json_request('GET', '/etag')
+        client.json_request('POST', '/etag', body={})
+        client.json_request('GET', '/etag')
+        self.assertEqual(2, client.get_http_cache_stats()['misses'])
+
+    def test_http_cache_write_during_get(self):
+        client = http.HTTPClient(self._start_server(), http_cache_size=1)
+        http_request = client._http_request
+
+        def _write_then_get(url, method, **kwargs):
+            if method == 'GET':
+                # NOTE: the write completes while the GET is in flight.
+                client.json_request('POST', '/etag', body={})
+            return http_request(url, method, **kwargs)
+
+        with mock.patch.object(client, '_http_request',
+                               side_effect=_write_then_get):
+            client.json_request('GET', '/etag')
+        self.assertEqual(0, client.get_http_cache_stats()['size'])
+        client.json_request('GET', '/etag')
+        self.assertEqual(1, client.get_http_cache_stats()['size'])
+
+    def test_http_cache_disk(self):
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        endpoint = self._start_server()
+        client = http.HTTPClient(endpoint, http_cache_size=1,
+                                 http_cache_dir=cache_dir)
+        client.json_request('GET', '/etag')
+        client = http.HTTPClient(endpoint, http_cache_size=1,
+                                 http_cache_dir=cache_dir)
+        resp, body = client.json_request('GET', '/etag')
+        self.assertEqual({'resources': [{'name': 'cached'}]}, body)
+        stats = client.get_http_cache_stats()
+        self.assertEqual((1, 1), (stats['disk_hits'], stats['hits']))
+
+    def test_http_cache_disabled(self):
+        client = http.HTTPClient(self._start_server())
+        client.json_request('GET', '/etag')
+        client.json_request('GET', '/etag')
+        self.assertIsNone(client.get_http_cache_stats())
@@ -0,0 +1,89 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from cellarclient import exc
+from cellarclient.common import jsonutils
+from cellarclient.tests.unit import utils
+
+
+class JsonUtilsTest(utils.BaseTestCase):
+
+    def test_loads(self):
+        for backend in (None, 'json'):
+            self.assertEqual({'name': u'é'},
+                             jsonutils.loads(b'{"name": "\xc3\xa9"}',
+                                             backend=backend))
+            self.assertEqual([1], jsonutils.loads('[1]', backend=backend))
+
+    def test_loads_invalid(self):
+        self.assertRaises(ValueError, jsonutils.loads, b'{')
+
+    def test_get_loads_unknown(self):
+        self.assertRaises(exc.InvalidAttribute, jsonutils.get_loads,
+                          'yaml')
+
+    def test_dumps(self):
+        for backend in (None, 'json'):
+            self.assertEqual(b'{"name":"\xc3\xa9","ids":[1,null]}',
+                             jsonutils.dumps({'name': u'\xe9',
+                                              'ids': [1, None]},
+                                             backend=backend))
+
+    def test_dumps_invalid(self):
+        self.assertRaises(TypeError, jsonutils.dumps, {'ids': object()})
+
+    def test_get_dumps_unknown(self):
+        self.assertRaises(exc.InvalidAttribute, jsonutils.get_dumps,
+                          'yaml')
+
+
+class ArrayStreamTest(utils.BaseTestCase):
+
+    DOC = (b'{"first": 1, "resources": [{"name": "\xc3\xa9"}, 12345, 1.5e3,'
+           b' null], "next": "/v1/resources?marker=x"}')
+
+    def _stream(self, size):
+        chunks = [self.DOC[i:i + size] for i in range(0, len(self.DOC), size)]
+        return jsonutils.ArrayStream(chunks, 'resources')
+
+    def test_items(self):
+        for size in (1, 2, 5, len(self.DOC)):
+            stream = self._stream(size)
+            self.assertEqual([{'name': u'é'}, 12345, 1500.0, None],
+                             list(stream))
+            self.assertEqual({'first': 1, 'next': '/v1/resources?marker=x'},
+                             stream.members)
+
+    def test_missing_key(self):
+        stream = jsonutils.ArrayStream([b'{"next": null}'], 'resources')
+        self.assertEqual([], list(stream))
+        self.assertEqual({'next': None}, stream.members)
+
+    def test_single_object(self):
+        stream = jsonutils.ArrayStream([b'{"resources": {"a": 1}}'],
+                                       'resources')
+        self.assertEqual([{'a': 1}], list(stream))
+
+    def test_truncated(self):
+        stream = jsonutils.ArrayStream([b'{"resources": [1, '], 'resources')
+        self.assertRaises(ValueError, list, stream)
+
+    def test_not_an_object(self):
+        stream = jsonutils.ArrayStream([b'[1]'], 'resources')
+        self.assertRaises(ValueError, list, stream)
+
+    def test_close(self):
+        close = mock.Mock()
+        jsonutils.ArrayStream([], 'resources', close=close).close()
+        close.assert_called_once_with()
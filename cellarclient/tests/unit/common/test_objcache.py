@@ -0,0 +1,96 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import dogpile.cache
+import mock
+
+from cellarclient.common import objcache
+from cellarclient.tests.unit import utils
+
+
+class ObjectCacheTest(utils.BaseTestCase):
+
+    def test_abstract(self):
+        self.assertRaises(TypeError, objcache._BaseCache)
+
+    def test_field_sets(self):
+        cache = objcache.ObjectCache()
+        cache.set('a', {'uuid': 'a', 'type': 'pdu'})
+        cache.set('a', {'uuid': 'a'}, fields=('uuid',))
+        self.assertEqual({'uuid': 'a', 'type': 'pdu'}, cache.get('a'))
+        self.assertEqual({'uuid': 'a'}, cache.get('a', fields=('uuid',)))
+        self.assertIsNone(cache.get('a', fields=('type',)))
+        self.assertIsNone(cache.get('b'))
+        stats = cache.get_stats()
+        self.assertEqual(2, stats['hits'])
+        self.assertEqual(2, stats['misses'])
+        self.assertEqual(1, stats['size'])
+
+    def test_invalidate(self):
+        cache = objcache.ObjectCache()
+        cache.set('a', {'uuid': 'a'})
+        cache.set('a', {'uuid': 'a'}, fields=('uuid',))
+        cache.invalidate('a')
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNone(cache.get('a', fields=('uuid',)))
+        self.assertEqual(1, cache.get_stats()['invalidations'])
+
+    def test_refresh(self):
+        cache = objcache.ObjectCache()
+        cache.set('a', {'uuid': 'a'}, fields=('uuid',))
+        cache.refresh('a', {'uuid': 'a', 'type': 'pdu'})
+        self.assertIsNone(cache.get('a', fields=('uuid',)))
+        self.assertEqual({'uuid': 'a', 'type': 'pdu'}, cache.get('a'))
+
+    def test_lru(self):
+        cache = objcache.ObjectCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+        self.assertEqual(1, cache.get_stats()['evictions'])
+
+    @mock.patch.object(objcache.timeutils, 'now', autospec=True)
+    def test_ttl(self, mock_now):
+        mock_now.return_value = 100
+        cache = objcache.ObjectCache(ttl=10)
+        cache.set('a', 1)
+        mock_now.return_value = 109
+        self.assertEqual(1, cache.get('a'))
+        mock_now.return_value = 110
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(1, cache.get_stats()['expirations'])
+
+
+class RegionCacheTest(utils.BaseTestCase):
+
+    def test_region(self):
+        region = dogpile.cache.make_region().configure(
+            'dogpile.cache.memory')
+        cache = objcache.get_cache(region)
+        self.assertIsInstance(cache, objcache.RegionCache)
+        cache.set('a', {'uuid': 'a'})
+        self.assertEqual({'uuid': 'a'}, cache.get('a'))
+        self.assertEqual({None: mock.ANY}, region.get('a'))
+        cache.invalidate('a')
+        self.assertIsNone(cache.get('a'))
+        self.assertIs(dogpile.cache.api.NO_VALUE, region.get('a'))
+
+    def test_get_cache(self):
+        self.assertIsNone(objcache.get_cache(None))
+        self.assertIsNone(objcache.get_cache(False))
+        self.assertIsInstance(objcache.get_cache(True), objcache.ObjectCache)
+        cache = objcache.ObjectCache()
+        self.assertIs(cache, objcache.get_cache(cache))
@@ -0,0 +1,67 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from cellarclient import exc
+from cellarclient.common import retry
+from cellarclient.tests.unit import utils
+
+
+class RetryPolicyTest(utils.BaseTestCase):
+
+    def test_get_policy_default(self):
+        self.assertIsInstance(retry.get_policy(), retry.FixedPolicy)
+
+    def test_get_policy_unknown(self):
+        self.assertRaises(exc.InvalidAttribute, retry.get_policy, 'never')
+
+    def test_get_policy_object(self):
+        policy = retry.ExponentialPolicy(max_delay=5)
+        self.assertIs(policy, retry.get_policy(policy))
+
+    def test_fixed(self):
+        policy = retry.get_policy('fixed')
+        self.assertEqual([2, 2, 2],
+                         [policy.get_delay(2, i) for i in range(1, 4)])
+
+    def test_exponential(self):
+        policy = retry.ExponentialPolicy(max_delay=10)
+        self.assertEqual([2, 4, 8, 10],
+                         [policy.get_delay(2, i) for i in range(1, 5)])
+
+    @mock.patch.object(retry.random, 'uniform', autospec=True)
+    def test_jitter(self, mock_uniform):
+        mock_uniform.return_value = 3
+        self.assertEqual(3, retry.get_policy('jitter').get_delay(2, 3))
+        mock_uniform.assert_called_once_with(0, 8)
+
+
+class RetryBudgetTest(utils.BaseTestCase):
+
+    def test_budget(self):
+        budget = retry.RetryBudget(0.5, capacity=1)
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+    def test_budget_capacity(self):
+        budget = retry.RetryBudget(1, capacity=2)
+        for i in range(5):
+            budget.deposit()
+        self.assertEqual(2, budget.tokens)
+
+    def test_budget_invalid(self):
+        self.assertRaises(exc.InvalidAttribute, retry.RetryBudget, 2)
@@ -0,0 +1,173 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+from cellarclient.common import store
+from cellarclient.common import utils as common_utils
+from cellarclient import exc
+from cellarclient.tests.unit import utils
+
+RES1 = {'uuid': 'a', 'type': 'server', 'description': 'z',
+        'updated_at': '2016-01-02T00:00:00+00:00'}
+RES2 = {'uuid': 'b', 'type': 'pdu', 'description': 'y',
+        'updated_at': None}
+
+
+class ResourceStoreTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(ResourceStoreTest, self).setUp()
+        self.store = store.ResourceStore(':memory:')
+        self.addCleanup(self.store.close)
+
+    def test_upsert(self):
+        self.assertEqual(2, self.store.upsert([RES1, RES2]))
+        self.assertEqual(RES1, self.store.get('a'))
+        updated = dict(RES1, description='x')
+        self.store.upsert([updated])
+        self.assertEqual(updated, self.store.get('a'))
+        self.assertEqual(2, self.store.count())
+        self.assertIsNone(self.store.get('c'))
+
+    def test_replace(self):
+        self.store.upsert([RES1])
+        self.assertEqual(1, self.store.replace([RES2]))
+        self.assertEqual(set(['b']), self.store.uuids())
+
+    def test_replace_failure(self):
+        def resources():
+            yield RES2
+            raise ValueError()
+
+        self.store.upsert([RES1])
+        self.assertRaises(ValueError, self.store.replace, resources())
+        self.assertEqual(set(['a']), self.store.uuids())
+
+    def test_delete(self):
+        self.store.upsert([RES1, RES2])
+        self.assertEqual(1, self.store.delete(['a', 'c']))
+        self.assertEqual(set(['b']), self.store.uuids())
+
+    def test_list(self):
+        self.store.upsert([RES2, RES1])
+        self.assertEqual([RES1, RES2], self.store.list())
+        self.assertEqual([RES2, RES1], self.store.list(sort_dir='desc'))
+        self.assertEqual([RES2, RES1], self.store.list(sort_key='type'))
+        self.assertEqual([RES2, RES1],
+                         self.store.list(sort_key='description'))
+        self.assertEqual([RES2, RES1], self.store.list(sort_key='updated_at'))
+
+    def test_list_marker(self):
+        self.store.upsert(
+            {'uuid': 'r%d' % i, 'type': 'server' if i % 2 else 'pdu',
+             'updated_at': None if i % 3 else '2016-01-0%d' % (i % 4)}
+            for i in range(8))
+        for sort_key in ('uuid', 'type', 'updated_at', 'description'):
+            for sort_dir in ('asc', 'desc'):
+                uuids = [res['uuid'] for res in self.store.list(
+                    sort_key=sort_key, sort_dir=sort_dir)]
+                for i, marker in enumerate(uuids):
+                    resources = self.store.list(sort_key=sort_key,
+                                                sort_dir=sort_dir,
+                                                marker=marker, limit=2)
+                    self.assertEqual(uuids[i + 1:i + 3],
+                                     [res['uuid'] for res in resources])
+        self.assertEqual(8, len(self.store.list(marker='missing')))
+        self.assertEqual(['r5'], [res['uuid'] for res in self.store.list(
+            where=['type=server'], marker='r3', limit=1)])
+
+    def test_get_markers(self):
+        self.assertEqual([], self.store.get_markers(3))
+        self.store.upsert({'uuid': 'r%d' % i, 'type': 'server'}
+                          for i in range(9))
+        self.assertEqual([('r2', 'r2'), ('r5', 'r5')],
+                         self.store.get_markers(3))
+        self.assertEqual([('r6', 'server'), ('r3', 'server')],
+                         self.store.get_markers(3, sort_key='type',
+                                                sort_dir='desc'))
+        self.assertEqual([], self.store.get_markers(1))
+        self.assertRaises(exc.InvalidAttribute, self.store.get_markers, 3,
+                          sort_key='description')
+
+    def test_meta(self):
+        self.assertEqual('x', self.store.get_meta('watermark', 'x'))
+        self.store.set_meta('watermark', 1.5)
+        self.assertEqual('1.5', self.store.get_meta('watermark'))
+
+    def test_file(self):
+        with common_utils.tempdir() as tmp:
+            path = os.path.join(tmp, 'mirror', 'resources.sqlite')
+            with store.ResourceStore(path) as mirror:
+                mirror.upsert([RES1])
+            with store.ResourceStore(path) as mirror:
+                self.assertEqual(RES1, mirror.get('a'))
+
+
+class ResourceStoreQueryTest(utils.BaseTestCase):
+
+    def setUp(self):
+        super(ResourceStoreQueryTest, self).setUp()
+        self.store = store.ResourceStore(':memory:')
+        self.addCleanup(self.store.close)
+        self.servers = [
+            {'uuid': 'server%d' % i, 'type': 'server',
+             'attributes': {'ram': 1024 * i, 'ironic_driver': 'fake'}}
+            for i in range(1, 4)]
+        self.pdu = {'uuid': 'pdu', 'type': 'pdu',
+                    'attributes': {'snmp-port': 1161}}
+        self.store.upsert(self.servers + [self.pdu])
+
+    def _uuids(self, **kwargs):
+        return [res['uuid'] for res in self.store.list(**kwargs)]
+
+    def test_parse_condition(self):
+        self.assertEqual(('attributes.ram', '>=', 2048),
+                         store.parse_condition('ram>=2048'))
+        self.assertEqual(('type', '=', 'server'),
+                         store.parse_condition('type = server'))
+        self.assertEqual(('attributes.ram', '!=', '2048'),
+                         store.parse_condition('attributes.ram!="2048"'))
+
+    def test_parse_condition_invalid(self):
+        for condition in ('ram', 'ram~1', "ram')=1", 'ram=[1]', '=1'):
+            self.assertRaises(exc.InvalidAttribute,
+                              store.parse_condition, condition)
+
+    def test_where(self):
+        self.assertEqual(['server2', 'server3'],
+                         self._uuids(where=['ram>=2048']))
+        self.assertEqual(['server1', 'server2', 'server3'],
+                         self._uuids(where=['type=server',
+                                            'ironic_driver=fake']))
+        self.assertEqual(['pdu'], self._uuids(where=['ironic_driver=null']))
+        self.assertEqual(['pdu'], self._uuids(where=['snmp-port=1161']))
+        self.assertEqual(['server1'],
+                         self._uuids(where=[('attributes.ram', '<', 2048)]))
+
+    def test_where_sort_limit(self):
+        self.assertEqual(['server3', 'server2'],
+                         self._uuids(where=['type=server'], sort_dir='desc',
+                                     limit=2))
+
+    def test_index(self):
+        self.store.create_index('ram')
+        self.store.create_index('type')
+        self.assertEqual(['attributes.ram'], self.store.indexes())
+        plan = self.store._conn.execute(
+            'EXPLAIN QUERY PLAN SELECT data FROM resources WHERE %s >= 1' %
+            store._get_expression('attributes.ram')).fetchall()
+        self.assertIn('resources_path_attributes.ram', str(plan))
+        self.assertEqual(['server2', 'server3'],
+                         self._uuids(where=['ram>=2048']))
+        self.store.drop_index('ram')
+        self.assertEqual([], self.store.indexes())
@@ -0,0 +1,60 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+import fixtures
+
+from cellarclient import exc
+from cellarclient.common import utils
+from cellarclient.tests.unit import utils as test_utils
+
+
+class IterItemsFromFileTest(test_utils.BaseTestCase):
+
+    def _write(self, name, content):
+        tmpdir = self.useFixture(fixtures.TempDir()).path
+        path = os.path.join(tmpdir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_json_lines(self):
+        path = self._write('resources.json',
+                           '{"type": "server"}\n\n{"type": "pdu"}\n')
+        self.assertEqual([{'type': 'server'}, {'type': 'pdu'}],
+                         list(utils.iter_items_from_file(path)))
+
+    def test_json_lines_invalid(self):
+        path = self._write('resources.json', '{"type": "server"}\n{foo\n')
+        items = utils.iter_items_from_file(path)
+        self.assertEqual({'type': 'server'}, next(items))
+        self.assertRaises(exc.InvalidAttribute, next, items)
+
+    def test_yaml_documents(self):
+        path = self._write('resources.yaml',
+                           'type: server\n'
+                           '---\n'
+                           '- type: pdu\n'
+                           '- type: switch\n')
+        self.assertEqual([{'type': 'server'}, {'type': 'pdu'},
+                          {'type': 'switch'}],
+                         list(utils.iter_items_from_file(path)))
+
+    def test_not_a_dictionary(self):
+        path = self._write('resources.yml', '- server\n')
+        self.assertRaises(exc.InvalidAttribute, list,
+                          utils.iter_items_from_file(path))
+
+    def test_missing_file(self):
+        self.assertRaises(exc.InvalidAttribute, list,
+                          utils.iter_items_from_file('/nonexistent.json'))
@@ -14,7 +14,10 @@
 #    under the License.
 
 import copy
+import fnmatch
+import json
 import os
+import sys
 
 import fixtures
 import mock
@@ -22,6 +25,8 @@ from oslo_utils import strutils
 import six
 import testtools
 
+from cellarclient.common import jsonutils
+
 
 class BaseTestCase(testtools.TestCase):
 
@@ -44,7 +49,8 @@ class FakeAPI(object):
         self.responses = responses
         self.calls = []
 
-    def _request(self, method, url, headers=None, body=None):
+    def _request(self, method, url, headers=None, body=None, timeout=None,
+                 deadline=None):
         call = (method, url, headers or {}, body)
         self.calls.append(call)
         return self.responses[url][method]
@@ -58,6 +64,12 @@ class FakeAPI(object):
         response = self._request(*args, **kwargs)
         return FakeResponse(response[0]), response[1]
 
+    def json_stream_request(self, method, url, response_key, **kwargs):
+        response = self._request(method, url, **kwargs)
+        chunks = iter([json.dumps(response[1]).encode('utf-8')])
+        return (FakeResponse(response[0]),
+                jsonutils.ArrayStream(chunks, response_key))
+
 
 class FakeConnection(object):
     def __init__(self, response=None):
@@ -134,4 +146,25 @@ class FakeSession(object):
     def request(self, url, method, **kwargs):
         request = FakeSessionResponse(
             self.headers, self.content, self.status_code, self.version)
-        return request
\ No newline at end of file
+        return request
+
+
+def get_load_tests(package, path):
+    """Return a load_tests function for a package of test modules.
+
+    The asyncio modules, named test_async_*, use async generators and are
+    left out before Python 3.6, where they would fail to import.
+
+    :param package: name of the package.
+    :param path: directory of the package.
+    """
+    def load_tests(loader, tests, pattern):
+        skip = 'test_async_*.py' if sys.version_info < (3, 6) else None
+        for name in sorted(os.listdir(path)):
+            if (not fnmatch.fnmatch(name, pattern or 'test*.py') or
+                    skip and fnmatch.fnmatch(name, skip)):
+                continue
+            tests.addTests(loader.loadTestsFromName(
+                '%s.%s' % (package, name[:-len('.py')])))
+        return tests
+    return load_tests
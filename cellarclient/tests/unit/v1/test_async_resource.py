@@ -0,0 +1,154 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+
+import testtools
+from testtools.matchers import HasLength
+
+from cellarclient.common import store
+from cellarclient import exc
+from cellarclient.tests.unit import utils
+from cellarclient.tests.unit.v1 import test_resource
+from cellarclient.tests.unit.v1 import test_resource_graph
+from cellarclient.v1 import async_resource
+from cellarclient.v1 import resource_graph
+
+RESOURCE = test_resource.RESOURCE
+RESOURCE2 = test_resource.RESOURCE2
+
+
+class FakeAsyncAPI(utils.FakeAPI):
+
+    async def raw_request(self, *args, **kwargs):
+        return super(FakeAsyncAPI, self).raw_request(*args, **kwargs)
+
+    async def json_request(self, *args, **kwargs):
+        return super(FakeAsyncAPI, self).json_request(*args, **kwargs)
+
+
+class AsyncResourceManagerTest(testtools.TestCase):
+
+    def setUp(self):
+        super(AsyncResourceManagerTest, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.api = FakeAsyncAPI(test_resource.fake_responses)
+        self.mgr = async_resource.AsyncResourceManager(self.api)
+
+    def _run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def _use_responses(self, responses):
+        self.api = FakeAsyncAPI(responses)
+        self.mgr = async_resource.AsyncResourceManager(self.api)
+
+    def test_resource_list(self):
+        resources = self._run(self.mgr.list())
+        expect = [
+            ('GET', '/v1/resources', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertThat(resources, HasLength(1))
+
+    def test_resource_list_pagination_no_limit(self):
+        self._use_responses(test_resource.fake_responses_pagination)
+        resources = self._run(self.mgr.list(limit=0))
+        expect = [
+            ('GET', '/v1/resources', {}, None),
+            ('GET', '/v1/resources/?limit=1', {}, None)
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual([RESOURCE['uuid'], RESOURCE2['uuid']],
+                         [r.uuid for r in resources])
+
+    def test_resource_iter(self):
+        self._use_responses(test_resource.fake_responses_pagination)
+
+        async def _first():
+            async for res in self.mgr.iter(limit=0):
+                return res
+
+        first = self._run(_first())
+        expect = [
+            ('GET', '/v1/resources', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual(RESOURCE['uuid'], first.uuid)
+
+    def test_resource_list_detail_and_fields_fail(self):
+        self.assertRaises(exc.InvalidAttribute, self._run,
+                          self.mgr.list(detail=True,
+                                        fields=['uuid', 'attributes']))
+
+    def test_resource_show_fields(self):
+        resource = self._run(self.mgr.get(RESOURCE['uuid'],
+                                          fields=['uuid', 'description']))
+        expect = [
+            ('GET', '/v1/resources/%s?fields=uuid,description' %
+             RESOURCE['uuid'], {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual(RESOURCE['uuid'], resource.uuid)
+
+    def test_create(self):
+        resource = self._run(self.mgr.create(**test_resource.CREATE_RESOURCE))
+        expect = [
+            ('POST', '/v1/resources', {}, test_resource.CREATE_RESOURCE),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertTrue(resource)
+
+    def test_create_invalid_attribute(self):
+        self.assertRaises(exc.InvalidAttribute, self._run,
+                          self.mgr.create(foo='bar'))
+        self.assertEqual([], self.api.calls)
+
+    def test_delete_many(self):
+        results = self._run(self.mgr.delete_many(
+            [RESOURCE['uuid'], RESOURCE2['uuid']], concurrency=2))
+        self.assertThat(self.api.calls, HasLength(2))
+        self.assertEqual([RESOURCE['uuid'], RESOURCE2['uuid']],
+                         [r.key for r in results])
+        self.assertEqual([None, None], [r.error for r in results])
+
+    def test_update(self):
+        patch = {'op': 'replace',
+                 'value': test_resource.NEW_DESCR,
+                 'path': '/description'}
+        resource = self._run(self.mgr.update(RESOURCE['uuid'], patch))
+        expect = [
+            ('PATCH', '/v1/resources/%s' % RESOURCE['uuid'], {}, patch),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual(test_resource.NEW_DESCR, resource.description)
+
+    def test_walk(self):
+        self._use_responses(test_resource_graph.fake_responses)
+        graph = self._run(self.mgr.walk('pdu', depth=1, concurrency=2))
+        self.assertEqual(['pdu', 'server1', 'server2'], list(graph.nodes))
+        self.assertEqual([resource_graph.Edge('pdu', '1', 'server1'),
+                          resource_graph.Edge('pdu', '2', 'server2')],
+                         graph.edges)
+
+    def test_list_local(self):
+        mirror = store.ResourceStore(':memory:')
+        self.addCleanup(mirror.close)
+        mirror.upsert([test_resource.OLD, test_resource.NEW])
+        resources = self._run(self.mgr.list_local(mirror, limit=1))
+        self.assertEqual(['new'], [r.uuid for r in resources])
+        self.assertEqual([], self.api.calls)
+
+    def test_no_blocking_methods(self):
+        for name in ('sync', '_list_in_parallel', '_get_watermarks',
+                     '_iter_page_streams', '_list_parallel'):
+            self.assertFalse(hasattr(self.mgr, name), name)
@@ -14,11 +14,18 @@
 #    under the License.
 
 import copy
+import pickle
+import threading
 
+import mock
 import testtools
+from six.moves.urllib import parse as urlparse
 from testtools.matchers import HasLength
 
 from cellarclient import exc
+from cellarclient.common import base
+from cellarclient.common import objcache
+from cellarclient.common import store
 from cellarclient.tests.unit import utils
 import cellarclient.v1.resource
 
@@ -88,6 +95,13 @@ fake_responses = {
             UPDATED_RESOURCE,
         ),
     },
+    '/v1/resources/%s' % RESOURCE2['uuid']:
+    {
+        'DELETE': (
+            {},
+            None,
+        ),
+    },
     '/v1/resources/%s?fields=uuid,description' % RESOURCE['uuid']:
     {
         'GET': (
@@ -155,6 +169,25 @@ class ResourceManagerTest(testtools.TestCase):
         self.assertEqual(expect, self.api.calls)
         self.assertEqual(1, len(resource))
 
+    def test_resource_list_compact(self):
+        resources = self.mgr.list(compact=True)
+        self.assertIsInstance(resources[0],
+                              cellarclient.v1.resource.ResourceRecord)
+        self.assertEqual(RESOURCE['uuid'], resources[0].uuid)
+        self.assertEqual(RESOURCE, resources[0].to_dict())
+
+    def test_resource_list_compact_pagination(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        for stream in (False, True):
+            resources = list(self.mgr.list(limit=0, stream=stream,
+                                           compact=True))
+            self.assertEqual(
+                [RESOURCE['uuid'], RESOURCE2['uuid']],
+                [r.uuid for r in resources])
+            self.assertIsInstance(resources[1],
+                                  cellarclient.v1.resource.ResourceRecord)
+
     def test_resource_list_limit(self):
         self.api = utils.FakeAPI(fake_responses_pagination)
         self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
@@ -186,6 +219,96 @@ class ResourceManagerTest(testtools.TestCase):
         self.assertEqual(expect, self.api.calls)
         self.assertThat(resource, HasLength(2))
 
+    def test_resource_list_stream(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        resources = self.mgr.list(limit=0, stream=True)
+        self.assertEqual([], self.api.calls)
+        first = next(resources)
+        expect = [
+            ('GET', '/v1/resources', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual(RESOURCE['uuid'], first.uuid)
+        second = next(resources)
+        expect.append(('GET', '/v1/resources/?limit=1', {}, None))
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual(RESOURCE2['uuid'], second.uuid)
+        self.assertRaises(StopIteration, next, resources)
+
+    def test_resource_list_incremental(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        resources = self.mgr.list(limit=0, stream=True, incremental=True)
+        self.assertEqual([RESOURCE['uuid'], RESOURCE2['uuid']],
+                         [resource.uuid for resource in resources])
+        self.assertThat(self.api.calls, HasLength(2))
+
+    def test_resource_list_incremental_prefetch(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        self.assertRaises(exc.InvalidAttribute, self.mgr.list, limit=0,
+                          incremental=True, prefetch=1)
+
+    def test_resource_list_stream_limit(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        resources = list(self.mgr.iter(limit=1))
+        expect = [
+            ('GET', '/v1/resources/?limit=1', {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertThat(resources, HasLength(1))
+
+    def test_resource_list_stream_marker(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        resources = list(self.mgr.iter(marker=RESOURCE['uuid']))
+        expect = [
+            ('GET', '/v1/resources/?marker=%s' % RESOURCE['uuid'], {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual([RESOURCE2['uuid']], [r.uuid for r in resources])
+
+    def test_resource_list_prefetch(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        resources = self.mgr.list(limit=0, prefetch=2)
+        expect = [
+            ('GET', '/v1/resources', {}, None),
+            ('GET', '/v1/resources/?limit=1', {}, None)
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual([RESOURCE['uuid'], RESOURCE2['uuid']],
+                         [r.uuid for r in resources])
+
+    def test_resource_list_prefetch_error(self):
+        responses = copy.deepcopy(fake_responses_pagination)
+        del responses['/v1/resources/?limit=1']
+        self.api = utils.FakeAPI(responses)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        resources = self.mgr.list(limit=0, prefetch=1, stream=True)
+        self.assertEqual(RESOURCE['uuid'], next(resources).uuid)
+        self.assertRaises(KeyError, next, resources)
+
+    def test_resource_list_deadline(self):
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        with mock.patch.object(self.api, 'json_request',
+                               wraps=self.api.json_request) as mock_request:
+            resources = self.mgr.list(limit=0, deadline=60)
+        self.assertThat(resources, HasLength(2))
+        for call in mock_request.call_args_list:
+            self.assertTrue(0 < call[1]['deadline'] <= 60)
+
+    @mock.patch.object(base.timeutils.StopWatch, 'expired', autospec=True)
+    def test_resource_list_deadline_expired(self, mock_expired):
+        mock_expired.side_effect = [False, True]
+        self.api = utils.FakeAPI(fake_responses_pagination)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        self.assertRaises(exc.Timeout, self.mgr.list, limit=0, deadline=60)
+        self.assertThat(self.api.calls, HasLength(1))
+
     def test_resource_list_sort_key(self):
         self.api = utils.FakeAPI(fake_responses_sorting)
         self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
@@ -261,6 +384,34 @@ class ResourceManagerTest(testtools.TestCase):
         self.assertEqual(expect, self.api.calls)
         self.assertTrue(resource)
 
+    def test_create_many(self):
+        results = self.mgr.create_many([CREATE_RESOURCE, CREATE_WITH_UUID],
+                                       concurrency=2)
+        expect = [
+            ('POST', '/v1/resources', {}, CREATE_RESOURCE),
+            ('POST', '/v1/resources', {}, CREATE_WITH_UUID),
+        ]
+        self.assertThat(self.api.calls, HasLength(2))
+        for call in expect:
+            self.assertIn(call, self.api.calls)
+        self.assertEqual([0, 1], [r.key for r in results])
+        self.assertEqual([None, None], [r.error for r in results])
+        self.assertEqual(RESOURCE['type'], results[0].result.type)
+
+    def test_create_many_invalid_attribute(self):
+        items = [CREATE_RESOURCE, {'type': 'server', 'foo': 'bar'}]
+        self.assertRaises(exc.InvalidAttribute, self.mgr.create_many, items)
+        self.assertEqual([], self.api.calls)
+
+    def test_create_many_failure(self):
+        with mock.patch.object(self.api, 'json_request',
+                               side_effect=[exc.Conflict(),
+                                            ({}, CREATE_RESOURCE)]):
+            results = self.mgr.create_many([CREATE_WITH_UUID,
+                                            CREATE_RESOURCE])
+        self.assertIsInstance(results[0].error, exc.Conflict)
+        self.assertIsNone(results[1].error)
+
     def test_delete(self):
         resource = self.mgr.delete(resource_id=RESOURCE['uuid'])
         expect = [
@@ -269,6 +420,26 @@ class ResourceManagerTest(testtools.TestCase):
         self.assertEqual(expect, self.api.calls)
         self.assertIsNone(resource)
 
+    def test_delete_many(self):
+        results = self.mgr.delete_many([RESOURCE['uuid'], RESOURCE2['uuid']],
+                                       concurrency=2)
+        expect = [
+            ('DELETE', '/v1/resources/%s' % RESOURCE['uuid'], {}, None),
+            ('DELETE', '/v1/resources/%s' % RESOURCE2['uuid'], {}, None),
+        ]
+        self.assertEqual(sorted(expect), sorted(self.api.calls))
+        self.assertEqual([RESOURCE['uuid'], RESOURCE2['uuid']],
+                         [r.key for r in results])
+        self.assertEqual([None, None], [r.error for r in results])
+
+    def test_delete_many_failure(self):
+        with mock.patch.object(self.api, 'raw_request',
+                               side_effect=[exc.NotFound(), None]):
+            results = self.mgr.delete_many([RESOURCE['uuid'],
+                                            RESOURCE2['uuid']])
+        self.assertIsInstance(results[0].error, exc.NotFound)
+        self.assertIsNone(results[1].error)
+
     def test_update(self):
         patch = {'op': 'replace',
                  'value': NEW_DESCR,
@@ -279,3 +450,447 @@ class ResourceManagerTest(testtools.TestCase):
         ]
         self.assertEqual(expect, self.api.calls)
         self.assertEqual(NEW_DESCR, resource.description)
+
+    def test_get_many(self):
+        def fake_request(method, url):
+            if url.endswith(RESOURCE2['uuid']):
+                raise exc.NotFound()
+            return {}, RESOURCE
+
+        with mock.patch.object(self.api, 'json_request',
+                               side_effect=fake_request) as m_request:
+            results = self.mgr.get_many([RESOURCE['uuid'], RESOURCE2['uuid'],
+                                         RESOURCE['uuid']], concurrency=2)
+        self.assertEqual([RESOURCE['uuid'], RESOURCE2['uuid']],
+                         list(results))
+        self.assertEqual(2, m_request.call_count)
+        self.assertEqual(RESOURCE['type'],
+                         results[RESOURCE['uuid']].result.type)
+        self.assertIsNone(results[RESOURCE['uuid']].error)
+        self.assertIsNone(results[RESOURCE2['uuid']].result)
+        self.assertIsInstance(results[RESOURCE2['uuid']].error,
+                              exc.NotFound)
+
+    def test_get_many_fields(self):
+        results = self.mgr.get_many([RESOURCE['uuid']],
+                                    fields=['uuid', 'description'])
+        expect = [
+            ('GET', '/v1/resources/%s?fields=uuid,description' %
+             RESOURCE['uuid'], {}, None),
+        ]
+        self.assertEqual(expect, self.api.calls)
+        self.assertEqual(RESOURCE['uuid'],
+                         results[RESOURCE['uuid']].result.uuid)
+
+
+class ResourceManagerCacheTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ResourceManagerCacheTest, self).setUp()
+        self.api = utils.FakeAPI(fake_responses)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api,
+                                                            cache=True)
+        self.get_call = ('GET', '/v1/resources/%s' % RESOURCE['uuid'], {},
+                         None)
+
+    def test_get_cached(self):
+        resource = self.mgr.get(RESOURCE['uuid'])
+        cached = self.mgr.get(RESOURCE['uuid'])
+        self.assertEqual([self.get_call], self.api.calls)
+        self.assertEqual(RESOURCE['description'], cached.description)
+        self.assertIsNot(resource._info, cached._info)
+        self.assertIsNot(cached._info, self.mgr.get(RESOURCE['uuid'])._info)
+        stats = self.mgr.get_cache_stats()
+        self.assertEqual(2, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+
+    def test_get_cached_by_fields(self):
+        self.mgr.get(RESOURCE['uuid'])
+        self.mgr.get(RESOURCE['uuid'], fields=['uuid', 'description'])
+        self.mgr.get(RESOURCE['uuid'], fields=['uuid', 'description'])
+        self.assertThat(self.api.calls, HasLength(2))
+
+    def test_update_refreshes(self):
+        self.mgr.get(RESOURCE['uuid'])
+        self.mgr.update(RESOURCE['uuid'], patch={})
+        resource = self.mgr.get(RESOURCE['uuid'])
+        self.assertThat(self.api.calls, HasLength(2))
+        self.assertEqual(NEW_DESCR, resource.description)
+
+    def test_update_failure_invalidates(self):
+        self.mgr.get(RESOURCE['uuid'])
+        with mock.patch.object(self.api, 'json_request',
+                               side_effect=exc.Conflict()):
+            self.assertRaises(exc.Conflict, self.mgr.update,
+                              RESOURCE['uuid'], patch={})
+        self.mgr.get(RESOURCE['uuid'])
+        self.assertEqual([self.get_call, self.get_call], self.api.calls)
+
+    def test_delete_invalidates(self):
+        self.mgr.get(RESOURCE['uuid'])
+        self.mgr.delete(RESOURCE['uuid'])
+        self.mgr.get(RESOURCE['uuid'])
+        self.assertEqual(self.get_call, self.api.calls[-1])
+        self.assertThat(self.api.calls, HasLength(3))
+
+    def test_create_refreshes(self):
+        with mock.patch.object(self.api, 'json_request',
+                               return_value=({}, RESOURCE)):
+            self.mgr.create(**CREATE_WITH_UUID)
+        resource = self.mgr.get(RESOURCE['uuid'])
+        self.assertEqual([], self.api.calls)
+        self.assertEqual(RESOURCE['type'], resource.type)
+
+    def test_cache_disabled(self):
+        mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        mgr.get(RESOURCE['uuid'])
+        mgr.get(RESOURCE['uuid'])
+        self.assertThat(self.api.calls, HasLength(2))
+        self.assertIsNone(mgr.get_cache_stats())
+
+    def test_shared_cache(self):
+        cache = objcache.ObjectCache(ttl=None)
+        mgr = cellarclient.v1.resource.ResourceManager(self.api, cache=cache)
+        mgr.get(RESOURCE['uuid'])
+        other = cellarclient.v1.resource.ResourceManager(self.api,
+                                                         cache=cache)
+        other.get(RESOURCE['uuid'])
+        self.assertEqual([self.get_call], self.api.calls)
+
+
+OLD = {'uuid': 'old', 'type': 'server', 'created_at': '2016-01-01',
+       'updated_at': None}
+CHANGED = {'uuid': 'changed', 'type': 'server', 'created_at': '2016-01-01',
+           'updated_at': '2016-01-03'}
+NEW = {'uuid': 'new', 'type': 'pdu', 'created_at': '2016-01-04',
+       'updated_at': None}
+
+fake_responses_sync = {
+    '/v1/resources/detail':
+    {
+        'GET': (
+            {},
+            {"resources": [OLD, dict(CHANGED, updated_at='2016-01-02')]},
+        ),
+    },
+    '/v1/resources/detail?sort_key=updated_at&sort_dir=desc':
+    {
+        'GET': (
+            {},
+            {"resources": [CHANGED, dict(OLD, updated_at='2016-01-01')],
+             "next": "http://127.0.0.1:6385/v1/resources/?marker=old"},
+        ),
+    },
+    '/v1/resources/detail?sort_key=created_at&sort_dir=desc':
+    {
+        'GET': (
+            {},
+            {"resources": [NEW, OLD]},
+        ),
+    },
+    '/v1/resources/?fields=uuid':
+    {
+        'GET': (
+            {},
+            {"resources": [{'uuid': 'changed'}, {'uuid': 'new'}]},
+        ),
+    },
+    '/v1/resources/?limit=1&sort_key=updated_at&sort_dir=desc'
+    '&fields=updated_at':
+    {
+        'GET': (
+            {},
+            {"resources": [{'updated_at': '2016-01-02'}]},
+        ),
+    },
+    '/v1/resources/?limit=1&sort_key=created_at&sort_dir=desc'
+    '&fields=created_at':
+    {
+        'GET': (
+            {},
+            {"resources": [{'created_at': '2016-01-01'}]},
+        ),
+    },
+}
+
+SYNC_MARK_URLS = [
+    '/v1/resources/?limit=1&sort_key=updated_at&sort_dir=desc'
+    '&fields=updated_at',
+    '/v1/resources/?limit=1&sort_key=created_at&sort_dir=desc'
+    '&fields=created_at',
+]
+
+
+class ResourceManagerSyncTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ResourceManagerSyncTest, self).setUp()
+        self.api = utils.FakeAPI(copy.deepcopy(fake_responses_sync))
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+        self.store = store.ResourceStore(':memory:')
+        self.addCleanup(self.store.close)
+
+    def _urls(self):
+        return [call[1] for call in self.api.calls]
+
+    def _set_marks(self, updated_at, created_at):
+        for url, key, value in zip(SYNC_MARK_URLS,
+                                   ('updated_at', 'created_at'),
+                                   (updated_at, created_at)):
+            self.api.responses[url]['GET'] = ({},
+                                              {"resources": [{key: value}]})
+
+    def test_sync_first(self):
+        result = self.mgr.sync(self.store)
+        self.assertEqual(cellarclient.v1.resource.SyncResult(True, 2, 0),
+                         result)
+        self.assertEqual(SYNC_MARK_URLS + ['/v1/resources/detail'],
+                         self._urls())
+        self.assertEqual(set(['old', 'changed']), self.store.uuids())
+        self.assertEqual('2016-01-02', self.store.get_meta('watermark'))
+
+    def test_sync_incremental(self):
+        self.mgr.sync(self.store)
+        self.api.calls = []
+        self._set_marks('2016-01-03', '2016-01-04')
+        result = self.mgr.sync(self.store, reconcile=False)
+        self.assertEqual(cellarclient.v1.resource.SyncResult(False, 2, 0),
+                         result)
+        # NOTE: the next page of the updated resources is not fetched.
+        self.assertEqual(
+            SYNC_MARK_URLS +
+            ['/v1/resources/detail?sort_key=updated_at&sort_dir=desc',
+             '/v1/resources/detail?sort_key=created_at&sort_dir=desc'],
+            self._urls())
+        self.assertEqual(CHANGED, self.store.get('changed'))
+        self.assertEqual(NEW, self.store.get('new'))
+        self.assertEqual(OLD, self.store.get('old'))
+        self.assertEqual('2016-01-04', self.store.get_meta('watermark'))
+
+    def test_sync_update_during_listing(self):
+        # NOTE: OLD is updated after being listed, and NEW created before
+        # the end of the listing.
+        self.api.responses['/v1/resources/detail']['GET'] = (
+            {}, {"resources": [OLD, dict(CHANGED, updated_at='2016-01-02'),
+                               NEW]})
+        self.mgr.sync(self.store)
+        self.assertEqual('2016-01-02', self.store.get_meta('watermark'))
+        updated = dict(OLD, updated_at='2016-01-03')
+        self.api.responses[
+            '/v1/resources/detail?sort_key=updated_at&sort_dir=desc'][
+            'GET'] = ({}, {"resources": [updated]})
+        self._set_marks('2016-01-03', '2016-01-04')
+        self.mgr.sync(self.store, reconcile=False)
+        self.assertEqual(updated, self.store.get('old'))
+
+    def test_sync_no_resources(self):
+        self._set_marks(None, None)
+        self.api.responses['/v1/resources/detail']['GET'] = (
+            {}, {"resources": []})
+        self.mgr.sync(self.store)
+        self.assertIsNone(self.store.get_meta('watermark'))
+
+    def test_sync_reconcile(self):
+        self.mgr.sync(self.store)
+        result = self.mgr.sync(self.store, reconcile=True)
+        self.assertEqual(1, result.deleted)
+        self.assertEqual(set(['changed', 'new']), self.store.uuids())
+        self.assertEqual('/v1/resources/?fields=uuid', self._urls()[-1])
+
+    def test_sync_reconcile_interval(self):
+        self.mgr.sync(self.store)
+        self.mgr.sync(self.store)
+        self.assertNotIn('/v1/resources/?fields=uuid', self._urls())
+        self.mgr.sync(self.store, reconcile_interval=0)
+        self.assertIn('/v1/resources/?fields=uuid', self._urls())
+
+    def test_sync_full(self):
+        self.mgr.sync(self.store)
+        self.store.upsert([NEW])
+        result = self.mgr.sync(self.store, full=True)
+        self.assertTrue(result.full)
+        self.assertEqual(set(['old', 'changed']), self.store.uuids())
+
+    def test_list_local(self):
+        self.store.upsert([OLD, CHANGED, NEW])
+        resources = self.mgr.list_local(self.store)
+        self.assertEqual(['changed', 'new', 'old'],
+                         [r.uuid for r in resources])
+        resources = self.mgr.list_local(self.store, sort_key='created_at',
+                                        sort_dir='desc', limit=2)
+        self.assertEqual(['new', 'changed'], [r.uuid for r in resources])
+        resources = self.mgr.list_local(self.store, marker='changed',
+                                        fields=['uuid'])
+        self.assertEqual([{'uuid': 'new'}, {'uuid': 'old'}],
+                         [r.to_dict() for r in resources])
+        self.assertEqual([], self.api.calls)
+
+
+PARALLEL_RESOURCES = [
+    {'uuid': 'r%d' % i, 'type': 'server' if i % 3 else 'pdu',
+     'created_at': '2016-01-%02d' % (i + 1)}
+    for i in range(11)]
+
+
+class PagedFakeAPI(object):
+    """Serves the pages of PARALLEL_RESOURCES, sorted as requested."""
+
+    page_size = 2
+
+    def __init__(self, resources):
+        self.resources = resources
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def json_request(self, method, url, **kwargs):
+        with self.lock:
+            self.calls.append(url)
+        query = dict(urlparse.parse_qsl(urlparse.urlparse(url).query))
+        sort_key = query.get('sort_key', 'uuid')
+        items = sorted(self.resources,
+                       key=lambda r: (r[sort_key], r['uuid']),
+                       reverse=query.get('sort_dir') == 'desc')
+        start = 0
+        if 'marker' in query:
+            uuids = [item['uuid'] for item in items]
+            if query['marker'] not in uuids:
+                raise exc.NotFound()
+            start = uuids.index(query['marker']) + 1
+        page = items[start:start + self.page_size]
+        body = {'resources': page}
+        if start + self.page_size < len(items):
+            query['marker'] = page[-1]['uuid']
+            body['next'] = 'http://127.0.0.1:6385/v1/resources?%s' % (
+                urlparse.urlencode(sorted(query.items())))
+        return utils.FakeResponse({}), body
+
+
+class ResourceManagerParallelTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ResourceManagerParallelTest, self).setUp()
+        self.api = PagedFakeAPI(PARALLEL_RESOURCES)
+        self.mgr = cellarclient.v1.resource.ResourceManager(self.api)
+
+    def _expected(self, sort_key='uuid', reverse=False):
+        return [r['uuid'] for r in sorted(
+            PARALLEL_RESOURCES, key=lambda r: (r[sort_key], r['uuid']),
+            reverse=reverse)]
+
+    def test_list_parallel_both_ends(self):
+        resources = self.mgr.list(parallel=2)
+        self.assertEqual(self._expected(), [r.uuid for r in resources])
+        self.assertIn('/v1/resources/?sort_key=uuid&sort_dir=desc',
+                      self.api.calls)
+        # NOTE: the two paginations stop where they meet.
+        self.assertLess(len(self.api.calls), 9)
+
+    def test_list_parallel_both_ends_ties(self):
+        resources = self.mgr.list(parallel=2, sort_key='type',
+                                  sort_dir='desc')
+        uuids = [r.uuid for r in resources]
+        self.assertEqual(sorted(self._expected()), sorted(uuids))
+        self.assertEqual(['server'] * 7 + ['pdu'] * 4,
+                         [r.type for r in resources])
+
+    def test_list_parallel_markers(self):
+        markers = [('r3', 'r3'), ('r7', 'r7')]
+        resources = self.mgr.list(parallel=3, markers=markers)
+        self.assertEqual(self._expected(), [r.uuid for r in resources])
+        self.assertIn('/v1/resources/?marker=r3&sort_key=uuid&sort_dir=asc',
+                      self.api.calls)
+        self.assertIn('/v1/resources/?marker=r7&sort_key=uuid&sort_dir=asc',
+                      self.api.calls)
+
+    def test_list_parallel_markers_sort_key(self):
+        markers = [('r4', '2016-01-05')]
+        resources = self.mgr.list(parallel=2, markers=markers,
+                                  sort_key='created_at', sort_dir='desc',
+                                  fields=['type'])
+        self.assertEqual(self._expected('created_at', reverse=True),
+                         [r.uuid for r in resources])
+        self.assertIn('/v1/resources/?marker=r4&sort_key=created_at&'
+                      'sort_dir=desc&fields=type,uuid,created_at',
+                      self.api.calls)
+
+    def test_list_parallel_deleted_marker(self):
+        markers = [('r3', 'r3'), ('gone', 'r55'), ('r7', 'r7')]
+        resources = self.mgr.list(parallel=4, markers=markers)
+        self.assertEqual(self._expected(), [r.uuid for r in resources])
+
+    def test_list_parallel_stream(self):
+        resources = self.mgr.list(parallel=2, stream=True)
+        self.assertEqual(self._expected(), [r.uuid for r in resources])
+
+    def test_list_parallel_compact(self):
+        resources = self.mgr.list(parallel=2, compact=True)
+        self.assertEqual(self._expected(), [r.uuid for r in resources])
+        self.assertIsInstance(resources[0],
+                              cellarclient.v1.resource.ResourceRecord)
+
+    def test_list_parallel_invalid(self):
+        self.assertRaises(exc.InvalidAttribute, self.mgr.list, parallel=2,
+                          marker='r1')
+        self.assertRaises(exc.InvalidAttribute, self.mgr.list, parallel=2,
+                          limit=5)
+        self.assertRaises(exc.InvalidAttribute, self.mgr.list, parallel=2,
+                          sort_key='updated_at')
+        self.assertRaises(exc.InvalidAttribute, self.mgr.list, parallel=2,
+                          detail=True, fields=['type'])
+        self.assertEqual([], self.api.calls)
+
+
+class ResourceRecordTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ResourceRecordTest, self).setUp()
+        self.info = copy.deepcopy(RESOURCE)
+        self.record = cellarclient.v1.resource.ResourceRecord(None,
+                                                              self.info)
+
+    def test_attributes(self):
+        self.assertEqual(RESOURCE['uuid'], self.record.uuid)
+        self.assertEqual({}, self.record.relations)
+        self.assertIsNone(getattr(self.record, 'updated_at', None))
+        self.assertRaises(AttributeError, getattr, self.record, 'manager')
+        self.assertFalse(hasattr(self.record, '__dict__'))
+
+    def test_read_only(self):
+        self.assertRaises(AttributeError, setattr, self.record, 'uuid', 'x')
+        self.assertRaises(AttributeError, delattr, self.record, 'uuid')
+        self.assertEqual(RESOURCE, self.info)
+
+    def test_to_dict(self):
+        data = self.record.to_dict()
+        self.assertEqual(RESOURCE, data)
+        self.assertIsNot(self.info, data)
+        # NOTE: the item is not kept by the record.
+        self.info['uuid'] = 'changed'
+        self.assertEqual(RESOURCE['uuid'], self.record.uuid)
+
+    def test_shared_classes(self):
+        record = cellarclient.v1.resource.ResourceRecord(None, RESOURCE2)
+        self.assertIs(self.record.__class__, record.__class__)
+        partial = cellarclient.v1.resource.ResourceRecord(
+            None, {'uuid': RESOURCE['uuid'], '_private': 1})
+        self.assertIsNot(self.record.__class__, partial.__class__)
+        self.assertIsInstance(partial,
+                              cellarclient.v1.resource.ResourceRecord)
+        self.assertRaises(AttributeError, getattr, partial, 'type')
+        self.assertRaises(AttributeError, getattr, partial, '_private')
+        self.assertEqual(1, partial.to_dict()['_private'])
+
+    def test_pickle(self):
+        record = pickle.loads(pickle.dumps(self.record))
+        self.assertEqual(self.record, record)
+        self.assertEqual(RESOURCE['uuid'], record.uuid)
+
+    def test_equality(self):
+        self.assertEqual(self.record, copy.deepcopy(self.record))
+        self.assertNotEqual(
+            self.record,
+            cellarclient.v1.resource.ResourceRecord(None, RESOURCE2))
+        self.assertNotEqual(
+            self.record,
+            cellarclient.v1.resource.Resource(None, RESOURCE, loaded=True))
+        self.assertNotEqual(self.record, tuple(self.record))
@@ -0,0 +1,109 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import mock
+import testtools
+
+from cellarclient import exc
+from cellarclient.tests.unit import utils
+from cellarclient.v1 import resource
+from cellarclient.v1 import resource_graph
+
+PDU = {'uuid': 'pdu', 'type': 'pdu',
+       'relations': {'1': 'server1', '2': 'server2'}}
+SERVER1 = {'uuid': 'server1', 'type': 'server',
+           'relations': {'uplink': 'switch'}}
+SERVER2 = {'uuid': 'server2', 'type': 'server',
+           'relations': {'uplink': 'switch'}}
+SWITCH = {'uuid': 'switch', 'type': 'switch',
+          'relations': {'power': ['pdu']}}
+
+fake_responses = dict(
+    ('/v1/resources/%s' % res['uuid'], {'GET': ({}, res)})
+    for res in (PDU, SERVER1, SERVER2, SWITCH))
+
+
+class ResourceWalkTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ResourceWalkTest, self).setUp()
+        self.api = utils.FakeAPI(fake_responses)
+        self.mgr = resource.ResourceManager(self.api)
+
+    def _urls(self):
+        return [call[1] for call in self.api.calls]
+
+    def test_walk(self):
+        graph = self.mgr.walk('pdu', depth=1)
+        self.assertEqual(['pdu', 'server1', 'server2'], list(graph.nodes))
+        self.assertEqual([resource_graph.Edge('pdu', '1', 'server1'),
+                          resource_graph.Edge('pdu', '2', 'server2')],
+                         graph.edges)
+        self.assertIsNone(graph.find_cycle())
+
+    def test_walk_depth_zero(self):
+        graph = self.mgr.walk('pdu', depth=0)
+        self.assertEqual(['pdu'], list(graph.nodes))
+        self.assertEqual([], graph.edges)
+
+    def test_walk_memoized_cycle(self):
+        graph = self.mgr.walk('pdu', depth=5, concurrency=2)
+        self.assertEqual(['pdu', 'server1', 'server2', 'switch'],
+                         list(graph.nodes))
+        self.assertEqual(4, len(self.api.calls))
+        self.assertEqual(sorted(fake_responses), sorted(self._urls()))
+        self.assertIn(resource_graph.Edge('switch', 'power', 'pdu'),
+                      graph.edges)
+        cycle = graph.find_cycle()
+        self.assertEqual('pdu', cycle[0])
+        self.assertEqual('pdu', cycle[-1])
+        self.assertIn('switch', cycle)
+
+    def test_walk_types(self):
+        graph = self.mgr.walk('pdu', depth=5, types=['switch'])
+        self.assertEqual(['pdu'], list(graph.nodes))
+        self.assertEqual([], graph.edges)
+        self.assertNotIn('/v1/resources/switch', self._urls())
+
+    def test_walk_errors(self):
+        def fake_request(method, url):
+            if url.endswith('server2'):
+                raise exc.NotFound()
+            return fake_responses[url][method]
+
+        with mock.patch.object(self.api, 'json_request',
+                               side_effect=fake_request):
+            graph = self.mgr.walk('pdu', depth=2)
+        self.assertEqual(['server2'], list(graph.errors))
+        self.assertEqual(['pdu', 'server1', 'switch'], list(graph.nodes))
+        self.assertNotIn('server2', [edge.target for edge in graph.edges])
+
+    def test_to_dict(self):
+        graph = self.mgr.walk('pdu', depth=1)
+        data = json.loads(json.dumps(graph.to_dict()))
+        self.assertEqual('pdu', data['root'])
+        self.assertEqual([PDU, SERVER1, SERVER2], data['nodes'])
+        self.assertEqual({'source': 'pdu', 'relation': '1',
+                          'target': 'server1'}, data['edges'][0])
+        self.assertIsNone(data['cycle'])
+
+    def test_to_dot(self):
+        graph = self.mgr.walk('pdu', depth=1)
+        self.assertEqual('digraph resources {\n'
+                         '    "pdu" [label="pdu\\npdu"];\n'
+                         '    "server1" [label="server\\nserver1"];\n'
+                         '    "server2" [label="server\\nserver2"];\n'
+                         '    "pdu" -> "server1" [label="1"];\n'
+                         '    "pdu" -> "server2" [label="2"];\n'
+                         '}', graph.to_dot())
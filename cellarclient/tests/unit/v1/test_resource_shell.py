@@ -12,21 +12,32 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import collections
+import json
+import os
+
 import mock
+import six
 
 from oslo_utils import uuidutils
 
 from cellarclient.common.apiclient import exceptions
+from cellarclient.common import base
 from cellarclient.common import cliutils
+from cellarclient.common import store
 from cellarclient.common import utils as commonutils
+from cellarclient import exc
 from cellarclient.tests.unit import utils
+import cellarclient.v1.resource
 import cellarclient.v1.resource_shell as r_shell
 
 
 class ResourceShellTest(utils.BaseTestCase):
     def _get_client_mock_args(self, resource=None, marker=None, limit=None,
                               sort_dir=None, sort_key=None, detail=False,
-                              fields=None, json=False):
+                              fields=None, json=False, prefetch=0,
+                              deadline=None, local=False, store=None,
+                              parallel=None, output_format=None):
         args = mock.MagicMock(spec=True)
         args.resource = resource
         args.marker = marker
@@ -36,6 +47,12 @@ class ResourceShellTest(utils.BaseTestCase):
         args.detail = detail
         args.fields = fields
         args.json = json
+        args.prefetch = prefetch
+        args.deadline = deadline
+        args.local = local
+        args.store = store
+        args.parallel = parallel
+        args.output_format = output_format
 
         return args
 
@@ -49,10 +66,18 @@ class ResourceShellTest(utils.BaseTestCase):
         act = actual.keys()
         self.assertEqual(sorted(exp), sorted(act))
 
+    def test_resource_show_output_format(self):
+        with mock.patch.object(cliutils, 'print_dict') as m_print:
+            r_shell._print_resource_show(object(), fields=['uuid'],
+                                         output_format='json-compact')
+        m_print.assert_called_once_with({'uuid': ''}, wrap=72,
+                                        json_flag=False,
+                                        output_format='json-compact')
+
     def test_do_resource_show_space_uuid(self):
         client_mock = mock.MagicMock()
         args = mock.MagicMock()
-        args.resource = '   '
+        args.resource = ['   ']
         self.assertRaises(exceptions.CommandError,
                           r_shell.do_resource_show,
                           client_mock, args)
@@ -60,7 +85,7 @@ class ResourceShellTest(utils.BaseTestCase):
     def test_do_resource_show_empty_uuid(self):
         client_mock = mock.MagicMock()
         args = mock.MagicMock()
-        args.resource = ''
+        args.resource = ['']
         self.assertRaises(exceptions.CommandError,
                           r_shell.do_resource_show,
                           client_mock, args)
@@ -68,36 +93,263 @@ class ResourceShellTest(utils.BaseTestCase):
     def test_do_resource_show_fields(self):
         client_mock = mock.MagicMock()
         args = mock.MagicMock()
-        args.resource = 'resource_uuid'
+        args.resource = ['resource_uuid']
         args.fields = [['uuid', 'description']]
         args.json = False
         r_shell.do_resource_show(client_mock, args)
         client_mock.resource.get.assert_called_once_with(
             'resource_uuid', fields=['uuid', 'description'])
 
+    def test_do_resource_show_multiple(self):
+        client_mock = mock.MagicMock()
+        client_mock.resource.get_many.return_value = collections.OrderedDict(
+            [('resource_uuid1', base.BatchResult('resource_uuid1',
+                                                 object(), None)),
+             ('resource_uuid2', base.BatchResult('resource_uuid2',
+                                                 object(), None))])
+        args = mock.MagicMock()
+        args.resource = ['resource_uuid1', 'resource_uuid2']
+        args.fields = []
+        args.concurrency = 4
+        args.json = False
+        args.output_format = None
+        with mock.patch.object(r_shell, '_print_resource_show') as m_print:
+            r_shell.do_resource_show(client_mock, args)
+        client_mock.resource.get_many.assert_called_once_with(
+            ['resource_uuid1', 'resource_uuid2'], fields=None, concurrency=4)
+        self.assertEqual(2, m_print.call_count)
+
+    def test_do_resource_show_multiple_json(self):
+        client_mock = mock.MagicMock()
+        client_mock.resource.get_many.return_value = collections.OrderedDict(
+            (uuid, base.BatchResult(uuid, {'uuid': uuid, 'type': 'pdu'},
+                                    None))
+            for uuid in ('resource_uuid1', 'resource_uuid2'))
+        args = mock.MagicMock()
+        args.resource = ['resource_uuid1', 'resource_uuid2']
+        args.fields = [['uuid', 'type']]
+        args.concurrency = 1
+        for json_flag, output_format, expect in (
+                (True, None, [{'uuid': 'resource_uuid1', 'type': 'pdu'},
+                              {'uuid': 'resource_uuid2', 'type': 'pdu'}]),
+                (False, 'ndjson', {'uuid': 'resource_uuid2',
+                                   'type': 'pdu'})):
+            args.json = json_flag
+            args.output_format = output_format
+            with mock.patch('sys.stdout', new=six.StringIO()) as m_stdout:
+                r_shell.do_resource_show(client_mock, args)
+            self.assertEqual(expect, json.loads(
+                m_stdout.getvalue().splitlines()[-1] if output_format
+                else m_stdout.getvalue()))
+
+    def test_do_resource_show_multiple_csv(self):
+        client_mock = mock.MagicMock()
+        client_mock.resource.get_many.return_value = collections.OrderedDict(
+            (uuid, base.BatchResult(uuid, {'uuid': uuid, 'type': 'pdu'},
+                                    None))
+            for uuid in ('resource_uuid1', 'resource_uuid2'))
+        args = mock.MagicMock()
+        args.resource = ['resource_uuid1', 'resource_uuid2']
+        args.fields = [['uuid', 'type']]
+        args.concurrency = 1
+        args.json = False
+        args.output_format = 'csv'
+        with mock.patch('sys.stdout', new=six.StringIO()) as m_stdout:
+            r_shell.do_resource_show(client_mock, args)
+        self.assertEqual(['uuid,type', 'resource_uuid1,pdu',
+                          'resource_uuid2,pdu'],
+                         m_stdout.getvalue().splitlines())
+
+    def test_do_resource_show_multiple_failure(self):
+        client_mock = mock.MagicMock()
+        client_mock.resource.get_many.return_value = collections.OrderedDict(
+            [('resource_uuid1', base.BatchResult('resource_uuid1', None,
+                                                 exceptions.NotFound())),
+             ('resource_uuid2', base.BatchResult('resource_uuid2',
+                                                 object(), None))])
+        args = mock.MagicMock()
+        args.resource = ['resource_uuid1', 'resource_uuid2']
+        args.fields = []
+        args.concurrency = 1
+        args.json = False
+        args.output_format = None
+        with mock.patch.object(r_shell, '_print_resource_show') as m_print:
+            self.assertRaises(exceptions.CommandError,
+                              r_shell.do_resource_show, client_mock, args)
+        self.assertEqual(1, m_print.call_count)
+
     def test_do_resource_show_invalid_fields(self):
         client_mock = mock.MagicMock()
         args = mock.MagicMock()
-        args.resource = 'resource_uuid'
+        args.resource = ['resource_uuid']
         args.fields = [['foo', 'bar']]
         args.json = False
         self.assertRaises(exceptions.CommandError,
                           r_shell.do_resource_show,
                           client_mock, args)
 
+    def test_do_resource_graph(self):
+        client_mock = mock.MagicMock()
+        client_mock.resource.walk.return_value.errors = {}
+        args = mock.MagicMock()
+        args.resource = 'resource_uuid'
+        args.depth = 2
+        args.types = ['server']
+        args.concurrency = 4
+        args.dot = True
+        r_shell.do_resource_graph(client_mock, args)
+        client_mock.resource.walk.assert_called_once_with(
+            'resource_uuid', depth=2, types=['server'], concurrency=4)
+        client_mock.resource.walk.return_value.to_dot.assert_called_once_with()
+
+    def test_do_resource_graph_errors(self):
+        client_mock = mock.MagicMock()
+        graph = client_mock.resource.walk.return_value
+        graph.to_dict.return_value = {}
+        graph.errors = {'resource_uuid2': exceptions.NotFound()}
+        args = mock.MagicMock()
+        args.resource = 'resource_uuid'
+        args.depth = 1
+        args.concurrency = 1
+        args.dot = False
+        self.assertRaises(exceptions.CommandError,
+                          r_shell.do_resource_graph, client_mock, args)
+
+    def test_do_resource_graph_negative_depth(self):
+        client_mock = mock.MagicMock()
+        args = mock.MagicMock()
+        args.resource = 'resource_uuid'
+        args.depth = -1
+        self.assertRaises(exceptions.CommandError,
+                          r_shell.do_resource_graph, client_mock, args)
+
+    def test_do_resource_list_local(self):
+        client_mock = mock.MagicMock()
+        args = self._get_client_mock_args(local=True, store=':memory:',
+                                          sort_key='type', limit=10,
+                                          prefetch=2)
+
+        r_shell.do_resource_list(client_mock, args)
+        client_mock.resource.list_local.assert_called_once_with(
+            mock.ANY, sort_key='type', limit=10,
+            fields=['uuid', 'description', 'type'])
+        self.assertFalse(client_mock.resource.list.called)
+
+    def test_do_resource_list_streaming_format(self):
+        client_mock = mock.MagicMock()
+        args = self._get_client_mock_args(output_format='ndjson', limit=100)
+
+        with mock.patch.object(cliutils, 'print_list') as m_print:
+            r_shell.do_resource_list(client_mock, args)
+        client_mock.resource.list.assert_called_once_with(
+            limit=100, detail=False, fields=['uuid', 'description'],
+            stream=True, compact=True)
+        self.assertEqual('ndjson', m_print.call_args[1]['output_format'])
+
+    def test_do_resource_list_parallel(self):
+        client_mock = mock.MagicMock()
+        args = self._get_client_mock_args(parallel=2, prefetch=2,
+                                          store='/nonexistent/mirror')
+
+        r_shell.do_resource_list(client_mock, args)
+        client_mock.resource.list.assert_called_once_with(
+            parallel=2, detail=False, fields=['uuid', 'description'],
+            compact=True)
+
+    def test_do_resource_list_parallel_markers(self):
+        client_mock = mock.MagicMock()
+        with commonutils.tempdir() as dirname:
+            path = os.path.join(dirname, 'mirror.sqlite')
+            with store.ResourceStore(path) as mirror:
+                mirror.upsert({'uuid': 'r%d' % i} for i in range(4))
+            args = self._get_client_mock_args(parallel=2, store=path)
+            r_shell.do_resource_list(client_mock, args)
+        client_mock.resource.list.assert_called_once_with(
+            parallel=2, markers=[('r1', 'r1')], detail=False,
+            fields=['uuid', 'description'], compact=True)
+
+    def test_do_resource_list_parallel_invalid(self):
+        client_mock = mock.MagicMock()
+        args = self._get_client_mock_args(parallel=0)
+        self.assertRaises(exceptions.CommandError,
+                          r_shell.do_resource_list, client_mock, args)
+        args = self._get_client_mock_args(parallel=2, local=True)
+        self.assertRaises(exceptions.CommandError,
+                          r_shell.do_resource_list, client_mock, args)
+        self.assertFalse(client_mock.resource.list.called)
+        client_mock.resource.list.side_effect = exc.InvalidAttribute()
+        args = self._get_client_mock_args(parallel=2, marker='r1')
+        self.assertRaises(exceptions.CommandError,
+                          r_shell.do_resource_list, client_mock, args)
+
+    def _get_query_args(self, **kwargs):
+        args = self._get_client_mock_args(store=':memory:', **kwargs)
+        args.where = ['type=server', 'ram>=2048']
+        args.index = ['ram']
+        return args
+
+    def test_do_resource_query(self):
+        client_mock = mock.MagicMock()
+        args = self._get_query_args(limit=5, sort_dir='desc')
+        with mock.patch.object(r_shell.store.ResourceStore, 'create_index',
+                               autospec=True) as m_index:
+            r_shell.do_resource_query(client_mock, args)
+        m_index.assert_called_once_with(mock.ANY, 'ram')
+        client_mock.resource.list_local.assert_called_once_with(
+            mock.ANY, where=['type=server', 'ram>=2048'], limit=5,
+            sort_dir='desc')
+
+    def test_do_resource_query_invalid(self):
+        client_mock = mock.MagicMock()
+        client_mock.resource.list_local.side_effect = (
+            exc.InvalidAttribute())
+        args = self._get_query_args()
+        self.assertRaises(exceptions.CommandError,
+                          r_shell.do_resource_query, client_mock, args)
+
+    def test_do_resource_local_no_mirror(self):
+        client_mock = mock.MagicMock()
+        with commonutils.tempdir() as dirname:
+            path = os.path.join(dirname, 'mirror.sqlite')
+            args = self._get_client_mock_args(local=True, store=path)
+            error = self.assertRaises(exceptions.CommandError,
+                                      r_shell.do_resource_list, client_mock,
+                                      args)
+            self.assertIn('cellar resource-sync', six.text_type(error))
+            args = self._get_query_args()
+            args.store = path
+            self.assertRaises(exceptions.CommandError,
+                              r_shell.do_resource_query, client_mock, args)
+            self.assertFalse(os.path.exists(path))
+        self.assertFalse(client_mock.resource.list_local.called)
+
+    def test_do_resource_sync(self):
+        client_mock = mock.MagicMock()
+        client_mock.resource.sync.return_value = (
+            cellarclient.v1.resource.SyncResult(False, 2, 1))
+        args = mock.MagicMock()
+        args.store = ':memory:'
+        args.full = False
+        args.reconcile = None
+        r_shell.do_resource_sync(client_mock, args)
+        client_mock.resource.sync.assert_called_once_with(
+            mock.ANY, full=False, reconcile=None)
+
     def test_do_resource_list(self):
         client_mock = mock.MagicMock()
         args = self._get_client_mock_args()
 
         r_shell.do_resource_list(client_mock, args)
-        client_mock.resource.list.assert_called_once_with(detail=False)
+        client_mock.resource.list.assert_called_once_with(
+            detail=False, fields=['uuid', 'description'], compact=True)
 
     def test_do_resource_list_detail(self):
         client_mock = mock.MagicMock()
         args = self._get_client_mock_args(detail=True)
 
         r_shell.do_resource_list(client_mock, args)
-        client_mock.resource.list.assert_called_once_with(detail=True)
+        client_mock.resource.list.assert_called_once_with(
+            detail=True, compact=True)
 
     def test_do_resource_list_sort_key(self):
         client_mock = mock.MagicMock()
@@ -105,8 +357,18 @@ class ResourceShellTest(utils.BaseTestCase):
                                           detail=False)
 
         r_shell.do_resource_list(client_mock, args)
-        client_mock.resource.list.assert_called_once_with(sort_key='created_at',
-                                                         detail=False)
+        client_mock.resource.list.assert_called_once_with(
+            sort_key='created_at', detail=False,
+            fields=['uuid', 'description', 'created_at'], compact=True)
+
+    def test_do_resource_list_sort_key_shown(self):
+        client_mock = mock.MagicMock()
+        args = self._get_client_mock_args(sort_key='uuid')
+
+        r_shell.do_resource_list(client_mock, args)
+        client_mock.resource.list.assert_called_once_with(
+            sort_key='uuid', detail=False, fields=['uuid', 'description'],
+            compact=True)
 
     def test_do_resource_list_wrong_sort_key(self):
         client_mock = mock.MagicMock()
@@ -124,7 +386,8 @@ class ResourceShellTest(utils.BaseTestCase):
 
         r_shell.do_resource_list(client_mock, args)
         client_mock.resource.list.assert_called_once_with(sort_key='created_at',
-                                                         detail=True)
+                                                         detail=True,
+                                                         compact=True)
 
     def test_do_resource_list_detail_wrong_sort_key(self):
         client_mock = mock.MagicMock()
@@ -142,8 +405,9 @@ class ResourceShellTest(utils.BaseTestCase):
                                           detail=False)
 
         r_shell.do_resource_list(client_mock, args)
-        client_mock.resource.list.assert_called_once_with(sort_dir='desc',
-                                                         detail=False)
+        client_mock.resource.list.assert_called_once_with(
+            sort_dir='desc', detail=False, fields=['uuid', 'description'],
+            compact=True)
 
     def test_do_resource_list_detail_sort_dir(self):
         client_mock = mock.MagicMock()
@@ -152,7 +416,8 @@ class ResourceShellTest(utils.BaseTestCase):
 
         r_shell.do_resource_list(client_mock, args)
         client_mock.resource.list.assert_called_once_with(sort_dir='asc',
-                                                         detail=True)
+                                                         detail=True,
+                                                         compact=True)
 
     def test_do_resource_list_wrong_sort_dir(self):
         client_mock = mock.MagicMock()
@@ -168,7 +433,7 @@ class ResourceShellTest(utils.BaseTestCase):
         args = self._get_client_mock_args(fields=[['uuid', 'description']])
         r_shell.do_resource_list(client_mock, args)
         client_mock.resource.list.assert_called_once_with(
-            fields=['uuid', 'description'], detail=False)
+            fields=['uuid', 'description'], detail=False, compact=True)
 
     def test_do_resource_list_invalid_fields(self):
         client_mock = mock.MagicMock()
@@ -177,9 +442,42 @@ class ResourceShellTest(utils.BaseTestCase):
                           r_shell.do_resource_list,
                           client_mock, args)
 
+    def test_do_resource_list_prefetch(self):
+        client_mock = mock.MagicMock()
+        args = self._get_client_mock_args(limit=0, prefetch=3)
+        r_shell.do_resource_list(client_mock, args)
+        client_mock.resource.list.assert_called_once_with(
+            limit=0, prefetch=3, detail=False,
+            fields=['uuid', 'description'], compact=True)
+
+    def test_do_resource_list_wrong_prefetch(self):
+        client_mock = mock.MagicMock()
+        args = self._get_client_mock_args(prefetch=-1)
+        self.assertRaises(exceptions.CommandError,
+                          r_shell.do_resource_list,
+                          client_mock, args)
+        self.assertFalse(client_mock.resource.list.called)
+
+    def test_do_resource_list_deadline(self):
+        client_mock = mock.MagicMock()
+        args = self._get_client_mock_args(limit=0, deadline=30)
+        r_shell.do_resource_list(client_mock, args)
+        client_mock.resource.list.assert_called_once_with(
+            limit=0, deadline=30, detail=False,
+            fields=['uuid', 'description'], compact=True)
+
+    def test_do_resource_list_wrong_deadline(self):
+        client_mock = mock.MagicMock()
+        args = self._get_client_mock_args(deadline=0)
+        self.assertRaises(exceptions.CommandError,
+                          r_shell.do_resource_list,
+                          client_mock, args)
+        self.assertFalse(client_mock.resource.list.called)
+
     def test_do_resource_create(self):
         client_mock = mock.MagicMock()
         args = mock.MagicMock()
+        args.from_file = None
         args.json = False
         r_shell.do_resource_create(client_mock, args)
         client_mock.resource.create.assert_called_once_with()
@@ -187,6 +485,7 @@ class ResourceShellTest(utils.BaseTestCase):
     def test_do_resource_create_with_uuid(self):
         client_mock = mock.MagicMock()
         args = mock.MagicMock()
+        args.from_file = None
         args.uuid = uuidutils.generate_uuid()
         args.json = False
 
@@ -196,6 +495,7 @@ class ResourceShellTest(utils.BaseTestCase):
     def test_do_resource_create_valid_type(self):
         client_mock = mock.MagicMock()
         args = mock.MagicMock()
+        args.from_file = None
         args.type = 'switch'
         args.description = 'desc'
         args.json = False
@@ -206,6 +506,7 @@ class ResourceShellTest(utils.BaseTestCase):
     def test_do_resource_create_valid_field(self):
         client_mock = mock.MagicMock()
         args = mock.MagicMock()
+        args.from_file = None
         args.type = 'server'
         args.attributes = ["key1=val1", "key2=val2"]
         args.description = 'desc'
@@ -220,6 +521,7 @@ class ResourceShellTest(utils.BaseTestCase):
     def test_do_resource_create_wrong_attributes_field(self):
         client_mock = mock.MagicMock()
         args = mock.MagicMock()
+        args.from_file = None
         args.type = 'pdu'
         args.attributes = ["foo"]
         args.description = 'desc'
@@ -227,20 +529,91 @@ class ResourceShellTest(utils.BaseTestCase):
         self.assertRaises(exceptions.CommandError,
                           r_shell.do_resource_create, client_mock, args)
 
+    def test_do_resource_create_from_file(self):
+        client_mock = mock.MagicMock()
+        client_mock.resource.create_many.return_value = [
+            base.BatchResult(0, mock.Mock(uuid='uuid0'), None)]
+        args = mock.MagicMock()
+        args.from_file = 'resources.json'
+        args.concurrency = 8
+        items = iter([{'type': 'server'}])
+        with mock.patch.object(commonutils, 'iter_items_from_file',
+                               return_value=items) as mock_read:
+            r_shell.do_resource_create(client_mock, args)
+        mock_read.assert_called_once_with('resources.json')
+        client_mock.resource.create_many.assert_called_once_with(
+            items, concurrency=8)
+
+    def test_do_resource_create_from_file_failure(self):
+        client_mock = mock.MagicMock()
+        client_mock.resource.create_many.return_value = [
+            base.BatchResult(0, mock.Mock(uuid='uuid0'), None),
+            base.BatchResult(1, None, exceptions.Conflict())]
+        args = mock.MagicMock()
+        args.from_file = 'resources.json'
+        args.concurrency = 1
+        with mock.patch.object(commonutils, 'iter_items_from_file'):
+            e = self.assertRaises(exceptions.CommandError,
+                                  r_shell.do_resource_create,
+                                  client_mock, args)
+        self.assertIn('resource 1', str(e))
+
+    def test_do_resource_create_from_file_with_fields(self):
+        client_mock = mock.MagicMock()
+        args = mock.MagicMock()
+        args.from_file = 'resources.json'
+        args.type = 'server'
+        self.assertRaises(exceptions.CommandError,
+                          r_shell.do_resource_create, client_mock, args)
+        self.assertFalse(client_mock.resource.create_many.called)
+
     def test_do_resource_delete(self):
         client_mock = mock.MagicMock()
+        client_mock.resource.delete_many.return_value = [
+            base.BatchResult('resource_uuid', None, None)]
         args = mock.MagicMock()
         args.resource = ['resource_uuid']
+        args.concurrency = 1
         r_shell.do_resource_delete(client_mock, args)
-        client_mock.resource.delete.assert_called_once_with('resource_uuid')
+        client_mock.resource.delete_many.assert_called_once_with(
+            ['resource_uuid'], concurrency=1)
 
     def test_do_resource_delete_multiple(self):
         client_mock = mock.MagicMock()
+        client_mock.resource.delete_many.return_value = [
+            base.BatchResult('resource_uuid1', None, None),
+            base.BatchResult('resource_uuid2', None, None)]
         args = mock.MagicMock()
         args.resource = ['resource_uuid1', 'resource_uuid2']
+        args.concurrency = 4
         r_shell.do_resource_delete(client_mock, args)
-        client_mock.resource.delete.assert_has_calls([
-            mock.call('resource_uuid1'), mock.call('resource_uuid2')])
+        client_mock.resource.delete_many.assert_called_once_with(
+            ['resource_uuid1', 'resource_uuid2'], concurrency=4)
+
+    def test_do_resource_delete_failure(self):
+        client_mock = mock.MagicMock()
+        client_mock.resource.delete_many.return_value = [
+            base.BatchResult('resource_uuid1', None,
+                             exceptions.NotFound()),
+            base.BatchResult('resource_uuid2', None, None)]
+        args = mock.MagicMock()
+        args.resource = ['resource_uuid1', 'resource_uuid2']
+        args.concurrency = 1
+        e = self.assertRaises(exceptions.CommandError,
+                              r_shell.do_resource_delete,
+                              client_mock, args)
+        self.assertIn('resource_uuid1', str(e))
+        self.assertNotIn('resource_uuid2', str(e))
+
+    def test_do_resource_delete_wrong_concurrency(self):
+        client_mock = mock.MagicMock()
+        args = mock.MagicMock()
+        args.resource = ['resource_uuid']
+        args.concurrency = 0
+        self.assertRaises(exceptions.CommandError,
+                          r_shell.do_resource_delete,
+                          client_mock, args)
+        self.assertFalse(client_mock.resource.delete_many.called)
 
     def test_do_resource_update(self):
         client_mock = mock.MagicMock()
@@ -0,0 +1,65 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from cellarclient.common import async_http
+from cellarclient.common import filecache
+from cellarclient.common import http
+from cellarclient.common.http import DEFAULT_VER
+from cellarclient.common.i18n import _
+from cellarclient import exc
+from cellarclient.v1 import async_resource
+
+
+class AsyncClient(object):
+    """asyncio client for the Cellar v1 API.
+
+    Accepts the same arguments as :class:`cellarclient.v1.client.Client`.
+    Its connections are released with close(), or by using the client as an
+    async context manager::
+
+        async with AsyncClient('http://cellar:7777/') as cc:
+            resources = await cc.resource.list()
+    """
+
+    def __init__(self, endpoint=None, **kwargs):
+        """Initialize a new asyncio client for the Cellar v1 API."""
+        if not endpoint:
+            raise exc.EndpointException(
+                _("Must provide 'endpoint' if os_cellar_api_version "
+                  "isn't specified"))
+
+        cache = kwargs.pop('cache', None)
+
+        # If the user didn't specify a version, use a cached version if
+        # one has been stored
+        host, netport = http.get_server(endpoint)
+        saved_version = filecache.retrieve_data(host=host, port=netport)
+        if saved_version:
+            kwargs['api_version_select_state'] = "cached"
+            kwargs['os_cellar_api_version'] = saved_version
+        else:
+            kwargs['api_version_select_state'] = "default"
+            kwargs['os_cellar_api_version'] = DEFAULT_VER
+
+        self.http_client = async_http.AsyncHTTPClient(endpoint, **kwargs)
+
+        self.resource = async_resource.AsyncResourceManager(self.http_client,
+                                                            cache=cache)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.http_client.close()
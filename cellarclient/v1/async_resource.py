@@ -0,0 +1,119 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+
+from cellarclient.common import async_base
+from cellarclient.v1 import resource
+from cellarclient.v1 import resource_graph
+
+
+class AsyncResourceManager(resource.ResourceManagerMixin,
+                           async_base.AsyncCreateManager):
+    """asyncio variant of :class:`cellarclient.v1.resource.ResourceManager`.
+
+    Every method is a coroutine taking the same arguments as its
+    ResourceManager counterpart, except iter() which is an async generator.
+    Local mirrors are synchronized by ResourceManager.sync(), there is no
+    asyncio variant.
+    """
+
+    async def list(self, marker=None, limit=None, sort_key=None,
+                   sort_dir=None, detail=False, fields=None):
+        """Retrieve a list of resources.
+
+        See :meth:`cellarclient.v1.resource.ResourceManager.list`.
+        """
+        if limit is not None:
+            limit = int(limit)
+
+        path = self._list_path(marker, limit, sort_key, sort_dir, detail,
+                               fields)
+
+        if limit is None:
+            return await self._list(self._path(path), "resources")
+        else:
+            return await self._list_pagination(self._path(path), "resources",
+                                               limit=limit)
+
+    async def iter(self, marker=None, limit=None, sort_key=None,
+                   sort_dir=None, detail=False, fields=None):
+        """Iterate over resources, fetching pages as they are consumed.
+
+        Accepts the same arguments as :meth:`list`.
+        """
+        if limit is not None:
+            limit = int(limit)
+
+        path = self._list_path(marker, limit, sort_key, sort_dir, detail,
+                               fields)
+
+        if limit is None:
+            for res in await self._list(self._path(path), "resources"):
+                yield res
+        else:
+            async for res in self._list_pagination_iter(self._path(path),
+                                                        "resources",
+                                                        limit=limit):
+                yield res
+
+    async def get(self, resource_id, fields=None):
+        return await self._get(resource_id=resource_id, fields=fields)
+
+    async def get_many(self, resource_ids, fields=None, concurrency=1):
+        """Retrieve several resources.
+
+        See :meth:`cellarclient.v1.resource.ResourceManager.get_many`.
+        """
+        resource_ids = list(collections.OrderedDict.fromkeys(resource_ids))
+        results = await self._batch(
+            lambda resource_id: self.get(resource_id, fields=fields),
+            resource_ids, concurrency=concurrency)
+        return collections.OrderedDict((r.key, r) for r in results)
+
+    async def walk(self, root, depth=1, types=None, concurrency=1):
+        """Retrieve the resources reached from a resource by its relations.
+
+        See :meth:`cellarclient.v1.resource.ResourceManager.walk`.
+        """
+        graph = resource_graph.ResourceGraph(root)
+        seen = set([root])
+        frontier = [root]
+        level = 0
+        while frontier:
+            results = await self.get_many(frontier, concurrency=concurrency)
+            frontier = self._walk_level(graph, results, level < depth, types,
+                                        seen)
+            level += 1
+        return self._walk_done(graph)
+
+    async def list_local(self, store, **kwargs):
+        """Retrieve a list of resources from a local mirror.
+
+        No request is sent, see
+        :meth:`cellarclient.v1.resource.ResourceManagerMixin.list_local`.
+        """
+        return super(AsyncResourceManager, self).list_local(store, **kwargs)
+
+    async def delete(self, resource_id):
+        return await self._delete(resource_id=resource_id)
+
+    async def delete_many(self, resource_ids, concurrency=1):
+        """Delete several resources.
+
+        See :meth:`cellarclient.v1.resource.ResourceManager.delete_many`.
+        """
+        return await self._batch(self.delete, resource_ids,
+                                 concurrency=concurrency)
+
+    async def update(self, resource_id, patch):
+        return await self._update(resource_id=resource_id, patch=patch)
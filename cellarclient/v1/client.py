@@ -25,8 +25,54 @@ class Client(object):
 
     :param string endpoint: A user-supplied endpoint URL for the cellar
                             service.
+    :param string retry_policy: How long to wait between retries: 'fixed'
+                                (the default), 'exponential' or 'jitter'
+                                (exponential with a random part).
+                                (optional)
+    :param integer retry_max_time: Maximum time in seconds spent retrying a
+                                   request. (optional)
+    :param integer retry_after_max: Maximum time in seconds waited when the
+                                    server sends a Retry-After header.
+                                    (optional)
+    :param float retry_budget: Maximum fraction of the requests that may be
+                               retried, between 0 and 1. (optional)
     :param integer timeout: Allows customization of the timeout for client
                             http requests. (optional)
+    :param integer connect_timeout: Timeout for establishing connections,
+                                    defaults to 'timeout'. (optional)
+    :param integer pool_connections: Number of per-host connection pools to
+                                     keep. (optional)
+    :param integer pool_maxsize: Maximum number of connections kept per
+                                 host. (optional)
+    :param bool pool_block: Wait for a free connection instead of opening a
+                            throwaway one when the pool of a host is
+                            exhausted. (optional)
+    :param integer keepalive: Idle time in seconds before TCP keep-alive
+                              probes are sent on pooled connections.
+                              (optional)
+    :param integer log_body_max: Maximum number of characters of request
+                                 and response bodies written to the debug
+                                 log. (optional)
+    :param string json_backend: Library decoding the JSON responses:
+                                'orjson', 'ujson' or 'json'. Defaults to
+                                the fastest one installed. (optional)
+    :param integer chunk_size: Number of bytes read at a time from the
+                               responses. (optional)
+    :param integer compress_min_size: Minimum size in bytes of the request
+                                      bodies sent gzip compressed. Bodies
+                                      are not compressed by default.
+                                      (optional)
+    :param integer http_cache_size: Number of GET responses kept in memory
+                                    and revalidated with ETag and
+                                    Last-Modified instead of being fetched
+                                    again. Disabled by default. (optional)
+    :param string http_cache_dir: Directory of an on-disk tier of the
+                                  response cache. (optional)
+    :param cache: Cache of the objects returned by get(), refreshed by
+                  create(), update() and delete(): True for an in-memory
+                  :class:`cellarclient.common.objcache.ObjectCache`, a
+                  dogpile.cache region to share it, or a cache object.
+                  Disabled by default. (optional)
     """
 
     def __init__(self, endpoint=None, *args, **kwargs):
@@ -36,6 +82,8 @@ class Client(object):
                 _("Must provide 'endpoint' if os_cellar_api_version "
                   "isn't specified"))
 
+        cache = kwargs.pop('cache', None)
+
         # If the user didn't specify a version, use a cached version if
         # one has been stored
         host, netport = http.get_server(endpoint)
@@ -50,4 +98,5 @@ class Client(object):
         self.http_client = http._construct_http_client(
             endpoint, *args, **kwargs)
 
-        self.resource = resource.ResourceManager(self.http_client)
+        self.resource = resource.ResourceManager(self.http_client,
+                                                 cache=cache)
@@ -14,10 +14,27 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import time
+
 from cellarclient.common import base
 from cellarclient.common.i18n import _
 from cellarclient.common import utils
 from cellarclient import exc
+from cellarclient.v1 import resource_graph
+
+DEFAULT_RECONCILE_INTERVAL = 3600
+# NOTE: fields which are never null, so they can split a parallel listing.
+PARALLEL_SORT_KEYS = ('uuid', 'type', 'created_at')
+
+SyncResult = collections.namedtuple('SyncResult',
+                                    ['full', 'saved', 'deleted'])
+"""Outcome of a synchronization of a mirror.
+
+'full' tells whether all the resources were fetched, 'saved' holds the
+number of resources saved and 'deleted' the number of resources removed
+from the mirror.
+"""
 
 
 class Resource(base.Resource):
@@ -25,13 +42,103 @@ class Resource(base.Resource):
         return "<Resource %s>" % self._info
 
 
-class ResourceManager(base.CreateManager):
+class ResourceRecord(base.Record):
+    """Read-only resource returned by :meth:`ResourceManager.list`."""
+
+    __slots__ = ()
+
+
+class ResourceManagerMixin(object):
+    """Parts of the resource managers which send no request.
+
+    Shared by :class:`ResourceManager` and
+    :class:`cellarclient.v1.async_resource.AsyncResourceManager`.
+    """
+
     resource_class = Resource
     _resource_name = 'resources'
     _creation_attributes = ['description', 'type', 'relations', 'attributes', 'uuid']
 
+    def _list_path(self, marker, limit, sort_key, sort_dir, detail, fields):
+        if detail and fields:
+            raise exc.InvalidAttribute(_("Can't fetch a subset of fields "
+                                         "with 'detail' set"))
+
+        filters = utils.common_filters(marker, limit, sort_key, sort_dir,
+                                       fields)
+
+        path = ''
+        if detail:
+            path += 'detail'
+        if filters:
+            path += '?' + '&'.join(filters)
+        return path
+
+    def list_local(self, store, marker=None, limit=None, sort_key=None,
+                   sort_dir=None, fields=None, where=None):
+        """Retrieve a list of resources from a local mirror.
+
+        Takes the same arguments as :meth:`ResourceManager.list`, without
+        sending any request. Resources are sorted by UUID by default.
+
+        :param store: A :class:`cellarclient.common.store.ResourceStore`
+                      kept up to date by :meth:`ResourceManager.sync`.
+        :param limit: Optional, the maximum number of resources to return.
+                      None or 0 returns all of them.
+        :param where: Optional, a list of conditions the resources must
+                      all match, e.g. ['type=server', 'ram>=2048']. See
+                      :func:`cellarclient.common.store.parse_condition`.
+        :returns: A list of resources.
+        :raises exc.InvalidAttribute: If a condition is malformed.
+        """
+        resources = store.list(sort_key=sort_key, sort_dir=sort_dir,
+                               where=where, limit=limit, marker=marker)
+        if fields is not None:
+            resources = [dict((f, res[f]) for f in fields if f in res)
+                         for res in resources]
+        return [self.resource_class(self, res, loaded=True)
+                for res in resources]
+
+    @staticmethod
+    def _walk_level(graph, results, follow, types, seen):
+        """Add the resources of a level of a walk to its graph.
+
+        :param follow: whether to follow the relations of the resources.
+        :returns: the UUIDs of the resources of the next level.
+        """
+        frontier = []
+        for uuid, result in results.items():
+            if result.error is not None:
+                graph.errors[uuid] = result.error
+                continue
+            resource = result.result
+            if resource is None:
+                continue
+            if (types and uuid != graph.root and
+                    getattr(resource, 'type', None) not in types):
+                continue
+            graph.nodes[uuid] = resource
+            for name, target in resource_graph.get_relations(resource):
+                graph.edges.append(resource_graph.Edge(uuid, name, target))
+                if follow and target not in seen:
+                    seen.add(target)
+                    frontier.append(target)
+        return frontier
+
+    @staticmethod
+    def _walk_done(graph):
+        # NOTE: relations of the last level and to resources which were
+        # filtered out or failed point outside of the graph.
+        graph.edges = [edge for edge in graph.edges
+                       if edge.target in graph.nodes]
+        return graph
+
+
+class ResourceManager(ResourceManagerMixin, base.CreateManager):
     def list(self, marker=None, limit=None, sort_key=None,
-             sort_dir=None, detail=False, fields=None):
+             sort_dir=None, detail=False, fields=None, stream=False,
+             prefetch=0, deadline=None, incremental=False, parallel=None,
+             markers=None, compact=False):
         """Retrieve a list of resources.
 
         :param marker: Optional, the UUID of a resource, eg the last
@@ -58,36 +165,265 @@ class ResourceManager(base.CreateManager):
                        of the resource to be returned. Can not be used
                        when 'detail' is set.
 
-        :returns: A list of resources.
+        :param stream: Optional, boolean whether to return a generator
+                       yielding the resources page by page instead of
+                       a list.
+
+        :param prefetch: Optional, number of pages to fetch ahead from a
+                         background thread while the current page is
+                         being processed. Only used when 'limit' is set.
+                         0 (the default) disables read-ahead.
+
+        :param deadline: Optional, maximum time in seconds allowed for
+                         fetching all the pages when 'limit' is set.
+                         Raises exc.Timeout when it expires.
+
+        :param incremental: Optional, boolean whether to decode the
+                            resources of a page while it is received,
+                            so that memory is bounded by one resource
+                            rather than one page when combined with
+                            'stream'. Only used when 'limit' is set and
+                            can not be combined with 'prefetch'.
+
+        :param parallel: Optional, number of ranges of the list fetched
+                         concurrently. Retrieves the entire list, sorted
+                         by UUID unless 'sort_key' is 'type' or
+                         'created_at'. Can not be used with 'marker' or a
+                         positive 'limit'.
+
+        :param markers: Optional, a list of (UUID, value of 'sort_key') of
+                        existing resources splitting the list in ranges,
+                        such as the markers of a local mirror, see
+                        :class:`cellarclient.common.store.ResourceStore`.
+                        Without markers, a parallel listing runs from both
+                        ends of the list.
+
+        :param compact: Optional, return read-only :class:`ResourceRecord`
+                        objects, which take less memory and time to build
+                        than :class:`Resource` objects.
+
+        :returns: A list of resources, or a generator of resources if
+                  'stream' is set.
 
         """
         if limit is not None:
             limit = int(limit)
+        obj_class = ResourceRecord if compact else None
 
-        if detail and fields:
-            raise exc.InvalidAttribute(_("Can't fetch a subset of fields "
-                                         "with 'detail' set"))
-
-        filters = utils.common_filters(marker, limit, sort_key, sort_dir,
-                                       fields)
+        if parallel is not None and int(parallel) > 1:
+            resources = self._list_in_parallel(
+                marker, limit, sort_key, sort_dir, detail, fields,
+                int(parallel), markers, deadline, obj_class)
+            return iter(resources) if stream else resources
 
-        path = ''
-        if detail:
-            path += 'detail'
-        if filters:
-            path += '?' + '&'.join(filters)
+        path = self._list_path(marker, limit, sort_key, sort_dir, detail,
+                               fields)
 
         if limit is None:
-            return self._list(self._path(path), "resources")
+            resources = self._list(self._path(path), "resources",
+                                   obj_class=obj_class)
+            return iter(resources) if stream else resources
+        elif stream:
+            return self._list_pagination_iter(self._path(path), "resources",
+                                              obj_class=obj_class,
+                                              limit=limit, prefetch=prefetch,
+                                              deadline=deadline,
+                                              incremental=incremental)
         else:
             return self._list_pagination(self._path(path), "resources",
-                                         limit=limit)
+                                         obj_class=obj_class,
+                                         limit=limit, prefetch=prefetch,
+                                         deadline=deadline,
+                                         incremental=incremental)
+
+    def _list_in_parallel(self, marker, limit, sort_key, sort_dir, detail,
+                          fields, parallel, markers, deadline, obj_class):
+        if marker is not None or limit:
+            raise exc.InvalidAttribute(_("A parallel listing retrieves all "
+                                         "the resources, it can not be "
+                                         "used with a marker or a limit"))
+        sort_key = sort_key or 'uuid'
+        if sort_key not in PARALLEL_SORT_KEYS:
+            raise exc.InvalidAttribute(
+                _("A parallel listing can not be sorted by %(key)s, "
+                  "expected one of %(keys)s") %
+                {'key': sort_key, 'keys': ', '.join(PARALLEL_SORT_KEYS)})
+        if fields is not None:
+            # NOTE: the ranges are split by UUID and sort key.
+            fields = list(fields) + [f for f in ('uuid', sort_key)
+                                     if f not in fields]
+        # NOTE: raises for invalid options before any thread is started.
+        self._list_path(None, 0, sort_key, sort_dir, detail, fields)
+
+        def _get_url(start, direction):
+            return self._path(self._list_path(start, 0, sort_key, direction,
+                                              detail, fields))
+
+        return self._list_parallel(_get_url, "resources", sort_key,
+                                   sort_dir=sort_dir, markers=markers,
+                                   parallel=parallel, deadline=deadline,
+                                   obj_class=obj_class)
+
+    def iter(self, **kwargs):
+        """Iterate over resources, fetching pages as they are consumed.
+
+        Accepts the same arguments as :meth:`list`.
+
+        :returns: A generator of resources.
+        """
+        return self.list(stream=True, **kwargs)
+
+    def sync(self, store, full=False, reconcile=None,
+             reconcile_interval=DEFAULT_RECONCILE_INTERVAL):
+        """Update a local mirror of the resources.
+
+        The first synchronization, or a full one, fetches all the resources.
+        The next ones only fetch the resources created or updated since the
+        previous one, newest first, and stop at the first page reaching
+        older ones.
+
+        Deleted resources are not listed by the API, they are found by
+        comparing the UUIDs of the mirror with those of the API, which are
+        all fetched. This is done every 'reconcile_interval' seconds.
+
+        :param store: A :class:`cellarclient.common.store.ResourceStore`.
+        :param full: Optional, boolean whether to fetch all the resources
+                     again.
+        :param reconcile: Optional, True to look for deleted resources now,
+                          False to skip it. By default, it is done when
+                          'reconcile_interval' has elapsed since the last
+                          time.
+        :param reconcile_interval: Optional, time in seconds between two
+                                   searches for deleted resources.
+        :returns: A :class:`SyncResult`.
+        """
+        watermark = store.get_meta('watermark')
+        # NOTE: the next watermark is taken before listing, a resource
+        # updated while the listing runs is then fetched again next time.
+        marks = self._get_watermarks()
+        if watermark is not None:
+            marks.append(watermark)
+
+        def _record(resources, key=None):
+            for res in resources:
+                info = res.to_dict()
+                if key is not None:
+                    if info.get(key) is None:
+                        # NOTE: the position of null timestamps in the
+                        # order depends on the database of the API.
+                        continue
+                    if info[key] < watermark:
+                        return
+                yield info
+
+        now = time.time()
+        if full or watermark is None:
+            saved = store.replace(_record(
+                self.list(detail=True, limit=0, stream=True)))
+            deleted = 0
+            store.set_meta('reconciled_at', now)
+        else:
+            saved = 0
+            for key in ('updated_at', 'created_at'):
+                saved += store.upsert(_record(
+                    self.list(detail=True, limit=0, sort_key=key,
+                              sort_dir='desc', stream=True), key))
+            if reconcile is None:
+                reconciled_at = float(store.get_meta('reconciled_at', 0))
+                reconcile = now - reconciled_at >= reconcile_interval
+            deleted = 0
+            if reconcile:
+                uuids = set(res.uuid for res in
+                            self.list(fields=['uuid'], limit=0, stream=True))
+                deleted = store.delete(store.uuids() - uuids)
+                store.set_meta('reconciled_at', now)
+        if marks:
+            store.set_meta('watermark', max(marks))
+        return SyncResult(full or watermark is None, saved, deleted)
+
+    def _get_watermarks(self):
+        """Return the newest update and creation times of the resources.
+
+        Null timestamps may be sorted first by the API, a missing update
+        time only makes the next synchronization fetch more resources.
+        """
+        marks = []
+        for key in ('updated_at', 'created_at'):
+            for res in self.list(limit=1, sort_key=key, sort_dir='desc',
+                                 fields=[key]):
+                value = getattr(res, key, None)
+                if value is not None:
+                    marks.append(value)
+        return marks
 
     def get(self, resource_id, fields=None):
         return self._get(resource_id=resource_id, fields=fields)
 
+    def get_many(self, resource_ids, fields=None, concurrency=1):
+        """Retrieve several resources.
+
+        :param resource_ids: An iterable of resource UUIDs. Duplicates are
+                             fetched once.
+        :param fields: Optional, a list with a specified set of fields
+                       of the resources to be returned.
+        :param concurrency: Optional, maximum number of requests running
+                            at once. Defaults to 1.
+        :returns: An ordered dictionary mapping each resource UUID to a
+                  :class:`cellarclient.common.base.BatchResult`, in the
+                  order of 'resource_ids'. A failed lookup is reported in
+                  the 'error' field of its result and does not abort the
+                  others.
+        """
+        resource_ids = list(collections.OrderedDict.fromkeys(resource_ids))
+        results = self._batch(
+            lambda resource_id: self.get(resource_id, fields=fields),
+            resource_ids, concurrency=concurrency)
+        return collections.OrderedDict((r.key, r) for r in results)
+
+    def walk(self, root, depth=1, types=None, concurrency=1):
+        """Retrieve the resources reached from a resource by its relations.
+
+        The graph is traversed breadth first: all the resources at the same
+        distance from 'root' are fetched in one batch of concurrent
+        requests. Every resource is fetched once, even if several relations
+        or a cycle lead to it.
+
+        :param root: The UUID of the first resource.
+        :param depth: Optional, maximum number of relations followed from
+                      'root'. Defaults to 1.
+        :param types: Optional, a list of resource types. Resources of
+                      other types are left out of the graph and their
+                      relations are not followed. 'root' is always kept.
+        :param concurrency: Optional, maximum number of requests running
+                            at once. Defaults to 1.
+        :returns: A :class:`cellarclient.v1.resource_graph.ResourceGraph`.
+        """
+        graph = resource_graph.ResourceGraph(root)
+        seen = set([root])
+        frontier = [root]
+        level = 0
+        while frontier:
+            results = self.get_many(frontier, concurrency=concurrency)
+            frontier = self._walk_level(graph, results, level < depth, types,
+                                        seen)
+            level += 1
+        return self._walk_done(graph)
+
     def delete(self, resource_id):
         return self._delete(resource_id=resource_id)
 
+    def delete_many(self, resource_ids, concurrency=1):
+        """Delete several resources.
+
+        :param resource_ids: An iterable of resource UUIDs.
+        :param concurrency: Optional, maximum number of deletions running
+                            at once. Defaults to 1.
+        :returns: A list of :class:`cellarclient.common.base.BatchResult`
+                  keyed by resource UUID, in the order of 'resource_ids'.
+                  A failed deletion is reported in the 'error' field of its
+                  result and does not abort the others.
+        """
+        return self._batch(self.delete, resource_ids, concurrency=concurrency)
+
     def update(self, resource_id, patch):
         return self._update(resource_id=resource_id, patch=patch)
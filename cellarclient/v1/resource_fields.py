@@ -80,6 +80,18 @@ class Resource(object):
     def sort_labels(self):
         return self._sort_labels
 
+    def get_projection(self, sort_key=None):
+        """Return the fields to fetch from the server to show these ones.
+
+        The UUID, used for pagination, and 'sort_key' are added when they
+        are not shown.
+        """
+        projection = list(self._fields)
+        for field in ('uuid', sort_key):
+            if field is not None and field not in projection:
+                projection.append(field)
+        return projection
+
 
 # Resource
 DETAILED_RESOURCE = Resource(
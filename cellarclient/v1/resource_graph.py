@@ -0,0 +1,116 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Subgraphs of resources linked by their relations.
+"""
+
+import collections
+
+import six
+
+Edge = collections.namedtuple('Edge', ['source', 'relation', 'target'])
+"""A relation named 'relation' from the resource 'source' to 'target'."""
+
+
+def get_relations(resource):
+    """Return the (name, UUID) pairs of the relations of a resource.
+
+    A relation holds the UUID of a resource or a list of them.
+    """
+    relations = getattr(resource, 'relations', None) or {}
+    pairs = []
+    for name, targets in sorted(relations.items()):
+        if isinstance(targets, six.string_types):
+            targets = [targets]
+        elif not isinstance(targets, (list, tuple)):
+            continue
+        pairs.extend((name, target) for target in targets
+                     if isinstance(target, six.string_types))
+    return pairs
+
+
+def _escape(value):
+    return six.text_type(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+class ResourceGraph(object):
+    """Resources reached from 'root' by following their relations.
+
+    'nodes' maps the UUIDs of the resources to the resources, in the order
+    they were reached, 'edges' holds the :class:`Edge` between them and
+    'errors' maps the UUIDs of the resources which could not be fetched to
+    the exception raised.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.nodes = collections.OrderedDict()
+        self.edges = []
+        self.errors = collections.OrderedDict()
+
+    def find_cycle(self):
+        """Return the UUIDs of a cycle of the graph, or None.
+
+        The first UUID is repeated at the end of the list.
+        """
+        successors = collections.defaultdict(list)
+        for edge in self.edges:
+            successors[edge.source].append(edge.target)
+        done = set()
+        for start in self.nodes:
+            if start in done:
+                continue
+            path = [start]
+            on_path = {start}
+            stack = [iter(successors[start])]
+            while stack:
+                target = next(stack[-1], None)
+                if target is None:
+                    stack.pop()
+                    node = path.pop()
+                    on_path.discard(node)
+                    done.add(node)
+                    continue
+                if target in on_path:
+                    return path[path.index(target):] + [target]
+                if target not in done:
+                    path.append(target)
+                    on_path.add(target)
+                    stack.append(iter(successors[target]))
+        return None
+
+    def to_dict(self):
+        """Return the graph as a dictionary which can be dumped as JSON."""
+        return {
+            'root': self.root,
+            'nodes': [resource.to_dict() for resource in self.nodes.values()],
+            'edges': [edge._asdict() for edge in self.edges],
+            'errors': dict((uuid, six.text_type(error))
+                           for uuid, error in self.errors.items()),
+            'cycle': self.find_cycle(),
+        }
+
+    def to_dot(self):
+        """Return the graph in the DOT language of Graphviz."""
+        lines = ['digraph resources {']
+        for uuid, resource in self.nodes.items():
+            lines.append('    "%s" [label="%s\\n%s"];' %
+                         (_escape(uuid),
+                          _escape(getattr(resource, 'type', '')),
+                          _escape(uuid)))
+        for edge in self.edges:
+            lines.append('    "%s" -> "%s" [label="%s"];' %
+                         (_escape(edge.source), _escape(edge.target),
+                          _escape(edge.relation)))
+        lines.append('}')
+        return '\n'.join(lines)
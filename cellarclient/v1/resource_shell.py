@@ -13,20 +13,46 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import os
+
+import six
+
 from cellarclient.common import cliutils
+from cellarclient.common.i18n import _
+from cellarclient.common import store
 from cellarclient.common import utils
+from cellarclient import exc
 from cellarclient.v1 import resource_fields as res_fields
 
 
-def _print_resource_show(resource, fields=None, json=False):
+def _print_resource_show(resource, fields=None, json=False,
+                         output_format=None):
     if fields is None:
         fields = res_fields.DETAILED_RESOURCE.fields
 
     data = dict([(f, getattr(resource, f, '')) for f in fields])
-    cliutils.print_dict(data, wrap=72, json_flag=json)
+    cliutils.print_dict(data, wrap=72, json_flag=json,
+                        output_format=output_format)
+
+
+def _open_mirror(path):
+    """Open the local mirror of the resources at 'path'.
+
+    :raises exc.CommandError: if the mirror was never synchronized.
+    """
+    if path != ':memory:' and not os.path.exists(path):
+        raise exc.CommandError(
+            _('No local mirror at %s, run "cellar resource-sync" first') %
+            path)
+    return store.ResourceStore(path)
 
 
-@cliutils.arg('resource', metavar='<resource>', help="UUID of the resource.")
+@cliutils.arg(
+    'resource',
+    metavar='<resource>',
+    nargs='+',
+    help="UUID of the resource.")
 @cliutils.arg(
     '--fields',
     nargs='+',
@@ -36,14 +62,99 @@ def _print_resource_show(resource, fields=None, json=False):
     default=[],
     help="One or more resource fields. Only these fields will be fetched from "
          "the server.")
+@cliutils.arg(
+    '--concurrency',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help='Maximum number of resources fetched at once when several are '
+         'shown. Default is 1.')
 def do_resource_show(cc, args):
-    """Show detailed information about a resource."""
-    utils.check_empty_arg(args.resource, '<resource>')
+    """Show detailed information about a resource, or several at once."""
+    for resource_id in args.resource:
+        utils.check_empty_arg(resource_id, '<resource>')
     fields = args.fields[0] if args.fields else None
     utils.check_for_invalid_fields(
         fields, res_fields.DETAILED_RESOURCE.fields)
-    resource = cc.resource.get(args.resource, fields=fields)
-    _print_resource_show(resource, fields=fields, json=args.json)
+    if len(args.resource) == 1:
+        resource = cc.resource.get(args.resource[0], fields=fields)
+        _print_resource_show(resource, fields=fields, json=args.json,
+                             output_format=args.output_format)
+        return
+
+    if args.concurrency < 1:
+        raise exc.CommandError(
+            _('Expected positive --concurrency, got %s') % args.concurrency)
+    # NOTE: every format but the table prints the resources together, as
+    # one JSON document or one row per resource.
+    output_format = args.output_format or ('json' if args.json else 'table')
+    failures = []
+    resources = []
+    results = cc.resource.get_many(args.resource, fields=fields,
+                                   concurrency=args.concurrency)
+    for result in results.values():
+        if result.error is not None:
+            failures.append(_("Failed to show resource %(resource)s: "
+                              "%(error)s") % {'resource': result.key,
+                                              'error': result.error})
+        elif output_format == 'table':
+            _print_resource_show(result.result, fields=fields)
+        else:
+            resources.append(result.result)
+    if resources:
+        cliutils.print_list(
+            resources, fields or res_fields.DETAILED_RESOURCE.fields,
+            sortby_index=None, output_format=output_format)
+    if failures:
+        raise exc.CommandError("\n".join(failures))
+
+
+@cliutils.arg('resource', metavar='<resource>', help="UUID of the resource.")
+@cliutils.arg(
+    '--depth',
+    metavar='<depth>',
+    type=int,
+    default=1,
+    help='Maximum number of relations followed from the resource. '
+         'Default is 1.')
+@cliutils.arg(
+    '--type',
+    metavar='<type>',
+    dest='types',
+    action='append',
+    help='Only follow relations to resources of this type. '
+         'Can be specified multiple times.')
+@cliutils.arg(
+    '--concurrency',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help='Maximum number of resources fetched at once. Default is 1.')
+@cliutils.arg(
+    '--dot',
+    action='store_true',
+    default=False,
+    help='Print the graph in the DOT language of Graphviz instead of JSON.')
+def do_resource_graph(cc, args):
+    """Show the resources reached from a resource by its relations."""
+    utils.check_empty_arg(args.resource, '<resource>')
+    if args.depth < 0:
+        raise exc.CommandError(
+            _('Expected non-negative --depth, got %s') % args.depth)
+    if args.concurrency < 1:
+        raise exc.CommandError(
+            _('Expected positive --concurrency, got %s') % args.concurrency)
+    graph = cc.resource.walk(args.resource, depth=args.depth,
+                             types=args.types, concurrency=args.concurrency)
+    if args.dot:
+        print(graph.to_dot())
+    else:
+        print(json.dumps(graph.to_dict(), indent=4, separators=(',', ': ')))
+    if graph.errors:
+        raise exc.CommandError("\n".join(
+            _("Failed to fetch resource %(resource)s: %(error)s") %
+            {'resource': uuid, 'error': error}
+            for uuid, error in graph.errors.items()))
 
 
 @cliutils.arg(
@@ -83,6 +194,39 @@ def do_resource_show(cc, args):
     default=[],
     help="One or more resource fields. Only these fields will be fetched from "
          "the server. Can not be used when '--detail' is specified.")
+@cliutils.arg(
+    '--prefetch',
+    metavar='<depth>',
+    type=int,
+    default=0,
+    help='Number of pages to fetch ahead while the current one is being '
+         'processed. Only used with --limit. Default is 0 (disabled).')
+@cliutils.arg(
+    '--deadline',
+    metavar='<seconds>',
+    type=float,
+    help='Maximum time allowed for fetching all the pages. Only used with '
+         '--limit.')
+@cliutils.arg(
+    '--local',
+    action='store_true',
+    default=False,
+    help='Read the resources from the local mirror updated by '
+         '"cellar resource-sync" instead of the cellar API.')
+@cliutils.arg(
+    '--store',
+    metavar='<file>',
+    default=cliutils.env('ARSENAL_STORE', default=store.DEFAULT_PATH),
+    help='Path of the local mirror used with --local and --parallel. '
+         'Defaults to env[ARSENAL_STORE] or %s.' % store.DEFAULT_PATH)
+@cliutils.arg(
+    '--parallel',
+    metavar='<count>',
+    type=int,
+    help='Fetch the whole list as this many ranges at once. The ranges are '
+         'split using the local mirror when there is one, and the list is '
+         'fetched from both ends otherwise. Can not be used with --marker '
+         'or --limit, and only sorts by uuid, type or created_at.')
 def do_resource_list(cc, args):
     """List the resource."""
     if args.detail:
@@ -103,12 +247,182 @@ def do_resource_list(cc, args):
 
     params = utils.common_params_for_list(args, sort_fields,
                                           sort_field_labels)
+    if not args.detail and not args.fields:
+        # NOTE: only fetch the fields which are shown, servers ignoring
+        # 'fields' send the whole resources which works too.
+        params['fields'] = res_fields.RESOURCE.get_projection(
+            params.get('sort_key'))
+    if args.prefetch:
+        if args.prefetch < 0:
+            raise exc.CommandError(
+                _('Expected non-negative --prefetch, got %s') % args.prefetch)
+        params['prefetch'] = args.prefetch
+    if args.deadline is not None:
+        if args.deadline <= 0:
+            raise exc.CommandError(
+                _('Expected positive --deadline, got %s') % args.deadline)
+        params['deadline'] = args.deadline
+    if args.parallel is not None:
+        if args.parallel < 1:
+            raise exc.CommandError(
+                _('Expected positive --parallel, got %s') % args.parallel)
+        if args.local:
+            raise exc.CommandError(
+                _('--parallel can not be used with --local'))
+        params['parallel'] = args.parallel
+        params.pop('prefetch', None)
+        if (args.parallel > 1 and args.store and
+                os.path.exists(args.store)):
+            with store.ResourceStore(args.store) as mirror:
+                try:
+                    params['markers'] = mirror.get_markers(
+                        args.parallel, sort_key=params.get('sort_key'),
+                        sort_dir=params.get('sort_dir'))
+                except exc.InvalidAttribute as e:
+                    raise exc.CommandError(six.text_type(e))
+
+    if (args.output_format in cliutils.STREAMING_FORMATS and
+            not args.local):
+        # NOTE: rows are printed while the next pages are fetched.
+        params['stream'] = True
 
-    resource = cc.resource.list(**params)
+    if args.local:
+        for option in ('detail', 'prefetch', 'deadline'):
+            params.pop(option, None)
+        with _open_mirror(args.store) as mirror:
+            resource = cc.resource.list_local(mirror, **params)
+    else:
+        # NOTE: the resources are only printed, read-only records are
+        # lighter to build and hold.
+        params['compact'] = True
+        try:
+            resource = cc.resource.list(**params)
+        except exc.InvalidAttribute as e:
+            raise exc.CommandError(six.text_type(e))
     cliutils.print_list(resource, fields,
                         field_labels=field_labels,
                         sortby_index=None,
-                        json_flag=args.json)
+                        json_flag=args.json,
+                        output_format=args.output_format)
+
+
+@cliutils.arg(
+    '--where',
+    metavar='<condition>',
+    action='append',
+    default=[],
+    help='Condition the resources must match, <field><operator><value> '
+         'with one of the operators = != < <= > >=, e.g. type=server or '
+         'ram>=2048. Fields other than those of the resources are '
+         'attributes. Can be specified multiple times.')
+@cliutils.arg(
+    '--index',
+    metavar='<field>',
+    action='append',
+    default=[],
+    help='Index this field in the local mirror first, to speed up this '
+         'and later queries on it. Can be specified multiple times.')
+@cliutils.arg(
+    '--detail',
+    dest='detail',
+    action='store_true',
+    default=False,
+    help="Show detailed information about the resources.")
+@cliutils.arg(
+    '--limit',
+    metavar='<limit>',
+    type=int,
+    help='Maximum number of resources to return.')
+@cliutils.arg(
+    '--marker',
+    metavar='<resource>',
+    help='Resource UUID. Returns the resources after this one.')
+@cliutils.arg(
+    '--sort-key',
+    metavar='<field>',
+    help='Resource field that will be used for sorting.')
+@cliutils.arg(
+    '--sort-dir',
+    metavar='<direction>',
+    choices=['asc', 'desc'],
+    help='Sort direction: "asc" (the default) or "desc".')
+@cliutils.arg(
+    '--fields',
+    nargs='+',
+    dest='fields',
+    metavar='<field>',
+    action='append',
+    default=[],
+    help="One or more resource fields to show. Can not be used when "
+         "'--detail' is specified.")
+@cliutils.arg(
+    '--store',
+    metavar='<file>',
+    default=cliutils.env('ARSENAL_STORE', default=store.DEFAULT_PATH),
+    help='Path of the local mirror. Defaults to env[ARSENAL_STORE] or '
+         '%s.' % store.DEFAULT_PATH)
+def do_resource_query(cc, args):
+    """List the resources of the local mirror matching conditions."""
+    if args.detail and args.fields:
+        raise exc.CommandError(_("Can't show a subset of fields with "
+                                 "'--detail' set"))
+    if args.detail:
+        resource = res_fields.DETAILED_RESOURCE
+    elif args.fields:
+        utils.check_for_invalid_fields(
+            args.fields[0], res_fields.DETAILED_RESOURCE.fields)
+        resource = res_fields.Resource(args.fields[0])
+    else:
+        resource = res_fields.RESOURCE
+    params = utils.common_params_for_list(
+        args, res_fields.DETAILED_RESOURCE.sort_fields,
+        res_fields.DETAILED_RESOURCE.sort_labels)
+    params.pop('detail', None)
+    params.pop('fields', None)
+
+    with _open_mirror(args.store) as mirror:
+        try:
+            for field in args.index:
+                mirror.create_index(field)
+            resources = cc.resource.list_local(mirror, where=args.where,
+                                               **params)
+        except exc.InvalidAttribute as e:
+            raise exc.CommandError(six.text_type(e))
+    cliutils.print_list(resources, resource.fields,
+                        field_labels=resource.labels,
+                        sortby_index=None,
+                        json_flag=args.json,
+                        output_format=args.output_format)
+
+
+@cliutils.arg(
+    '--store',
+    metavar='<file>',
+    default=cliutils.env('ARSENAL_STORE', default=store.DEFAULT_PATH),
+    help='Path of the local mirror. Defaults to env[ARSENAL_STORE] or '
+         '%s.' % store.DEFAULT_PATH)
+@cliutils.arg(
+    '--full',
+    action='store_true',
+    default=False,
+    help='Fetch all the resources instead of those changed since the last '
+         'synchronization.')
+@cliutils.arg(
+    '--reconcile',
+    action='store_true',
+    default=None,
+    help='Look for deleted resources now. By default, this is done once '
+         'per hour.')
+def do_resource_sync(cc, args):
+    """Update the local mirror of the resources."""
+    with store.ResourceStore(args.store) as mirror:
+        result = cc.resource.sync(mirror, full=args.full,
+                                  reconcile=args.reconcile)
+        total = mirror.count()
+    print(_('Saved %(saved)d and deleted %(deleted)d resources, '
+            '%(total)d in %(store)s') %
+          {'saved': result.saved, 'deleted': result.deleted, 'total': total,
+           'store': args.store})
 
 
 @cliutils.arg(
@@ -135,17 +449,60 @@ def do_resource_list(cc, args):
     '-u', '--uuid',
     metavar='<uuid>',
     help="UUID of the resource.")
+@cliutils.arg(
+    '-f', '--from-file',
+    metavar='<file>',
+    help="Create every resource described in <file> instead: one JSON "
+         "object per line, or YAML documents if the file name ends with "
+         "'.yaml' or '.yml'. Use '-' to read JSON lines from standard "
+         "input. Can not be used with the other resource options.")
+@cliutils.arg(
+    '--concurrency',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help='Maximum number of resources created at once with --from-file. '
+         'Default is 1.')
 def do_resource_create(cc, args):
     """Create a new resource."""
     field_list = ['description', 'type', 'relations', 'attributes', 'uuid']
     fields = dict((k, v) for (k, v) in vars(args).items()
                   if k in field_list and not (v is None))
+    if args.from_file is not None:
+        if fields:
+            raise exc.CommandError(
+                _('--from-file can not be used with the options '
+                  'describing a single resource'))
+        _do_resource_create_from_file(cc, args)
+        return
+
     fields = utils.args_array_to_dict(fields, 'relations')
     fields = utils.args_array_to_dict(fields, 'attributes')
     resource = cc.resource.create(**fields)
 
     data = dict([(f, getattr(resource, f, '')) for f in field_list])
-    cliutils.print_dict(data, wrap=72, json_flag=args.json)
+    cliutils.print_dict(data, wrap=72, json_flag=args.json,
+                        output_format=args.output_format)
+
+
+def _do_resource_create_from_file(cc, args):
+    if args.concurrency < 1:
+        raise exc.CommandError(
+            _('Expected positive --concurrency, got %s') % args.concurrency)
+    items = utils.iter_items_from_file(args.from_file)
+    failures = []
+    for result in cc.resource.create_many(items,
+                                          concurrency=args.concurrency):
+        if result.error is None:
+            print(_('Created resource %(index)d: %(resource)s') %
+                  {'index': result.key,
+                   'resource': getattr(result.result, 'uuid', '')})
+        else:
+            failures.append(_("Failed to create resource %(index)d: "
+                              "%(error)s") % {'index': result.key,
+                                              'error': result.error})
+    if failures:
+        raise exc.CommandError("\n".join(failures))
 
 
 @cliutils.arg(
@@ -153,11 +510,28 @@ def do_resource_create(cc, args):
     metavar='<resource>',
     nargs='+',
     help="UUID of the resource.")
+@cliutils.arg(
+    '--concurrency',
+    metavar='<count>',
+    type=int,
+    default=1,
+    help='Maximum number of resources deleted at once. Default is 1.')
 def do_resource_delete(cc, args):
     """Delete a resource."""
-    for c in args.resource:
-        cc.resource.delete(c)
-        print('Deleted resource %s' % c)
+    if args.concurrency < 1:
+        raise exc.CommandError(
+            _('Expected positive --concurrency, got %s') % args.concurrency)
+    failures = []
+    for result in cc.resource.delete_many(args.resource,
+                                          concurrency=args.concurrency):
+        if result.error is None:
+            print(_('Deleted resource %s') % result.key)
+        else:
+            failures.append(_("Failed to delete resource %(resource)s: "
+                              "%(error)s") % {'resource': result.key,
+                                              'error': result.error})
+    if failures:
+        raise exc.CommandError("\n".join(failures))
 
 
 @cliutils.arg('resource', metavar='<resource>', help="UUID of the resource.")
@@ -178,4 +552,5 @@ def do_resource_update(cc, args):
     """Update information about a resource."""
     patch = utils.args_array_to_patch(args.op, args.attributes[0])
     resource = cc.resource.update(args.resource, patch)
-    _print_resource_show(resource, json=args.json)
+    _print_resource_show(resource, json=args.json,
+                         output_format=args.output_format)